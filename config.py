@@ -34,7 +34,7 @@ DEFAULT_PROFILE = {
         "volume_down": "Two fingers down - Right hand",
         "brightness_up": "Two fingers up - Left hand",
         "brightness_down": "Two fingers down - Left hand",
-        "mouse_move": "Index finger - Right hand",
+        "mouse_move": "Index up - Right hand",
         "left_click": "Pinch - Right hand",
         "right_click": "Pinch - Left hand",
         "scroll_up": "Palm up - Left hand",
@@ -60,7 +60,7 @@ CAMERA_HEIGHT = 720
 CAMERA_FPS = 30
 
 # MediaPipe Settings
-MAX_NUM_HANDS = 1
+MAX_NUM_HANDS = 2  # at most; the active profile's bindings decide how many are tracked
 MIN_DETECTION_CONFIDENCE = 0.6
 MIN_TRACKING_CONFIDENCE = 0.6
 
@@ -70,61 +70,6 @@ PINCH_THRESHOLD = 0.12
 FINGER_DISTANCE_THRESHOLD = 0.15
 PALM_OPEN_COOLDOWN = 1
 
-# Gesture Profiles
-GESTURE_PROFILES = {
-    "Default": {
-        "pinch_threshold": 0.12,
-        "finger_distance_threshold": 0.15,
-        "cursor_smoothing": 0.3,
-        "actions": {
-            "volume_up": "Two fingers up - Right hand",
-            "volume_down": "Two fingers down - Right hand",
-            "brightness_up": "Two fingers up - Left hand",
-            "brightness_down": "Two fingers down - Left hand",
-            "mouse_move": "Index finger - Right hand",
-            "left_click": "Pinch - Right hand",
-            "right_click": "Middle thumb tap - Right hand",
-            "scroll_up": "Two fingers up - Left hand",
-            "scroll_down": "Five fingers down - Left hand",
-            "task_view": "Five fingers up - Left hand"
-        }
-    },
-    "Precise": {
-        "pinch_threshold": 0.1,
-        "finger_distance_threshold": 0.12,
-        "cursor_smoothing": 0.4,
-        "actions": {
-            "volume_up": "Two fingers up - Right hand",
-            "volume_down": "Two fingers down - Right hand",
-            "brightness_up": "Two fingers up - Left hand",
-            "brightness_down": "Two fingers down - Left hand",
-            "mouse_move": "Index finger - Right hand",
-            "left_click": "Pinch - Right hand",
-            "right_click": "Middle thumb tap - Right hand",
-            "scroll_up": "Two fingers up - Left hand",
-            "scroll_down": "Five fingers down - Left hand",
-            "task_view": "Five fingers up - Left hand"
-        }
-    },
-    "Responsive": {
-        "pinch_threshold": 0.15,
-        "finger_distance_threshold": 0.18,
-        "cursor_smoothing": 0.2,
-        "actions": {
-            "volume_up": "Two fingers up - Right hand",
-            "volume_down": "Two fingers down - Right hand",
-            "brightness_up": "Two fingers up - Left hand",
-            "brightness_down": "Two fingers down - Left hand",
-            "mouse_move": "Index finger - Right hand",
-            "left_click": "Pinch - Right hand",
-            "right_click": "Middle thumb tap - Right hand",
-            "scroll_up": "Two fingers up - Left hand",
-            "scroll_down": "Five fingers down - Left hand",
-            "task_view": "Five fingers up - Left hand"
-        }
-    }
-}
-
 # Load gesture profiles
 GESTURE_PROFILES = {profile["name"]: profile for profile in load_gesture_profiles()}
 
@@ -137,6 +82,7 @@ CAMERA_CONFIG = {
 
 # Gesture detection settings
 GESTURE_CONFIG = {
+    'profile': 'Default',       # profile of GESTURE_PROFILES_FILE
     'cursor_smoothing': 0.8,
     'palm_open_cooldown': 2.0,
     'min_detection_confidence': 0.8,
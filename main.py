@@ -14,8 +14,10 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                             QFrame, QGridLayout)
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QImage, QPixmap, QFont, QPalette, QColor
-from config import (LOGGING_CONFIG, CAMERA_CONFIG, GESTURE_CONFIG, 
+from config import (LOGGING_CONFIG, CAMERA_CONFIG, GESTURE_CONFIG, GESTURE_PROFILES,
                    GESTURE_THRESHOLDS, SYSTEM_CONFIG)
+from src.airgesture.core.sequences import SequenceMachine
+from src.airgesture.utils.config import GESTURE_SEQUENCES
 
 # Configure logging
 logging.basicConfig(**LOGGING_CONFIG)
@@ -126,11 +128,17 @@ class AirGestureApp(QMainWindow):
             self.volume = None
             
         # Initialize state variables
-        self.cursor_smoothing = GESTURE_CONFIG['cursor_smoothing']
+        # The active profile's own (e.g. tuned) smoothing wins over the global one
+        profile = GESTURE_PROFILES.get(GESTURE_CONFIG['profile'])
+        if profile is None:
+            logger.warning(f"Profile {GESTURE_CONFIG['profile']} not found, using the default cursor smoothing")
+            profile = {}
+        self.cursor_smoothing = profile.get('cursor_smoothing', GESTURE_CONFIG['cursor_smoothing'])
         self.smoothed_cursor_x = None
         self.smoothed_cursor_y = None
         self.cursor_active = True
-        self.click_ready = False
+        self.click_sequences = SequenceMachine(GESTURE_SEQUENCES, "Right")
+        self.click_progress = self.click_sequences.start()
         self.last_palm_open_time = 0
         self.palm_open_cooldown = GESTURE_CONFIG['palm_open_cooldown']
         
@@ -475,12 +483,8 @@ class AirGestureApp(QMainWindow):
                         self.mp_drawing.draw_landmarks(frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
                         
                         if handedness.classification[0].label == "Right":
-                            if self.is_fingers_apart(hand_landmarks):
-                                self.cursor_active = False
-                                self.click_ready = True
-                            else:
-                                self.cursor_active = True
-                                self.click_ready = False
+                            spread = self.is_fingers_apart(hand_landmarks)
+                            self.cursor_active = not spread
                                 
                             if self.cursor_active and self.is_two_fingers_up(hand_landmarks):
                                 screen_width, screen_height = pyautogui.size()
@@ -490,13 +494,15 @@ class AirGestureApp(QMainWindow):
                                 self.smoothed_cursor_y = self.apply_exponential_smoothing(cursor_y, self.smoothed_cursor_y, self.cursor_smoothing)
                                 self.mouse.position = (int(self.smoothed_cursor_x), int(self.smoothed_cursor_y))
                                 
-                            if not self.cursor_active and self.click_ready and self.is_pinch(hand_landmarks):
-                                self.mouse.click(Button.left, 1)
-                                self.click_ready = False
-                                
-                            if not self.cursor_active and self.click_ready and self.is_middle_thumb_tap(hand_landmarks):
-                                self.mouse.click(Button.right, 1)
-                                self.click_ready = False
+                            # Spread-then-pinch and spread-then-tap clicks
+                            conditions = {'spread': spread, 'pinch': self.is_pinch(hand_landmarks),
+                                          'middle_tap': self.is_middle_thumb_tap(hand_landmarks)}
+                            for name in self.click_sequences.update(self.click_progress, conditions, current_time):
+                                button = self.click_sequences.by_name[name].get('click')
+                                if button == 'left':
+                                    self.mouse.click(Button.left, 1)
+                                elif button == 'right':
+                                    self.mouse.click(Button.right, 1)
                                 
                             if self.is_pinky_finger_up(hand_landmarks):
                                 sbc.set_brightness(min(sbc.get_brightness(display=0)[0] + SYSTEM_CONFIG['brightness_step'], 100), display=0)
@@ -0,0 +1,102 @@
+import time
+
+from src.airgesture.utils.config import SYSTEM_CONFIG
+
+
+class SystemActions:
+    """Mouse, keyboard, brightness and volume control of the local desktop.
+
+    The desktop libraries are imported here rather than at module level so
+    that headless runs using ``RecordingActions`` do not need them.
+    """
+
+    def __init__(self):
+        import pyautogui
+        from pynput.mouse import Button, Controller
+
+        self.pyautogui = pyautogui
+        self.buttons = {'left': Button.left, 'right': Button.right}
+        self.mouse = Controller()
+        self.init_volume_control()
+
+    def init_volume_control(self):
+        try:
+            from comtypes import CLSCTX_ALL
+            from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+
+            devices = AudioUtilities.GetSpeakers()
+            interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+            self.volume = interface.QueryInterface(IAudioEndpointVolume)
+        except Exception as e:
+            print(f"Could not initialize volume control: {e}")
+            self.volume = None
+
+    def screen_size(self):
+        return self.pyautogui.size()
+
+    def move_cursor(self, x, y):
+        self.mouse.position = (x, y)
+
+    def click(self, button):
+        self.mouse.click(self.buttons[button], 1)
+
+    def scroll(self, amount):
+        self.mouse.scroll(0, amount)
+
+    def hotkey(self, *keys):
+        self.pyautogui.hotkey(*keys)
+
+    def adjust_brightness(self, direction):
+        """Adjust screen brightness."""
+        try:
+            import screen_brightness_control as sbc
+
+            current = sbc.get_brightness(display=0)[0]
+            new_value = min(max(current + direction * SYSTEM_CONFIG['brightness_step'], 0), 100)
+            sbc.set_brightness(new_value, display=0)
+        except Exception as e:
+            print(f"Could not adjust brightness: {e}")
+
+    def adjust_volume(self, direction):
+        """Adjust system volume."""
+        try:
+            if self.volume:
+                current = self.volume.GetMasterVolumeLevelScalar()
+                new_value = min(max(current + direction * SYSTEM_CONFIG['volume_step'], 0.0), 1.0)
+                self.volume.SetMasterVolumeLevelScalar(new_value, None)
+        except Exception as e:
+            print(f"Could not adjust volume: {e}")
+
+
+class RecordingActions:
+    """Records every action instead of performing it, for headless runs."""
+
+    def __init__(self, screen_size=(1920, 1080)):
+        self.size = screen_size
+        self.log = []
+        self.counts = {}
+
+    def record(self, name, *args):
+        self.log.append((time.perf_counter(), name, args))
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def screen_size(self):
+        return self.size
+
+    def move_cursor(self, x, y):
+        self.record('move_cursor', x, y)
+
+    def click(self, button):
+        self.record(f'click_{button}')
+
+    def scroll(self, amount):
+        self.record('scroll_up' if amount > 0 else 'scroll_down', amount)
+
+    def hotkey(self, *keys):
+        self.record('hotkey', *keys)
+
+    def adjust_brightness(self, direction):
+        self.record('brightness_up' if direction > 0 else 'brightness_down')
+
+    def adjust_volume(self, direction):
+        self.record('volume_up' if direction > 0 else 'volume_down')
@@ -0,0 +1,181 @@
+"""Vectorized gesture classification over many hands at once.
+
+``classify_batch`` takes an (N, 21, 3) landmark tensor with the handedness
+of every hand and returns, for all N hands in a handful of numpy
+operations, the features of ``features.HandFeatures``, every predicate of
+``core/predicates.py`` and the per-hand gesture label of
+``predicates.hand_gesture``. It is meant for offline evaluation and
+threshold tuning over recorded sessions; the live detector keeps the
+per-hand path, and ``tools/check_batch`` verifies the two agree.
+"""
+import numpy as np
+
+from src.airgesture.core import landmarks as L
+from src.airgesture.core import predicates as P
+from src.airgesture.core.features import MIN_PALM_SIZE, NOMINAL_PALM_LENGTH
+from src.airgesture.core.session import HANDEDNESS_CODES, NO_HAND
+
+FINGER_TIPS = np.array(L.FINGER_TIPS)
+FINGER_PIPS = np.array(L.FINGER_PIPS)
+PALM_KNUCKLES = np.array([L.INDEX_MCP, L.MIDDLE_MCP, L.RING_MCP])
+LABEL_DTYPE = f"<U{max(map(len, P.RIGHT_HAND_GESTURES + P.LEFT_HAND_GESTURES))}"
+
+
+def squared_distances(landmarks, a, b):
+    offsets = landmarks[:, a] - landmarks[:, b]
+    return np.einsum('ij,ij->i', offsets, offsets)
+
+
+def distance_scale(palm_size, units):
+    """Vectorized ``features.palm_scale``."""
+    if units == 'image':
+        return np.ones_like(palm_size)
+    scale = 1.0 / np.maximum(palm_size, MIN_PALM_SIZE)
+    if units == 'world':
+        scale *= NOMINAL_PALM_LENGTH ** 2
+    return scale
+
+
+def batch_features(landmarks, units='image', world=None):
+    """Compute the ``HandFeatures`` features of (N, 21, 3) landmarks as arrays.
+
+    ``units`` and the optional (N, 21, 3) ``world`` landmarks are those of
+    ``HandFeatures``.
+    """
+    landmarks = np.asarray(landmarks, dtype=np.float32)
+    y = landmarks[:, :, L.Y]
+    tips, pips = y[:, FINGER_TIPS], y[:, FINGER_PIPS]
+    fingers_up = tips < pips
+    fingers_down = tips > pips
+
+    wrist_z = landmarks[:, L.WRIST, L.Z, np.newaxis]
+    knuckle_z = landmarks[:, PALM_KNUCKLES, L.Z]
+    palm_facing = np.zeros(len(landmarks), dtype=np.int8)
+    palm_facing[(knuckle_z < wrist_z).all(axis=1)] = 1
+    palm_facing[(knuckle_z > wrist_z).all(axis=1)] = -1
+
+    palm_size = squared_distances(landmarks, L.WRIST, L.MIDDLE_MCP)
+    if units == 'world' and world is not None:
+        points = np.asarray(world, dtype=np.float32)
+        scale = np.ones_like(palm_size)
+    else:
+        points = landmarks
+        scale = distance_scale(palm_size, units)
+
+    return {
+        'fingers_up': fingers_up,
+        'fingers_down': fingers_down,
+        'all_fingers_up': fingers_up.all(axis=1),
+        'all_fingers_down': fingers_down.all(axis=1),
+        'thumb_down': y[:, L.THUMB_TIP] > y[:, L.THUMB_IP],
+        'palm_size': palm_size,
+        'index_thumb_distance': squared_distances(points, L.INDEX_TIP, L.THUMB_TIP) * scale,
+        'middle_thumb_distance': squared_distances(points, L.MIDDLE_TIP, L.THUMB_TIP) * scale,
+        'index_middle_distance': squared_distances(points, L.INDEX_TIP, L.MIDDLE_TIP) * scale,
+        'palm_facing': palm_facing,
+    }
+
+
+def batch_predicates(landmarks, features, units='image'):
+    """Evaluate every single-hand predicate of ``core/predicates.py`` for N hands."""
+    thresholds = P.SQUARED_THRESHOLDS[units]
+    y = landmarks[:, :, L.Y]
+    middle_tip = y[:, L.MIDDLE_TIP]
+    fingers_up = features['fingers_up']
+    return {
+        'is_two_fingers_up': (fingers_up[:, 0] & fingers_up[:, 1] &
+                              (y[:, L.RING_TIP] > middle_tip) & (y[:, L.PINKY_TIP] > middle_tip)),
+        'is_pinch': features['index_thumb_distance'] < thresholds['pinch_distance'],
+        'is_middle_thumb_tap': features['middle_thumb_distance'] < thresholds['pinch_distance'],
+        'is_fingers_apart': features['index_middle_distance'] > thresholds['fingers_apart_distance'],
+        'is_index_middle_fingers_together': (features['index_middle_distance'] <
+                                             thresholds['fingers_together_distance']),
+        'is_five_fingers_up': features['all_fingers_up'],
+        'is_five_fingers_down': features['all_fingers_down'],
+        'is_full_palm_open': features['all_fingers_up'],
+        'is_pinky_finger_up': fingers_up[:, 3],
+        'is_pinky_finger_down': features['all_fingers_down'] & features['thumb_down'],
+        'is_index_finger_up': fingers_up[:, 0],
+    }
+
+
+def select(conditions, default):
+    """Resolve prioritized (mask, label) pairs; the first matching mask wins."""
+    masks = [mask for mask, _ in conditions]
+    labels = [label for _, label in conditions]
+    return np.select(masks, labels, default)
+
+
+def handedness_codes(handedness):
+    """Accept "Left"/"Right" strings or session codes and return int8 codes."""
+    handedness = np.asarray(handedness)
+    if handedness.dtype.kind in 'US':
+        codes = np.full(handedness.shape, NO_HAND, dtype=np.int8)
+        for label, code in HANDEDNESS_CODES.items():
+            codes[handedness == label] = code
+        return codes
+    return handedness.astype(np.int8)
+
+
+def batch_gestures(predicates, handedness):
+    """Per-hand gesture labels, matching ``predicates.hand_gesture``."""
+    apart = predicates['is_fingers_apart']
+    together = predicates['is_index_middle_fingers_together']
+    right = select([
+        (apart & predicates['is_pinch'], 'left_click'),
+        (apart & predicates['is_middle_thumb_tap'], 'right_click'),
+        (apart, 'click_ready'),
+        (predicates['is_two_fingers_up'], 'move_cursor'),
+        (predicates['is_pinky_finger_up'], 'brightness_up'),
+        (predicates['is_pinky_finger_down'], 'brightness_down'),
+    ], P.NO_GESTURE)
+    left = select([
+        (together & predicates['is_two_fingers_up'], 'scroll_up'),
+        (together & predicates['is_five_fingers_down'], 'scroll_down'),
+        (predicates['is_full_palm_open'], 'task_view'),
+        (predicates['is_index_finger_up'], 'volume_up'),
+    ], 'volume_down')
+
+    labels = np.full(len(handedness), P.NO_GESTURE, dtype=LABEL_DTYPE)
+    is_right = handedness == HANDEDNESS_CODES['Right']
+    is_left = handedness == HANDEDNESS_CODES['Left']
+    labels[is_right] = right[is_right]
+    labels[is_left] = left[is_left]
+    return labels
+
+
+def classify_batch(landmarks, handedness, units='image', world=None):
+    """Classify N hands at once.
+
+    ``landmarks`` is (N, 21, 3); ``handedness`` holds "Left"/"Right" labels
+    or session codes (0 = Left, 1 = Right, -1 = no hand). ``units`` and
+    ``world`` select the distance units as for ``HandFeatures``. Rows without a
+    hand, or with NaN landmarks, get the label ``"none"`` and all-False
+    predicates. Returns ``(labels, predicates, features)``, where the last two
+    are dicts of arrays with N rows.
+    """
+    landmarks = np.asarray(landmarks, dtype=np.float32)
+    codes = handedness_codes(handedness)
+    valid = (codes != NO_HAND) & ~np.isnan(landmarks).any(axis=(1, 2))
+    codes = np.where(valid, codes, NO_HAND).astype(np.int8)
+
+    features = batch_features(landmarks, units, world)
+    predicates = batch_predicates(landmarks, features, units)
+    for name, values in predicates.items():
+        predicates[name] = values & valid
+    return batch_gestures(predicates, codes), predicates, features
+
+
+def classify_session(session, units='image'):
+    """Classify every hand slot of a landmark session; labels are (frames, hands)."""
+    landmarks = session['landmarks']
+    frames, hands = landmarks.shape[:2]
+    world = session['world'].reshape(-1, *landmarks.shape[2:]) if 'world' in session else None
+    labels, predicates, features = classify_batch(landmarks.reshape(-1, *landmarks.shape[2:]),
+                                                  session['handedness'].reshape(-1),
+                                                  units, world)
+    return (labels.reshape(frames, hands),
+            {name: values.reshape(frames, hands, *values.shape[1:])
+             for name, values in predicates.items()},
+            {name: values.reshape(frames, hands, *values.shape[1:])
+             for name, values in features.items()})
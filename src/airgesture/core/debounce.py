@@ -0,0 +1,116 @@
+"""Hysteresis and debouncing for per-frame gesture decisions.
+
+A pinch hovering around its distance threshold, or a landmark jittering
+across a joint, flips a single-frame predicate on and off every frame.
+``Hysteresis`` uses separate enter and exit thresholds, so a value must move
+clearly back before the switch turns off. ``GestureGate`` turns a noisy
+present/absent signal into explicit events: ``started`` once the gesture
+has been present for ``hold`` seconds, ``held`` while it lasts (every
+``repeat`` seconds when set, otherwise every frame), and ``ended`` once it
+has been absent for ``release`` seconds. Actuators act on these events
+instead of on every frame.
+"""
+STARTED, HELD, ENDED = 'started', 'held', 'ended'
+
+IDLE, PENDING, ACTIVE, RELEASING = range(4)
+
+
+class Hysteresis:
+    """A two-threshold switch on a scalar value.
+
+    With ``enter < exit`` it turns on when the value drops below ``enter`` and
+    off when it rises above ``exit`` (e.g. a pinch distance); with
+    ``enter > exit`` the other way round (e.g. fingers spreading apart).
+    """
+
+    def __init__(self, enter, exit):
+        self.enter = enter
+        self.exit = exit
+        self.below = enter <= exit
+        self.on = False
+
+    def update(self, value):
+        limit = self.exit if self.on else self.enter
+        self.on = value < limit if self.below else value > limit
+        return self.on
+
+
+class GestureGate:
+    """Debounced state of one gesture, emitting started / held / ended events."""
+
+    def __init__(self, hold=0.05, release=0.1, repeat=None):
+        self.hold = hold
+        self.release = release
+        self.repeat = repeat
+        self.state = IDLE
+        self.since = 0.0
+        self.last_event = 0.0
+
+    @property
+    def active(self):
+        return self.state in (ACTIVE, RELEASING)
+
+    def update(self, present, timestamp):
+        """Feed this frame's raw decision; returns an event or None."""
+        if self.state == IDLE:
+            if not present:
+                return None
+            self.state, self.since = PENDING, timestamp
+
+        if self.state == PENDING:
+            if not present:
+                self.state = IDLE
+                return None
+            if timestamp - self.since < self.hold:
+                return None
+            self.state, self.last_event = ACTIVE, timestamp
+            return STARTED
+
+        if present:
+            self.state = ACTIVE
+            if self.repeat is None or timestamp - self.last_event >= self.repeat:
+                self.last_event = timestamp
+                return HELD
+            return None
+
+        if self.state == ACTIVE:
+            self.state, self.since = RELEASING, timestamp
+        if timestamp - self.since >= self.release:
+            self.state = IDLE
+            return ENDED
+        return None
+
+    def reset(self):
+        self.state = IDLE
+
+
+class GestureStates:
+    """The gates and hysteresis switches of one tracked hand, created on first use.
+
+    ``timing`` maps gesture names to ``GestureGate`` settings, with a
+    ``'default'`` entry for gestures that are not listed.
+    """
+
+    def __init__(self, timing):
+        self.timing = timing
+        self.gates = {}
+        self.switches = {}
+
+    def gate(self, name):
+        gate = self.gates.get(name)
+        if gate is None:
+            settings = dict(self.timing.get('default', {}))
+            settings.update(self.timing.get(name, {}))
+            gate = self.gates[name] = GestureGate(**settings)
+        return gate
+
+    def update(self, name, present, timestamp):
+        """Debounce gesture ``name``; returns STARTED, HELD, ENDED or None."""
+        return self.gate(name).update(present, timestamp)
+
+    def switch(self, name, value, enter, exit):
+        """Hysteresis switch ``name`` on ``value``; returns whether it is on."""
+        switch = self.switches.get(name)
+        if switch is None:
+            switch = self.switches[name] = Hysteresis(enter, exit)
+        return switch.update(value)
@@ -0,0 +1,104 @@
+"""Accuracy metrics of a gesture classifier on labelled landmark sessions.
+
+Predictions and labels are (frames, hands) string arrays per session, with
+"none" for a hand that shows no gesture and "" for hands that are absent or
+unlabelled (those are skipped). Besides per-gesture precision and recall and
+the confusion matrix, the false activations count what a user notices: a
+hand slot switching to a gesture it is not labelled with. Each switch counts
+once however many frames it lasts, and the rate is per minute of recording.
+Hand slots are in detection order, as sessions store them.
+"""
+import numpy as np
+
+NONE = 'none'
+
+
+class Evaluation:
+    """Accumulates labelled predictions over sessions and summarizes them."""
+
+    def __init__(self):
+        self.truth = []
+        self.predicted = []
+        self.seconds = 0.0
+        self.activations = {}
+        self.false_activations = {}
+
+    def add_session(self, timestamps, truth, predicted):
+        """Add one session's (frames, hands) labels and predictions."""
+        truth = np.asarray(truth).astype(str)
+        predicted = np.asarray(predicted).astype(str)
+        labelled = truth != ''
+        self.truth.append(truth[labelled])
+        self.predicted.append(predicted[labelled])
+        self.seconds += session_duration(timestamps)
+
+        # A gesture is activated where a hand slot's prediction changes to it
+        previous = np.vstack([np.full((1, predicted.shape[1]), NONE), predicted[:-1]])
+        onsets = labelled & (predicted != NONE) & (predicted != previous)
+        for gesture, correct in zip(predicted[onsets].tolist(),
+                                    (truth[onsets] == predicted[onsets]).tolist()):
+            self.activations[gesture] = self.activations.get(gesture, 0) + 1
+            if not correct:
+                self.false_activations[gesture] = self.false_activations.get(gesture, 0) + 1
+
+    def confusion(self):
+        """(names, matrix) with matrix[i, j] the hands labelled names[i] predicted names[j]."""
+        truth = np.concatenate(self.truth) if self.truth else np.array([], dtype=str)
+        predicted = np.concatenate(self.predicted) if self.predicted else np.array([], dtype=str)
+        names = sorted(set(truth.tolist()) | set(predicted.tolist()))
+        index = {name: i for i, name in enumerate(names)}
+        matrix = np.zeros((len(names), len(names)), dtype=np.int64)
+        if len(truth):
+            np.add.at(matrix, ([index[name] for name in truth.tolist()],
+                               [index[name] for name in predicted.tolist()]), 1)
+        return names, matrix
+
+    def report(self):
+        """Every metric as a JSON-serializable dict."""
+        names, matrix = self.confusion()
+        hands = int(matrix.sum())
+        minutes = self.seconds / 60
+        gestures = {}
+        for i, name in enumerate(names):
+            hits = int(matrix[i, i])
+            predicted, support = int(matrix[:, i].sum()), int(matrix[i].sum())
+            precision = hits / predicted if predicted else 0.0
+            recall = hits / support if support else 0.0
+            gestures[name] = {
+                'precision': precision,
+                'recall': recall,
+                'f1': 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+                'support': support,
+                'activations': self.activations.get(name, 0),
+                'false_activations': self.false_activations.get(name, 0),
+            }
+        false_activations = sum(self.false_activations.values())
+        return {
+            'hands': hands,
+            'minutes': minutes,
+            'accuracy': float(np.trace(matrix)) / hands if hands else 0.0,
+            'false_activations': false_activations,
+            'false_activations_per_minute': false_activations / minutes if minutes else 0.0,
+            'gestures': gestures,
+            'labels': names,
+            'confusion': matrix.tolist(),
+        }
+
+
+def session_duration(timestamps):
+    """Seconds a session covers, counting its last frame."""
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    if len(timestamps) < 2:
+        return 0.0
+    return float(timestamps[-1] - timestamps[0] + np.median(np.diff(timestamps)))
+
+
+def format_confusion(names, matrix):
+    """The confusion matrix as text lines, labels down and predictions across."""
+    width = max([len(name) for name in names] + [5])
+    cell = max(len(str(int(matrix.max()))) if matrix.size else 1, 4)
+    lines = [' ' * (width + 1) + ' '.join(f"{i:>{cell}}" for i in range(len(names)))]
+    for i, name in enumerate(names):
+        lines.append(f"{name:>{width}} " + ' '.join(f"{value:>{cell}}" for value in matrix[i]) +
+                     f"  ({i})")
+    return lines
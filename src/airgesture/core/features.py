@@ -0,0 +1,185 @@
+"""Per-hand, per-frame derived features shared by the gesture predicates.
+
+Predicates overlap heavily: palm-open checks reuse the finger-extension
+test, and pinch, tap and spread checks all measure fingertip distances.
+``HandFeatures`` wraps one hand's (21, 3) landmark array for one frame and
+computes each derived feature on first access, so every later predicate
+reads the cached value. ``FeatureStats`` counts computations and reuses.
+
+Fingertip distances come in one of three ``units``:
+
+- ``image``: normalized image coordinates. A hand twice as far from the
+  camera has half the distances, so thresholds only suit one range.
+- ``palm``: multiples of the palm length (wrist to middle knuckle) of the
+  same hand in the same frame, which does not change with distance.
+- ``world``: metres, measured on MediaPipe's ``multi_hand_world_landmarks``.
+  Without world landmarks, palm-relative distances are converted with an
+  average palm length instead.
+"""
+from src.airgesture.core.landmarks import (FINGER_PIPS, FINGER_TIPS, INDEX_MCP, INDEX_TIP,
+                                           MIDDLE_MCP, MIDDLE_TIP, RING_MCP, THUMB_IP, THUMB_TIP,
+                                           WRIST)
+
+FINGER_JOINTS = tuple(zip(FINGER_TIPS, FINGER_PIPS))
+
+DISTANCE_UNITS = ('image', 'palm', 'world')
+NOMINAL_PALM_LENGTH = 0.095  # metres, wrist to middle knuckle of an adult hand
+MIN_PALM_SIZE = 1e-8         # squared; guards degenerate, collapsed hands
+
+
+class FeatureStats:
+    """Counts of feature computations and of cache hits that avoided one."""
+
+    def __init__(self):
+        self.computed = {}
+        self.reused = {}
+
+    def total_computed(self):
+        return sum(self.computed.values())
+
+    def total_reused(self):
+        return sum(self.reused.values())
+
+    def summary(self):
+        computed, reused = self.total_computed(), self.total_reused()
+        lookups = computed + reused
+        share = reused / lookups * 100 if lookups else 0.0
+        return f"{computed} computed, {reused} recomputations avoided ({share:.0f}% of lookups)"
+
+
+class feature:
+    """Descriptor computing a ``HandFeatures`` attribute once per instance."""
+
+    def __init__(self, compute):
+        self.compute = compute
+        self.name = compute.__name__
+        self.__doc__ = compute.__doc__
+
+    def __get__(self, hand, owner=None):
+        if hand is None:
+            return self
+        cache = hand.cache
+        stats = hand.stats
+        if self.name in cache:
+            if stats is not None:
+                stats.reused[self.name] = stats.reused.get(self.name, 0) + 1
+            return cache[self.name]
+        value = cache[self.name] = self.compute(hand)
+        if stats is not None:
+            stats.computed[self.name] = stats.computed.get(self.name, 0) + 1
+        return value
+
+
+def squared_distance(points, a, b):
+    ax, ay, az = points[a]
+    bx, by, bz = points[b]
+    return (ax - bx) ** 2 + (ay - by) ** 2 + (az - bz) ** 2
+
+
+def palm_scale(units, palm_size):
+    """Factor turning a squared image distance into squared ``units``.
+
+    ``palm_size`` is the squared palm length in image units.
+    """
+    if units == 'image':
+        return 1.0
+    scale = 1.0 / max(palm_size, MIN_PALM_SIZE)
+    if units == 'world':
+        return scale * NOMINAL_PALM_LENGTH ** 2
+    return scale
+
+
+class HandFeatures:
+    """Lazily computed features of one hand in one frame.
+
+    Build a new instance for every hand of every frame; nothing is ever
+    invalidated. Distances are squared, in ``units`` (see above); ``world``
+    is the hand's (21, 3) world landmark array, if available. Finger states
+    always use the image landmarks.
+    """
+
+    def __init__(self, landmarks, stats=None, units='image', world=None):
+        self.landmarks = landmarks
+        self.stats = stats
+        self.units = units
+        self.world = world
+        self.cache = {}
+
+    @feature
+    def points(self):
+        """The landmarks as a list of (x, y, z) float tuples."""
+        return self.landmarks.tolist()
+
+    @feature
+    def y(self):
+        """Vertical position of every landmark."""
+        return [point[1] for point in self.points]
+
+    @feature
+    def fingers_up(self):
+        """Index, middle, ring and pinky: tip above its PIP joint."""
+        y = self.y
+        return tuple(y[tip] < y[pip] for tip, pip in FINGER_JOINTS)
+
+    @feature
+    def fingers_down(self):
+        """Index, middle, ring and pinky: tip below its PIP joint."""
+        y = self.y
+        return tuple(y[tip] > y[pip] for tip, pip in FINGER_JOINTS)
+
+    @feature
+    def all_fingers_up(self):
+        return all(self.fingers_up)
+
+    @feature
+    def all_fingers_down(self):
+        return all(self.fingers_down)
+
+    @feature
+    def thumb_down(self):
+        """Thumb tip below its IP joint."""
+        return self.y[THUMB_TIP] > self.y[THUMB_IP]
+
+    @feature
+    def palm_size(self):
+        """Squared palm length, wrist to middle knuckle, in image units."""
+        return squared_distance(self.points, WRIST, MIDDLE_MCP)
+
+    @feature
+    def distance_points(self):
+        """The points fingertip distances are measured on."""
+        if self.units == 'world' and self.world is not None:
+            return self.world.tolist()
+        return self.points
+
+    @feature
+    def distance_scale(self):
+        """Factor turning squared distances of ``distance_points`` into ``units``."""
+        if self.units == 'image' or (self.units == 'world' and self.world is not None):
+            return 1.0
+        return palm_scale(self.units, self.palm_size)
+
+    @feature
+    def index_thumb_distance(self):
+        return squared_distance(self.distance_points, INDEX_TIP, THUMB_TIP) * self.distance_scale
+
+    @feature
+    def middle_thumb_distance(self):
+        return squared_distance(self.distance_points, MIDDLE_TIP, THUMB_TIP) * self.distance_scale
+
+    @feature
+    def index_middle_distance(self):
+        return squared_distance(self.distance_points, INDEX_TIP, MIDDLE_TIP) * self.distance_scale
+
+    @feature
+    def palm_facing(self):
+        """1 when the index, middle and ring knuckles are all nearer the camera
+        than the wrist, -1 when all are farther, otherwise 0."""
+        points = self.points
+        wrist_z = points[WRIST][2]
+        depths = [points[mcp][2] for mcp in (INDEX_MCP, MIDDLE_MCP, RING_MCP)]
+        if all(z < wrist_z for z in depths):
+            return 1
+        if all(z > wrist_z for z in depths):
+            return -1
+        return 0
@@ -0,0 +1,71 @@
+import math
+
+import numpy as np
+
+
+class OneEuroFilter:
+    """One Euro filter applied to a whole (21, 3) landmark array at once.
+
+    Each landmark gets its own adaptive cutoff: slow landmarks are smoothed
+    hard to remove jitter, fast ones follow with little lag. The smoothing
+    factor is derived from the real time between samples, so uneven frame
+    intervals (frame skipping, late inferences) are handled correctly.
+    """
+
+    def __init__(self, min_cutoff=1.5, beta=10.0, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        """Forget all state."""
+        self.value = None
+        self.derivative = None
+        self.timestamp = None
+
+    def __call__(self, landmarks, timestamp):
+        """Filter ``landmarks`` observed at ``timestamp`` (seconds) and return the result."""
+        if self.value is None:
+            self.value = np.array(landmarks, dtype=np.float32)
+            self.derivative = np.zeros_like(self.value)
+            self.timestamp = timestamp
+            return self.value
+
+        dt = timestamp - self.timestamp
+        if dt <= 0:
+            return self.value
+        self.timestamp = timestamp
+
+        # Smoothed per-coordinate velocity, then per-landmark cutoff from its speed
+        d_alpha = 1.0 / (1.0 + 1.0 / (2 * math.pi * self.d_cutoff * dt))
+        self.derivative += d_alpha * ((landmarks - self.value) / dt - self.derivative)
+        cutoff = self.min_cutoff + self.beta * np.linalg.norm(self.derivative, axis=-1, keepdims=True)
+        alpha = 1.0 / (1.0 + 1.0 / (2 * np.pi * dt * cutoff))
+        self.value += alpha * (landmarks - self.value)
+        return self.value
+
+
+class LandmarkFilterBank:
+    """Separate One Euro filter state for every tracked hand."""
+
+    def __init__(self, min_cutoff=1.5, beta=10.0, d_cutoff=1.0):
+        self.params = (min_cutoff, beta, d_cutoff)
+        self.filters = {}
+
+    def filter(self, key, landmarks, timestamp):
+        """Filter the landmarks of hand ``key`` and return the smoothed array."""
+        one_euro = self.filters.get(key)
+        if one_euro is None:
+            one_euro = self.filters[key] = OneEuroFilter(*self.params)
+        return one_euro(landmarks, timestamp)
+
+    def prune(self, active_keys):
+        """Drop filter state for hands that are no longer tracked."""
+        for key in list(self.filters):
+            if key not in active_keys:
+                del self.filters[key]
+
+    def reset(self):
+        """Drop all filter state."""
+        self.filters.clear()
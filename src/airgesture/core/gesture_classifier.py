@@ -0,0 +1,177 @@
+"""The built-in gesture rules of profiles without their own, as one lookup table."""
+import numpy as np
+
+from src.airgesture.core.gesture_model import load_model
+from src.airgesture.core.landmarks import (INDEX_MCP, INDEX_PIP, INDEX_TIP, MIDDLE_MCP, MIDDLE_PIP,
+                                           MIDDLE_TIP, PINKY_PIP, PINKY_TIP, RING_MCP, RING_PIP,
+                                           RING_TIP, THUMB_IP, THUMB_TIP, WRIST, Y, Z)
+from src.airgesture.core.rules import RuleSet
+from src.airgesture.utils.config import PROFILE_DEFAULTS
+
+PINCH_THRESHOLD = PROFILE_DEFAULTS['pinch_threshold']
+FINGER_DISTANCE_THRESHOLD = PROFILE_DEFAULTS['finger_distance_threshold']
+
+# Position tests, each true when landmarks[first, axis] < landmarks[second, axis].
+# Image y grows downwards, so "up" means a smaller y.
+COMPARISONS = {
+    'thumb_up': (THUMB_TIP, THUMB_IP, Y),
+    'index_up': (INDEX_TIP, INDEX_PIP, Y),
+    'middle_up': (MIDDLE_TIP, MIDDLE_PIP, Y),
+    'ring_up': (RING_TIP, RING_PIP, Y),
+    'pinky_up': (PINKY_TIP, PINKY_PIP, Y),
+    'index_down': (INDEX_PIP, INDEX_TIP, Y),
+    'middle_down': (MIDDLE_PIP, MIDDLE_TIP, Y),
+    'ring_down': (RING_PIP, RING_TIP, Y),
+    'pinky_down': (PINKY_PIP, PINKY_TIP, Y),
+    'middle_below_index_pip': (INDEX_PIP, MIDDLE_TIP, Y),
+    'ring_below_index_pip': (INDEX_PIP, RING_TIP, Y),
+    'pinky_below_index_pip': (INDEX_PIP, PINKY_TIP, Y),
+    'ring_below_middle_tip': (MIDDLE_TIP, RING_TIP, Y),
+    'pinky_below_middle_tip': (MIDDLE_TIP, PINKY_TIP, Y),
+    'ring_above_middle_pip': (RING_TIP, MIDDLE_PIP, Y),
+    'pinky_above_middle_pip': (PINKY_TIP, MIDDLE_PIP, Y),
+    'index_below_wrist': (WRIST, INDEX_TIP, Y),
+    'middle_below_wrist': (WRIST, MIDDLE_TIP, Y),
+    # Palm orientation: knuckles nearer the camera than the wrist, or farther
+    'index_mcp_front': (INDEX_MCP, WRIST, Z),
+    'middle_mcp_front': (MIDDLE_MCP, WRIST, Z),
+    'ring_mcp_front': (RING_MCP, WRIST, Z),
+    'index_mcp_behind': (WRIST, INDEX_MCP, Z),
+    'middle_mcp_behind': (WRIST, MIDDLE_MCP, Z),
+    'ring_mcp_behind': (WRIST, RING_MCP, Z),
+}
+
+# Quantized distances: (first, second, profile setting, default, True if "closer than")
+DISTANCES = {
+    'pinch': (INDEX_TIP, THUMB_TIP, 'pinch_threshold', PINCH_THRESHOLD, True),
+    'middle_thumb_tap': (MIDDLE_TIP, THUMB_TIP, 'pinch_threshold', PINCH_THRESHOLD, True),
+    'fingers_apart': (INDEX_TIP, MIDDLE_TIP, 'finger_distance_threshold',
+                      FINGER_DISTANCE_THRESHOLD, False),
+}
+
+# Gestures in priority order, each the set of conditions that must all hold.
+# These mirror the predicates of GestureDetector and are used by profiles
+# that do not define their own "gestures" rules.
+GESTURES = [
+    ("Index up", ('index_up', 'middle_below_index_pip', 'ring_below_index_pip',
+                  'pinky_below_index_pip')),
+    ("Pinch", ('pinch',)),
+    ("Middle thumb tap", ('middle_thumb_tap',)),
+    ("Two fingers up", ('index_up', 'middle_up', 'ring_below_middle_tip',
+                        'pinky_below_middle_tip')),
+    ("Two fingers down", ('index_down', 'index_below_wrist', 'middle_down', 'middle_below_wrist',
+                          'ring_above_middle_pip', 'pinky_above_middle_pip')),
+    ("Five fingers up", ('index_up', 'middle_up', 'ring_up', 'pinky_up')),
+    ("Five fingers down", ('index_down', 'middle_down', 'ring_down', 'pinky_down')),
+]
+
+
+class GestureClassifier:
+    """Classify a hand with one vectorized pass and a table lookup.
+
+    Only the conditions the gestures use are evaluated. Finger extension
+    tests and the other position comparisons are done as a single gather
+    and compare; the pinch/tap/spread distances are quantized against the
+    active profile's thresholds. The resulting bits form an integer code
+    that indexes a lookup table, built once per profile, holding the
+    highest-priority gesture for every combination. Cost per hand no longer
+    depends on how many gestures are defined.
+    """
+
+    def __init__(self, settings, gestures=GESTURES):
+        self.names = [name for name, _ in gestures]
+        needed = []
+        for _, conditions in gestures:
+            needed.extend(c for c in conditions if c not in needed)
+        unknown = [c for c in needed if c not in COMPARISONS and c not in DISTANCES]
+        if unknown:
+            raise ValueError(f"Unknown gesture conditions: {', '.join(unknown)}")
+
+        # Comparisons first, then distances; bit i of the code is condition i
+        self.conditions = ([c for c in needed if c in COMPARISONS] +
+                           [c for c in needed if c in DISTANCES])
+        # Flat indices into the raveled (21, 3) array
+        compared = [COMPARISONS[c] for c in self.conditions if c in COMPARISONS]
+        self.first = np.array([first * 3 + axis for first, _, axis in compared], dtype=np.intp)
+        self.second = np.array([second * 3 + axis for _, second, axis in compared], dtype=np.intp)
+
+        measured = [DISTANCES[c] for c in self.conditions if c in DISTANCES]
+        self.distance_first = np.array([d[0] for d in measured], dtype=np.intp)
+        self.distance_second = np.array([d[1] for d in measured], dtype=np.intp)
+        thresholds = np.array([settings.get(d[2], d[3]) for d in measured], dtype=np.float32)
+        # Compare signed squared distances so "closer" and "farther" share one test
+        self.sign = np.array([1.0 if d[4] else -1.0 for d in measured], dtype=np.float32)
+        self.limits = self.sign * thresholds ** 2
+
+        weights = 1 << np.arange(len(self.conditions), dtype=np.int64)
+        self.compare_weights = weights[:len(compared)]
+        self.distance_weights = weights[len(compared):]
+        self.masks = [sum(1 << self.conditions.index(c) for c in conditions)
+                      for _, conditions in gestures]
+        self.table = self.build_table(gestures)
+
+        # Bit i of the code as a test for core.profiles, and the profile
+        # setting its threshold comes from
+        self.tests = ([('position', int(first), int(second))
+                       for first, second in zip(self.first, self.second)] +
+                      [('distance', d[0], d[1], float(limit) ** 2, d[4])
+                       for d, limit in zip(measured, thresholds)])
+        self.test_settings = [None] * len(compared) + [d[2] for d in measured]
+
+    def build_table(self, gestures):
+        """Resolve every condition code to its highest-priority gesture (0 for none)."""
+        codes = np.arange(1 << len(self.conditions), dtype=np.int64)
+        table = np.zeros(len(codes), dtype=np.uint8)
+        # Lowest priority first so higher-priority gestures overwrite it
+        for number in range(len(gestures), 0, -1):
+            mask = self.masks[number - 1]
+            table[(codes & mask) == mask] = number
+        return table
+
+    def lookup_table(self, hand):
+        """The gesture number (0 for none) of every code; the same for both hands."""
+        return self.table
+
+    def rule_masks(self):
+        """(required, forbidden, hands) bit masks of every gesture, in priority order."""
+        return [(mask, 0, ('Left', 'Right')) for mask in self.masks]
+
+    def features(self, landmarks):
+        """Evaluate every condition of a (21, 3) hand; returns two bool arrays."""
+        flat = landmarks.reshape(-1)
+        compared = flat[self.first] < flat[self.second]
+        offsets = landmarks[self.distance_first] - landmarks[self.distance_second]
+        distances = (offsets * offsets).sum(axis=1)
+        return compared, self.sign * distances < self.limits
+
+    def code(self, landmarks):
+        """Pack the conditions of a (21, 3) hand into an integer bitmask."""
+        compared, near = self.features(landmarks)
+        return int(compared @ self.compare_weights) + int(near @ self.distance_weights)
+
+    def classify_batch(self, landmarks, handedness=None):
+        """Gesture names of (N, 21, 3) hands, None where no gesture matches."""
+        landmarks = np.asarray(landmarks, dtype=np.float32)
+        flat = landmarks.reshape(len(landmarks), -1)
+        compared = flat[:, self.first] < flat[:, self.second]
+        offsets = landmarks[:, self.distance_first] - landmarks[:, self.distance_second]
+        near = self.sign * np.einsum('nij,nij->ni', offsets, offsets) < self.limits
+        codes = compared @ self.compare_weights + near @ self.distance_weights
+        return [self.names[number - 1] if number else None for number in self.table[codes].tolist()]
+
+    def classify(self, landmarks, hand=None):
+        """Return the gesture name for a (21, 3) hand, or None."""
+        number = self.table[self.code(landmarks)]
+        return self.names[number - 1] if number else None
+
+
+def build_classifier(settings):
+    """Load the profile's trained "model", compile its "gestures" rules, or
+    fall back to ``GESTURES``."""
+    if 'model' in settings:
+        return load_model(settings['model'])
+    if 'gestures' not in settings:
+        return GestureClassifier(settings)
+    thresholds = dict(PROFILE_DEFAULTS)
+    thresholds.update(settings)
+    return RuleSet(settings['gestures'], thresholds)
@@ -1,21 +1,38 @@
 import cv2
-import numpy as np
-import mediapipe as mp
-import pyautogui
-import screen_brightness_control as sbc
 import time
 import os
 import sys
 import tempfile
 from pathlib import Path
-from pynput.mouse import Controller, Button
-from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
-from comtypes import CLSCTX_ALL
 from PyQt5.QtWidgets import QLabel, QFrame, QVBoxLayout, QHBoxLayout, QMessageBox
 from PyQt5.QtCore import Qt
 
-from src.airgesture.utils.config import (CAMERA_CONFIG, GESTURE_CONFIG, 
-                                   GESTURE_THRESHOLDS, SYSTEM_CONFIG)
+from src.airgesture.core.actions import SystemActions
+from src.airgesture.core.debounce import HELD, STARTED, GestureStates
+from src.airgesture.core.features import FeatureStats, HandFeatures
+from src.airgesture.core.filters import LandmarkFilterBank
+from src.airgesture.core.incremental import ClassificationCache
+from src.airgesture.core.landmarks import (INDEX_TIP, results_to_array, results_to_world_array,
+                                           write_landmarks)
+from src.airgesture.core.motion import MotionRecognizerBank
+from src.airgesture.core.pipeline import plan_profile
+from src.airgesture.core.predicates import (is_five_fingers_down, is_full_palm_open,
+                                            is_index_finger_up, is_namaste, is_pinky_finger_down,
+                                            is_pinky_finger_up, is_two_fingers_up)
+from src.airgesture.core.predictor import LandmarkPredictor
+from src.airgesture.core.profiles import load_profiles
+from src.airgesture.core.runtime import configure_inference_thread
+from src.airgesture.core.scores import GESTURE_NAMES, GestureEventLog, GestureScorer, top_gestures
+from src.airgesture.core.sequences import SequenceMachine
+from src.airgesture.core.tracker import HandState, HandTracker
+from src.airgesture.core.warmup import ModelWarmup
+from src.airgesture.core.watchdog import InferenceWatchdog
+from src.airgesture.utils.config import (CAMERA_CONFIG, FEATURE_CONFIG, FILTER_CONFIG,
+                                   GESTURE_CONFIG, GESTURE_PROFILES_FILE, GESTURE_SEQUENCES,
+                                   GESTURE_TIMING, HYSTERESIS_TABLES, MOTION_CONFIG,
+                                   PREDICTOR_CONFIG, REUSE_CONFIG, RUNTIME_CONFIG,
+                                   SCORE_CONFIG, SYSTEM_CONFIG, THRESHOLD_TABLES,
+                                   TRACKER_CONFIG, WARMUP_CONFIG, WATCHDOG_CONFIG)
 
 def get_mediapipe_model_path():
     """Get the correct path to MediaPipe model files whether running from source or executable."""
@@ -24,56 +41,163 @@ def get_mediapipe_model_path():
         base_path = sys._MEIPASS
     else:
         # Running from source
+        import mediapipe as mp
         base_path = os.path.dirname(mp.__file__)
     return os.path.join(base_path, 'mediapipe', 'modules')
 
+def draw_mediapipe_landmarks(frame_rgb, hand_landmarks):
+    """Draw one hand's landmarks and connections with MediaPipe's drawing utils."""
+    # Imported on first use, so headless backends run without MediaPipe installed
+    import mediapipe as mp
+    mp.solutions.drawing_utils.draw_landmarks(frame_rgb, hand_landmarks,
+                                              mp.solutions.hands.HAND_CONNECTIONS)
+
 class GestureDetector:
-    def __init__(self):
+    def __init__(self, camera=None, hands_factory=None, actions=None):
+        """Build the detector on the webcam, MediaPipe and the local desktop.
+
+        ``camera`` (anything with ``read``/``release`` and a ``frame_size``),
+        ``hands_factory`` and ``actions`` replace those for headless runs,
+        e.g. with ``core.scripted_hands`` and ``RecordingActions``.
+        """
         # Initialize camera
         self.cap = None
-        self.init_camera()
+        self.frame_size = (CAMERA_CONFIG['width'], CAMERA_CONFIG['height'])
+        if camera is None:
+            self.init_camera()
+        else:
+            self.cap = camera
+            self.frame_size = camera.frame_size
         
-        # Initialize MediaPipe
-        try:
-            # Set the model path for MediaPipe
-            model_path = get_mediapipe_model_path()
-            os.environ['MEDIAPIPE_MODEL_PATH'] = model_path
-            
-            self.mp_hands = mp.solutions.hands
-            self.hands = self.mp_hands.Hands(
-                static_image_mode=False,
-                max_num_hands=GESTURE_CONFIG['max_num_hands'],
-                min_detection_confidence=GESTURE_CONFIG['min_detection_confidence'],
-                min_tracking_confidence=GESTURE_CONFIG['min_tracking_confidence'],
-                model_complexity=GESTURE_CONFIG['model_complexity']
-            )
-            self.mp_drawing = mp.solutions.drawing_utils
-        except Exception as e:
-            error_msg = str(e)
-            if "Could not find the model file" in error_msg or "path does not exist" in error_msg:
-                error_msg = ("Failed to initialize MediaPipe hand tracking.\n\n"
-                           "This could be due to:\n"
-                           "1. Missing model files\n"
-                           "2. Insufficient permissions to access model files\n"
-                           "3. Antivirus blocking access to files\n\n"
-                           f"Model path: {model_path}\n"
-                           "Try running the application with administrator privileges.")
-            raise RuntimeError(error_msg)
+        # What the active profile needs: hands to track, conditions, sequences
+        self.plan = self.plan_profile(GESTURE_CONFIG['profile'])
+        self.backend_hands = self.plan.max_hands
+        self.reload_backend = False
+        
+        # Initialize MediaPipe in the background so the UI can come up first;
+        # the preview is drawn by the backend's own drawer when it has one
+        self.hands_factory = hands_factory or self.create_hands
+        self.draw_landmarks = draw_mediapipe_landmarks
+        self.watchdog = None
+        self.warmup = ModelWarmup(self.hands_factory, self.frame_size, **WARMUP_CONFIG)
+        self.warmup.start()
         
         # Initialize controllers
-        self.mouse = Controller()
-        self.init_volume_control()
+        self.actions = actions or SystemActions()
         
         # Initialize state
         self.is_running = False
-        self.cursor_smoothing = GESTURE_CONFIG['cursor_smoothing']
-        self.smoothed_cursor_x = None
-        self.smoothed_cursor_y = None
-        self.cursor_active = True
-        self.click_ready = False
-        self.last_palm_open_time = 0
         self.palm_open_cooldown = GESTURE_CONFIG['palm_open_cooldown']
         
+        # Persistent hand identities; per-hand gesture state lives on each track
+        self.tracker = HandTracker(TRACKER_CONFIG['max_distance'], TRACKER_CONFIG['label_penalty'],
+                                   TRACKER_CONFIG['history'], TRACKER_CONFIG['max_missed'],
+                                   state_factory=lambda: HandState(GestureStates(GESTURE_TIMING)))
+        
+        # Fingertip distance units, and the squared (enter, exit) distances
+        # of the hysteresis switches in those units
+        self.feature_units = FEATURE_CONFIG['units']
+        thresholds = THRESHOLD_TABLES[self.feature_units]
+        self.hysteresis = {name: (thresholds[name] ** 2, exit ** 2)
+                           for name, exit in HYSTERESIS_TABLES[self.feature_units].items()}
+        
+        # Confidence scores of every gesture; single-frame gestures dispatch on
+        # the top score, and dispatched events are logged with their scores
+        self.scorer = GestureScorer(SCORE_CONFIG['softness'])
+        self.min_scores = SCORE_CONFIG['min_score']
+        self.gesture_events = GestureEventLog(SCORE_CONFIG['event_log'])
+        
+        # Hands that held still since their last evaluation reuse its result
+        self.classification_cache = ClassificationCache(REUSE_CONFIG['epsilon'],
+                                                        REUSE_CONFIG['max_age'],
+                                                        REUSE_CONFIG['enabled'])
+        
+        # Per-frame conditions of the cursor and the sequences, by name
+        self.conditions = {
+            'spread': lambda state, hand: self.switch(state, 'fingers_apart', 'fingers_apart_distance',
+                                                      hand.index_middle_distance),
+            'together': lambda state, hand: self.switch(state, 'fingers_together',
+                                                        'fingers_together_distance',
+                                                        hand.index_middle_distance),
+            'pinch': lambda state, hand: self.switch(state, 'pinch', 'pinch_distance',
+                                                     hand.index_thumb_distance),
+            'middle_tap': lambda state, hand: self.switch(state, 'middle_tap', 'pinch_distance',
+                                                          hand.middle_thumb_distance),
+            'two_fingers_up': lambda state, hand: is_two_fingers_up(hand),
+            'five_fingers_down': lambda state, hand: is_five_fingers_down(hand),
+            'palm_open': lambda state, hand: is_full_palm_open(hand),
+            'index_up': lambda state, hand: is_index_finger_up(hand),
+            'pinky_up': lambda state, hand: is_pinky_finger_up(hand),
+            'pinky_down': lambda state, hand: is_pinky_finger_down(hand),
+        }
+        
+        # Landmark smoothing, kept separately for each tracked hand
+        self.landmark_filter = LandmarkFilterBank(FILTER_CONFIG['min_cutoff'], FILTER_CONFIG['beta'],
+                                                  FILTER_CONFIG['d_cutoff'])
+        
+        # Sequence machines and motion recognizers of the profile's gestures
+        self.configure_pipeline()
+        
+        # Counts how often predicates reused a per-hand feature
+        self.feature_stats = FeatureStats()
+        
+        # Landmark prediction between and ahead of inferences
+        self.frame_counter = 0
+        self.cursor_track = None
+        self.predicted_ids = []
+        self.predictor = None
+        if PREDICTOR_CONFIG['enabled']:
+            self.predictor = LandmarkPredictor(PREDICTOR_CONFIG['alpha'], PREDICTOR_CONFIG['beta'],
+                                               PREDICTOR_CONFIG['max_horizon'])
+        
+    def plan_profile(self, name):
+        motion_actions = MOTION_CONFIG['actions'] if MOTION_CONFIG['enabled'] else {}
+        return plan_profile(load_profiles(GESTURE_PROFILES_FILE), name, GESTURE_SEQUENCES, motion_actions,
+                            GESTURE_CONFIG['max_num_hands'])
+        
+    def configure_pipeline(self):
+        """Build the sequence machines and motion recognizers the plan needs."""
+        # Multi-step gestures such as spread-then-pinch, compiled once per handedness
+        self.sequences = {label: SequenceMachine(self.plan.sequences, label)
+                          for label in self.plan.hands}
+        
+        # The profile's own (e.g. tuned) cursor smoothing wins over the global one
+        self.cursor_smoothing = self.plan.settings.get('cursor_smoothing',
+                                                       GESTURE_CONFIG['cursor_smoothing'])
+        
+        # Swipes, circles and flicks from each tracked hand's recent landmarks
+        self.motion = None
+        self.motion_actions = self.plan.motion_actions
+        if self.motion_actions:
+            params = {key: value for key, value in MOTION_CONFIG.items()
+                      if key not in ('enabled', 'actions')}
+            self.motion = MotionRecognizerBank(**params)
+        print(f"Gesture pipeline: {self.plan.describe()}")
+        
+    def change_profile(self, name):
+        """Switch to another profile of ``GESTURE_PROFILES_FILE`` and rebuild the pipeline.
+
+        The tracking backend is rebuilt when the profile needs a different
+        number of hands. Returns False for an unknown or invalid profile.
+        """
+        try:
+            plan = self.plan_profile(name)
+        except ValueError as e:
+            print(f"Error changing profile: {str(e)}")
+            return False
+        self.plan = plan
+        # Per-hand progress belongs to the old sequence machines
+        self.tracker.reset()
+        self.cursor_track = None
+        self.configure_pipeline()
+        if plan.max_hands != self.backend_hands:
+            self.backend_hands = plan.max_hands
+            if self.watchdog is not None:
+                self.watchdog.reload()
+            else:
+                self.reload_backend = True
+        return True
+        
     def init_camera(self):
         """Initialize the camera with proper error handling."""
         available_cameras = []
@@ -110,6 +234,7 @@ class GestureDetector:
                     actual_fps = self.cap.get(cv2.CAP_PROP_FPS)
                     
                     print(f"Camera initialized with resolution: {actual_width}x{actual_height} at {actual_fps}fps")
+                    self.frame_size = (int(actual_width), int(actual_height))
                     break
             except Exception as e:
                 print(f"Error opening camera {camera_index}: {str(e)}")
@@ -118,15 +243,48 @@ class GestureDetector:
         if not self.cap or not self.cap.isOpened():
             raise RuntimeError("Failed to open any camera. Please check if your camera is connected and not in use by another application.")
             
-    def init_volume_control(self):
+    def create_hands(self):
+        """Create the MediaPipe hand tracking backend."""
+        configure_inference_thread(RUNTIME_CONFIG)
+        import mediapipe as mp
+        model_path = get_mediapipe_model_path()
         try:
-            devices = AudioUtilities.GetSpeakers()
-            interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-            self.volume = interface.QueryInterface(IAudioEndpointVolume)
+            # Set the model path for MediaPipe
+            os.environ['MEDIAPIPE_MODEL_PATH'] = model_path
+            
+            return mp.solutions.hands.Hands(
+                static_image_mode=False,
+                max_num_hands=self.backend_hands,
+                min_detection_confidence=GESTURE_CONFIG['min_detection_confidence'],
+                min_tracking_confidence=GESTURE_CONFIG['min_tracking_confidence'],
+                model_complexity=GESTURE_CONFIG['model_complexity']
+            )
         except Exception as e:
-            print(f"Could not initialize volume control: {e}")
-            self.volume = None
+            error_msg = str(e)
+            if "Could not find the model file" in error_msg or "path does not exist" in error_msg:
+                error_msg = ("Failed to initialize MediaPipe hand tracking.\n\n"
+                           "This could be due to:\n"
+                           "1. Missing model files\n"
+                           "2. Insufficient permissions to access model files\n"
+                           "3. Antivirus blocking access to files\n\n"
+                           f"Model path: {model_path}\n"
+                           "Try running the application with administrator privileges.")
+            raise RuntimeError(error_msg)
             
+    def is_ready(self):
+        """Check whether the hand tracking backend has finished warming up."""
+        if self.watchdog is None and self.warmup.is_ready():
+            self.watchdog = InferenceWatchdog(self.hands_factory, self.warmup.hands,
+                                              WATCHDOG_CONFIG['deadline'],
+                                              WATCHDOG_CONFIG['restart_after'])
+            self.draw_landmarks = getattr(self.warmup.hands, 'draw_landmarks',
+                                          draw_mediapipe_landmarks)
+            if self.reload_backend:
+                # The profile changed during warm-up
+                self.watchdog.reload()
+                self.reload_backend = False
+        return self.watchdog is not None
+        
     def add_indicators(self, layout):
         # Create brightness indicator
         brightness_container = QFrame()
@@ -233,26 +391,75 @@ class GestureDetector:
             frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
             
             # Process gestures if running
-            if self.is_running:
+            if self.is_running and self.watchdog is not None:
                 try:
-                    results = self.hands.process(frame_rgb)
+                    self.frame_counter += 1
+                    if self.frame_counter % GESTURE_CONFIG['inference_interval']:
+                        # Skipped frame: keep the cursor moving on predicted landmarks
+                        self.update_predicted_cursor()
+                        return frame_rgb
+                        
+                    capture_time = time.perf_counter()
+                    results = self.watchdog.process(frame_rgb)
+                    if results is None:
+                        # Inference stalled: keep the cursor on predicted landmarks
+                        self.update_predicted_cursor()
+                        return frame_rgb
+                        
                     current_time = time.time()
+                    self.cursor_track = None
                     
                     if results.multi_hand_landmarks:
-                        for hand_landmarks, handedness in zip(results.multi_hand_landmarks, 
-                                                            results.multi_handedness):
+                        landmarks = results_to_array(results)
+                        labels = [handedness.classification[0].label
+                                  for handedness in results.multi_handedness]
+                        tracks = self.tracker.update(landmarks, labels)
+                        self.filter_landmarks(results, landmarks, tracks, capture_time)
+                        self.update_predictor(landmarks, tracks, capture_time)
+                        self.update_motion(landmarks, tracks, capture_time)
+                            
+                        world = None
+                        if self.feature_units == 'world':
+                            world = results_to_world_array(results)
+                            
+                        active, hand_features, fresh = [], [], []
+                        for index, (hand, hand_landmarks, track) in enumerate(
+                                zip(landmarks, results.multi_hand_landmarks, tracks)):
                             # Draw landmarks
-                            self.mp_drawing.draw_landmarks(frame_rgb, hand_landmarks, 
-                                                         self.mp_hands.HAND_CONNECTIONS)
+                            self.draw_landmarks(frame_rgb, hand_landmarks)
+                            if track.label not in self.plan.hands:
+                                # No gesture of the profile uses this hand
+                                continue
+                            features = self.classification_cache.lookup(track.state, hand,
+                                                                        track.label, current_time)
+                            if features is None:
+                                features = HandFeatures(hand, self.feature_stats, self.feature_units,
+                                                        None if world is None else world[index])
+                                self.classification_cache.store(track.state, features, track.label,
+                                                                current_time)
+                            active.append(index)
+                            hand_features.append(features)
+                            fresh.append(features.landmarks is hand and
+                                         track.label in self.plan.scored)
                             
-                            if handedness.classification[0].label == "Right":
-                                self.process_right_hand(hand_landmarks)
+                        # Score every newly evaluated hand in one pass
+                        active_tracks = [tracks[index] for index in active]
+                        self.update_scores(frame_rgb, landmarks[active], hand_features,
+                                           active_tracks, fresh)
+                        for index, features, track in zip(active, hand_features, active_tracks):
+                            if track.label == "Right":
+                                self.process_right_hand(features, landmarks[index], track,
+                                                        current_time)
                             else:
-                                self.process_left_hand(hand_landmarks, current_time)
+                                self.process_left_hand(features, track, current_time)
                                 
-                        if len(results.multi_hand_landmarks) == 2:
-                            self.check_namaste_gesture(results.multi_hand_landmarks[0],
-                                                     results.multi_hand_landmarks[1])
+                        if len(hand_features) == 2 and 'namaste' in self.plan.actions:
+                            self.check_namaste_gesture(hand_features[0], hand_features[1])
+                    else:
+                        self.tracker.update(results_to_array(results), [])
+                        self.landmark_filter.prune(self.tracker.active_ids())
+                        self.update_predictor(None, [], capture_time)
+                        self.update_motion(None, [], capture_time)
                 except Exception as e:
                     print(f"Error processing gestures: {str(e)}")
                     
@@ -261,59 +468,183 @@ class GestureDetector:
             print(f"Error in process_frame: {str(e)}")
             return None
         
-    def process_right_hand(self, hand_landmarks):
-        """Process right hand gestures."""
-        if self.is_fingers_apart(hand_landmarks):
-            self.cursor_active = False
-            self.click_ready = True
-        else:
-            self.cursor_active = True
-            self.click_ready = False
-            
-        if self.cursor_active and self.is_two_fingers_up(hand_landmarks):
-            self.update_cursor_position(hand_landmarks)
+    def filter_landmarks(self, results, landmarks, tracks, timestamp):
+        """Smooth every detected hand in place, keyed by its track.
+
+        Gesture predicates read ``landmarks``; the filtered values are also
+        written back into the protobuf landmarks so the overlay matches.
+        """
+        for index, (hand_landmarks, track) in enumerate(zip(results.multi_hand_landmarks, tracks)):
+            landmarks[index] = self.landmark_filter.filter(track.id, landmarks[index], timestamp)
+            write_landmarks(hand_landmarks, landmarks[index])
+        self.landmark_filter.prune(self.tracker.active_ids())
+        
+    def update_predictor(self, landmarks, tracks, timestamp):
+        """Feed the predictor with this frame's hands, ordered by track ID."""
+        if self.predictor is None:
+            return
+        if not tracks:
+            self.predictor.reset()
+            self.predicted_ids = []
+            return
             
-        if not self.cursor_active and self.click_ready:
-            if self.is_pinch(hand_landmarks):
-                self.mouse.click(Button.left, 1)
-                self.click_ready = False
-            elif self.is_middle_thumb_tap(hand_landmarks):
-                self.mouse.click(Button.right, 1)
-                self.click_ready = False
+        order = sorted(range(len(tracks)), key=lambda index: tracks[index].id)
+        ids = [tracks[index].id for index in order]
+        if ids != self.predicted_ids:
+            self.predictor.reset()
+            self.predicted_ids = ids
+        self.predictor.update(landmarks[order], timestamp)
+        
+    def update_motion(self, landmarks, tracks, timestamp):
+        """Feed every tracked hand's motion recognizer and act on completed gestures."""
+        if self.motion is None:
+            return
+        for index, track in enumerate(tracks):
+            gesture = self.motion.update(track.id, landmarks[index], timestamp)
+            if gesture is not None and gesture in self.motion_actions:
+                self.actions.hotkey(*self.motion_actions[gesture])
+        self.motion.prune(self.tracker.active_ids())
+        
+    def update_scores(self, frame, landmarks, hand_features, tracks, fresh):
+        """Store the gesture scores of newly evaluated hands on their tracks, and
+        draw every hand's top gesture."""
+        scored = [index for index, is_fresh in enumerate(fresh) if is_fresh]
+        if scored:
+            scores = self.scorer.score_hands([hand_features[index] for index in scored],
+                                             [tracks[index].label for index in scored])
+            for index, row, (gesture, score) in zip(scored, scores, top_gestures(scores)):
+                state = tracks[index].state
+                state.scores = row
+                state.top_gesture, state.top_score = gesture, score
+                
+        if not SCORE_CONFIG['overlay']:
+            return
+        height, width = frame.shape[:2]
+        for hand, track in zip(landmarks, tracks):
+            gesture, score = track.state.top_gesture, track.state.top_score
+            if gesture is not None:
+                x, y = int(hand[0, 0] * width), int(hand[0, 1] * height) + 20
+                cv2.putText(frame, f"{gesture} {score:.2f}", (x, y), cv2.FONT_HERSHEY_SIMPLEX,
+                            0.5, (255, 255, 255), 1, cv2.LINE_AA)
+                
+    def dispatch(self, track, name, current_time):
+        """Debounced event of gesture ``name``, present while it tops the hand's scores.
+
+        None when the profile does not enable the gesture.
+        """
+        if name not in self.plan.actions:
+            return None
+        state = track.state
+        present = (state.top_gesture == name and
+                   state.top_score >= self.min_scores.get(name, self.min_scores['default']))
+        event = state.gestures.update(name, present, current_time)
+        if event is not None:
+            self.gesture_events.record(current_time, track.id, name, event,
+                                       float(state.scores[GESTURE_NAMES.index(name)]))
+        return event
+        
+    def switch(self, state, name, threshold, value):
+        """Hysteresis switch ``name`` on a squared distance, for one hand."""
+        enter, exit = self.hysteresis[threshold]
+        return state.gestures.switch(name, value, enter, exit)
+        
+    def hand_conditions(self, state, hand, label):
+        """Evaluate the conditions the plan needs on one hand, by name."""
+        return {name: self.conditions[name](state, hand) for name in self.plan.conditions[label]}
+        
+    def update_sequences(self, state, label, conditions, current_time):
+        """Advance one hand's multi-step gestures and run the ones it completes."""
+        machine = self.sequences[label]
+        if not machine.names:
+            return
+        progress = state.sequences.get(label)
+        if progress is None:
+            progress = state.sequences[label] = machine.start()
+        for name in machine.update(progress, conditions, current_time):
+            sequence = machine.by_name[name]
+            if 'click' in sequence:
+                self.actions.click(sequence['click'])
+            elif 'hotkey' in sequence:
+                self.actions.hotkey(*sequence['hotkey'])
+        
+    def process_right_hand(self, hand, landmarks, track, current_time):
+        """Process right hand gestures on its ``HandFeatures``.
+
+        ``landmarks`` is this frame's (21, 3) array, which the cursor follows
+        even when ``hand`` is a reused classification.
+        """
+        state = track.state
+        conditions = self.hand_conditions(state, hand, "Right")
+        if 'move_cursor' in self.plan.actions:
+            # Spreading the fingers parks the cursor; clicks are GESTURE_SEQUENCES
+            state.cursor_active = not conditions['spread']
+            if state.cursor_active and conditions['two_fingers_up']:
+                self.cursor_track = track
+                self.update_cursor_position(state, *self.cursor_target(landmarks, track))
                 
-        if self.is_pinky_finger_up(hand_landmarks):
-            self.adjust_brightness(1)
-        elif self.is_pinky_finger_down(hand_landmarks):
-            self.adjust_brightness(-1)
+        self.update_sequences(state, "Right", conditions, current_time)
+                
+        if self.dispatch(track, 'brightness_up', current_time) in (STARTED, HELD):
+            self.actions.adjust_brightness(1)
+        if self.dispatch(track, 'brightness_down', current_time) in (STARTED, HELD):
+            self.actions.adjust_brightness(-1)
             
-    def process_left_hand(self, hand_landmarks, current_time):
-        """Process left hand gestures."""
-        if self.is_index_middle_fingers_together(hand_landmarks):
-            if self.is_two_fingers_up(hand_landmarks):
-                self.mouse.scroll(0, SYSTEM_CONFIG['scroll_step'])
-            elif self.is_five_fingers_down(hand_landmarks):
-                self.mouse.scroll(0, -SYSTEM_CONFIG['scroll_step'])
+    def process_left_hand(self, hand, track, current_time):
+        """Process left hand gestures on its ``HandFeatures``."""
+        state = track.state
+        self.update_sequences(state, "Left", self.hand_conditions(state, hand, "Left"),
+                              current_time)
+        
+        if self.dispatch(track, 'scroll_up', current_time) in (STARTED, HELD):
+            self.actions.scroll(SYSTEM_CONFIG['scroll_step'])
+        if self.dispatch(track, 'scroll_down', current_time) in (STARTED, HELD):
+            self.actions.scroll(-SYSTEM_CONFIG['scroll_step'])
                 
-        if self.is_full_palm_open(hand_landmarks):
-            if current_time - self.last_palm_open_time > self.palm_open_cooldown:
-                pyautogui.hotkey('win', 'tab')
-                self.last_palm_open_time = current_time
+        if self.dispatch(track, 'task_view', current_time) == STARTED:
+            if current_time - state.last_palm_open_time > self.palm_open_cooldown:
+                self.actions.hotkey('win', 'tab')
+                state.last_palm_open_time = current_time
                 
-        if self.is_index_finger_up(hand_landmarks):
-            self.adjust_volume(1)
-        else:
-            self.adjust_volume(-1)
+        if self.dispatch(track, 'volume_up', current_time) in (STARTED, HELD):
+            self.actions.adjust_volume(1)
+        if self.dispatch(track, 'volume_down', current_time) in (STARTED, HELD):
+            self.actions.adjust_volume(-1)
             
-    def update_cursor_position(self, hand_landmarks):
-        """Update cursor position based on hand landmarks."""
-        screen_width, screen_height = pyautogui.size()
-        cursor_x = int(hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP].x * screen_width)
-        cursor_y = int(hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP].y * screen_height)
+    def predicted_tip(self, track):
+        """Return the predicted index fingertip of ``track`` at the current time, or None."""
+        if self.predictor is None or track.id not in self.predicted_ids:
+            return None
+        predicted = self.predictor.predict(time.perf_counter())
+        if predicted is None:
+            return None
+        tip = predicted[self.predicted_ids.index(track.id), INDEX_TIP]
+        return tip[0], tip[1]
         
-        self.smoothed_cursor_x = self.apply_smoothing(cursor_x, self.smoothed_cursor_x)
-        self.smoothed_cursor_y = self.apply_smoothing(cursor_y, self.smoothed_cursor_y)
+    def cursor_target(self, landmarks, track):
+        """Return the normalized index fingertip, extrapolated to now when prediction is on."""
+        predicted = self.predicted_tip(track)
+        if predicted is not None:
+            return predicted
+        return float(landmarks[INDEX_TIP, 0]), float(landmarks[INDEX_TIP, 1])
         
-        self.mouse.position = (int(self.smoothed_cursor_x), int(self.smoothed_cursor_y))
+    def update_predicted_cursor(self):
+        """Move the cursor on predicted landmarks for frames that skip inference."""
+        if self.cursor_track is None:
+            return
+        predicted = self.predicted_tip(self.cursor_track)
+        if predicted is not None:
+            self.update_cursor_position(self.cursor_track.state, *predicted)
+            
+    def update_cursor_position(self, state, x, y):
+        """Update cursor position from a normalized fingertip position."""
+        screen_width, screen_height = self.actions.screen_size()
+        cursor_x = int(x * screen_width)
+        cursor_y = int(y * screen_height)
+        
+        state.smoothed_cursor_x = self.apply_smoothing(cursor_x, state.smoothed_cursor_x)
+        state.smoothed_cursor_y = self.apply_smoothing(cursor_y, state.smoothed_cursor_y)
+        
+        self.actions.move_cursor(int(state.smoothed_cursor_x), int(state.smoothed_cursor_y))
         
     def apply_smoothing(self, new_value, smoothed_value):
         """Apply exponential smoothing to a value."""
@@ -321,125 +652,14 @@ class GestureDetector:
             return new_value
         return self.cursor_smoothing * new_value + (1 - self.cursor_smoothing) * smoothed_value
         
-    def adjust_brightness(self, direction):
-        """Adjust screen brightness."""
-        try:
-            current = sbc.get_brightness(display=0)[0]
-            new_value = min(max(current + direction * SYSTEM_CONFIG['brightness_step'], 0), 100)
-            sbc.set_brightness(new_value, display=0)
-        except Exception as e:
-            print(f"Could not adjust brightness: {e}")
-            
-    def adjust_volume(self, direction):
-        """Adjust system volume."""
-        try:
-            if self.volume:
-                current = self.volume.GetMasterVolumeLevelScalar()
-                new_value = min(max(current + direction * SYSTEM_CONFIG['volume_step'], 0.0), 1.0)
-                self.volume.SetMasterVolumeLevelScalar(new_value, None)
-        except Exception as e:
-            print(f"Could not adjust volume: {e}")
-            
-    def is_two_fingers_up(self, hand_landmarks):
-        """Check if index and middle fingers are up."""
-        index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP].y
-        index_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_PIP].y
-        middle_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP].y
-        middle_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_PIP].y
-        ring_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.RING_FINGER_TIP].y
-        pinky_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_TIP].y
-        return (index_tip < index_pip and middle_tip < middle_pip and 
-                ring_tip > middle_tip and pinky_tip > middle_tip)
-                
-    def is_pinch(self, hand_landmarks):
-        """Check if thumb and index finger are pinched."""
-        index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-        thumb_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_TIP]
-        distance = np.linalg.norm(np.array([index_tip.x, index_tip.y, index_tip.z]) - 
-                                np.array([thumb_tip.x, thumb_tip.y, thumb_tip.z]))
-        return distance < GESTURE_THRESHOLDS['pinch_distance']
-        
-    def is_middle_thumb_tap(self, hand_landmarks):
-        """Check if thumb and middle finger are tapped."""
-        middle_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP]
-        thumb_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_TIP]
-        distance = np.linalg.norm(np.array([middle_tip.x, middle_tip.y, middle_tip.z]) - 
-                                np.array([thumb_tip.x, thumb_tip.y, thumb_tip.z]))
-        return distance < GESTURE_THRESHOLDS['pinch_distance']
-        
-    def is_fingers_apart(self, hand_landmarks):
-        """Check if fingers are spread apart."""
-        index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-        middle_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP]
-        distance = np.linalg.norm(np.array([index_tip.x, index_tip.y, index_tip.z]) - 
-                                np.array([middle_tip.x, middle_tip.y, middle_tip.z]))
-        return distance > GESTURE_THRESHOLDS['fingers_apart_distance']
-        
-    def is_five_fingers_up(self, hand_landmarks):
-        """Check if all fingers are up."""
-        return all(hand_landmarks.landmark[finger].y < hand_landmarks.landmark[finger - 2].y 
-                  for finger in [self.mp_hands.HandLandmark.INDEX_FINGER_TIP,
-                               self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP,
-                               self.mp_hands.HandLandmark.RING_FINGER_TIP,
-                               self.mp_hands.HandLandmark.PINKY_TIP])
-                               
-    def is_five_fingers_down(self, hand_landmarks):
-        """Check if all fingers are down."""
-        return all(hand_landmarks.landmark[finger].y > hand_landmarks.landmark[finger - 2].y 
-                  for finger in [self.mp_hands.HandLandmark.INDEX_FINGER_TIP,
-                               self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP,
-                               self.mp_hands.HandLandmark.RING_FINGER_TIP,
-                               self.mp_hands.HandLandmark.PINKY_TIP])
-                               
-    def is_pinky_finger_up(self, hand_landmarks):
-        """Check if pinky finger is up."""
-        pinky_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_TIP].y
-        pinky_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_PIP].y
-        return pinky_tip < pinky_pip
-        
-    def is_pinky_finger_down(self, hand_landmarks):
-        """Check if pinky finger is down while others are closed."""
-        pinky_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_TIP].y
-        pinky_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_PIP].y
-        index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP].y
-        middle_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP].y
-        ring_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.RING_FINGER_TIP].y
-        thumb_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_TIP].y
-        
-        return (pinky_tip > pinky_pip and 
-                index_tip > hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_PIP].y and
-                middle_tip > hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_PIP].y and
-                ring_tip > hand_landmarks.landmark[self.mp_hands.HandLandmark.RING_FINGER_PIP].y and
-                thumb_tip > hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_IP].y)
-                
-    def is_index_middle_fingers_together(self, hand_landmarks):
-        """Check if index and middle fingers are close together."""
-        index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-        middle_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP]
-        distance = np.linalg.norm(np.array([index_tip.x, index_tip.y, index_tip.z]) - 
-                                np.array([middle_tip.x, middle_tip.y, middle_tip.z]))
-        return distance < GESTURE_THRESHOLDS['fingers_together_distance']
-        
-    def is_full_palm_open(self, hand_landmarks):
-        """Check if palm is fully open."""
-        return self.is_five_fingers_up(hand_landmarks)
-        
-    def is_index_finger_up(self, hand_landmarks):
-        """Check if index finger is up."""
-        index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP].y
-        index_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_PIP].y
-        return index_tip < index_pip
-        
-    def check_namaste_gesture(self, hand_landmarks1, hand_landmarks2):
+    def check_namaste_gesture(self, first, second):
         """Check if hands are in namaste position."""
-        wrist1 = hand_landmarks1.landmark[self.mp_hands.HandLandmark.WRIST]
-        wrist2 = hand_landmarks2.landmark[self.mp_hands.HandLandmark.WRIST]
-        distance = np.linalg.norm(np.array([wrist1.x, wrist1.y]) - 
-                                np.array([wrist2.x, wrist2.y]))
-        return distance < GESTURE_THRESHOLDS['namaste_distance']
+        return is_namaste(first, second)
         
     def toggle(self):
         """Toggle gesture detection on/off."""
+        if not self.is_ready():
+            return
         self.is_running = not self.is_running
         
     def show_help(self, parent):
@@ -460,6 +680,9 @@ Left Hand Controls:
 • Index finger up: Increase volume
 • Other fingers: Decrease volume
 
+Either Hand:
+• Swipe left/right with the whole hand: Previous/next virtual desktop
+
 Both Hands:
 • Namaste gesture (both hands together): Exit application
 
@@ -508,7 +731,17 @@ Tips for Better Control:
         try:
             if hasattr(self, 'cap') and self.cap is not None:
                 self.cap.release()
-            if hasattr(self, 'hands') and self.hands is not None:
-                self.hands.close()
+            if hasattr(self, 'feature_stats'):
+                print(f"Gesture features: {self.feature_stats.summary()}")
+            if hasattr(self, 'classification_cache'):
+                print(f"Gesture classification: {self.classification_cache.summary()}")
+            if hasattr(self, 'gesture_events'):
+                print(f"Gesture events: {self.gesture_events.summary()}")
+            if hasattr(self, 'watchdog') and self.watchdog is not None:
+                self.watchdog.close()
+            elif hasattr(self, 'warmup'):
+                self.warmup.finished.wait()
+                if self.warmup.hands is not None:
+                    self.warmup.hands.close()
         except Exception as e:
             print(f"Error during cleanup: {str(e)}") 
\ No newline at end of file
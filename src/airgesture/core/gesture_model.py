@@ -0,0 +1,221 @@
+"""Learned gesture classifiers: a kNN index or a small MLP, in plain numpy.
+
+Hands are normalized before they reach a model: the wrist is moved to the
+origin, coordinates are divided by the palm size (wrist to middle knuckle)
+and left hands are mirrored onto right ones, so one model covers both hands
+at any distance from the camera. Training (``tools/train_classifier``) needs
+only numpy, and so does inference.
+
+Models are saved as versioned ``.npz`` files, ``<name>.v<version>.npz``. A
+profile selects one with ``"model": "models/hands"`` (the newest version) or
+``"model": "models/hands.v3.npz"`` (a fixed one).
+"""
+import glob
+import os
+import re
+
+import numpy as np
+
+from src.airgesture.core.landmarks import MIDDLE_MCP, WRIST
+from src.airgesture.core.session import HANDEDNESS_CODES
+
+# Bump when the file layout or the normalization changes
+MODEL_FORMAT = 1
+NO_GESTURE = 'none'
+
+
+def normalize_hands(landmarks, handedness):
+    """Turn (N, 21, 3) landmarks into (N, 60) position- and size-free features."""
+    landmarks = np.asarray(landmarks, dtype=np.float32)
+    relative = landmarks[:, 1:] - landmarks[:, WRIST, np.newaxis]
+    palm = np.linalg.norm(relative[:, MIDDLE_MCP - 1], axis=1)
+    relative = relative / np.maximum(palm, 1e-6)[:, np.newaxis, np.newaxis]
+    left = np.asarray(handedness) == HANDEDNESS_CODES['Left']
+    relative[left, :, 0] *= -1
+    return relative.reshape(len(landmarks), -1)
+
+
+class KNNModel:
+    """Majority vote of the ``k`` nearest training hands."""
+
+    kind = 'knn'
+
+    def __init__(self, labels, points, targets, k=5):
+        self.labels = np.asarray(labels)
+        self.points = np.asarray(points, dtype=np.float32)
+        self.targets = np.asarray(targets, dtype=np.intp)
+        self.k = min(int(k), len(self.points))
+        self.norms = np.einsum('ij,ij->i', self.points, self.points)
+        self.columns = np.ascontiguousarray(self.points.T)
+        self.onehot = np.eye(len(self.labels), dtype=np.float32)
+
+    @classmethod
+    def train(cls, features, targets, labels, k=5, max_per_label=300, seed=0):
+        """Index at most ``max_per_label`` hands of each label."""
+        rng = np.random.default_rng(seed)
+        keep = []
+        for target in range(len(labels)):
+            rows = np.flatnonzero(targets == target)
+            if len(rows) > max_per_label:
+                rows = rng.choice(rows, max_per_label, replace=False)
+            keep.append(rows)
+        keep = np.sort(np.concatenate(keep))
+        return cls(labels, features[keep], targets[keep], k)
+
+    def scores(self, features):
+        """Share of the k nearest neighbours voting for each label, (N, labels)."""
+        distances = (np.einsum('ij,ij->i', features, features)[:, np.newaxis]
+                     - 2 * features @ self.columns + self.norms)
+        if self.k < len(self.points):
+            nearest = np.argpartition(distances, self.k - 1, axis=1)[:, :self.k]
+        else:
+            nearest = np.broadcast_to(np.arange(len(self.points)), distances.shape)
+        return self.onehot[self.targets[nearest]].sum(axis=1) / self.k
+
+    def arrays(self):
+        return {'points': self.points, 'targets': self.targets, 'k': np.array(self.k)}
+
+    @classmethod
+    def from_arrays(cls, labels, arrays):
+        return cls(labels, arrays['points'], arrays['targets'], int(arrays['k']))
+
+
+class MLPModel:
+    """One hidden ReLU layer and a softmax output over standardized features."""
+
+    kind = 'mlp'
+
+    def __init__(self, labels, mean, scale, w1, b1, w2, b2):
+        self.labels = np.asarray(labels)
+        self.mean, self.scale = mean, scale
+        self.w1, self.b1, self.w2, self.b2 = w1, b1, w2, b2
+
+    @classmethod
+    def train(cls, features, targets, labels, hidden=32, epochs=300, learning_rate=0.01,
+              weight_decay=1e-4, seed=0):
+        """Full-batch Adam on the cross-entropy loss."""
+        rng = np.random.default_rng(seed)
+        mean = features.mean(axis=0)
+        scale = features.std(axis=0) + 1e-6
+        x = (features - mean) / scale
+        onehot = np.eye(len(labels), dtype=np.float32)[targets]
+
+        params = [rng.normal(0, np.sqrt(2 / x.shape[1]), (x.shape[1], hidden)),
+                  np.zeros(hidden),
+                  rng.normal(0, np.sqrt(1 / hidden), (hidden, len(labels))),
+                  np.zeros(len(labels))]
+        params = [p.astype(np.float32) for p in params]
+        moments = [np.zeros_like(p) for p in params]
+        velocities = [np.zeros_like(p) for p in params]
+        for step in range(1, epochs + 1):
+            w1, b1, w2, b2 = params
+            hidden_in = x @ w1 + b1
+            activation = np.maximum(hidden_in, 0)
+            probabilities = softmax(activation @ w2 + b2)
+
+            error = (probabilities - onehot) / len(x)
+            grad_hidden = (error @ w2.T) * (hidden_in > 0)
+            grads = [x.T @ grad_hidden + weight_decay * w1, grad_hidden.sum(axis=0),
+                     activation.T @ error + weight_decay * w2, error.sum(axis=0)]
+            for i, grad in enumerate(grads):
+                moments[i] = 0.9 * moments[i] + 0.1 * grad
+                velocities[i] = 0.999 * velocities[i] + 0.001 * grad * grad
+                corrected = moments[i] / (1 - 0.9 ** step)
+                params[i] -= learning_rate * corrected / (np.sqrt(velocities[i] / (1 - 0.999 ** step)) + 1e-8)
+        return cls(labels, mean.astype(np.float32), scale.astype(np.float32), *params)
+
+    def scores(self, features):
+        """Softmax probability of each label, (N, labels)."""
+        activation = np.maximum(((features - self.mean) / self.scale) @ self.w1 + self.b1, 0)
+        return softmax(activation @ self.w2 + self.b2)
+
+    def arrays(self):
+        return {'mean': self.mean, 'scale': self.scale, 'w1': self.w1, 'b1': self.b1,
+                'w2': self.w2, 'b2': self.b2}
+
+    @classmethod
+    def from_arrays(cls, labels, arrays):
+        return cls(labels, *(arrays[name] for name in ('mean', 'scale', 'w1', 'b1', 'w2', 'b2')))
+
+
+MODEL_KINDS = {model.kind: model for model in (KNNModel, MLPModel)}
+
+
+def softmax(logits):
+    exponent = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return exponent / exponent.sum(axis=1, keepdims=True)
+
+
+class GestureModel:
+    """A trained model with the classifier interface of the rule-based ones."""
+
+    def __init__(self, model, path=None, metadata=None):
+        self.model = model
+        self.path = path
+        self.metadata = metadata or {}
+
+    @property
+    def labels(self):
+        return self.model.labels
+
+    def predict(self, landmarks, handedness):
+        """Best label and its score for (N, 21, 3) hands with session handedness codes."""
+        scores = self.model.scores(normalize_hands(landmarks, handedness))
+        best = scores.argmax(axis=1)
+        return self.labels[best], scores[np.arange(len(best)), best]
+
+    def classify_batch(self, landmarks, handedness):
+        labels, _ = self.predict(landmarks, handedness)
+        return [None if label == NO_GESTURE else label for label in labels.tolist()]
+
+    def classify(self, landmarks, hand=None):
+        """Return the gesture name for one (21, 3) hand, or None."""
+        return self.classify_batch(landmarks[np.newaxis], [HANDEDNESS_CODES.get(hand, -1)])[0]
+
+    def save(self, path):
+        metadata = {f'meta_{key}': np.array(value) for key, value in self.metadata.items()}
+        np.savez_compressed(path, format=np.array(MODEL_FORMAT), kind=np.array(self.model.kind),
+                            labels=self.labels, **self.model.arrays(), **metadata)
+        self.path = path
+
+
+def model_versions(base):
+    """Map version number to path for every ``<base>.v<N>.npz`` file."""
+    pattern = re.compile(re.escape(os.path.basename(base)) + r'\.v(\d+)\.npz$')
+    versions = {}
+    for path in glob.glob(glob.escape(base) + '.v*.npz'):
+        match = pattern.match(os.path.basename(path))
+        if match:
+            versions[int(match.group(1))] = path
+    return versions
+
+
+def next_model_path(base):
+    """Path of the next version of model ``base``."""
+    return f"{base}.v{max(model_versions(base), default=0) + 1}.npz"
+
+
+def resolve_model(reference):
+    """Turn a profile's ``model`` entry into a file path; bare names mean the newest version."""
+    if reference.endswith('.npz'):
+        return reference
+    versions = model_versions(reference)
+    if not versions:
+        raise FileNotFoundError(f"No versions of model {reference!r}")
+    return versions[max(versions)]
+
+
+def load_model(reference):
+    """Load a model file written by ``GestureModel.save``."""
+    path = resolve_model(reference)
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {key: data[key] for key in data.files}
+    if int(arrays['format']) != MODEL_FORMAT:
+        raise ValueError(f"{path}: model format {int(arrays['format'])}, expected {MODEL_FORMAT}; "
+                         "retrain it with tools/train_classifier")
+    kind = str(arrays['kind'])
+    if kind not in MODEL_KINDS:
+        raise ValueError(f"{path}: unknown model kind {kind!r}")
+    model = MODEL_KINDS[kind].from_arrays(arrays['labels'], arrays)
+    metadata = {key[5:]: arrays[key].tolist() for key in arrays if key.startswith('meta_')}
+    return GestureModel(model, path, metadata)
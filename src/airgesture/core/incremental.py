@@ -0,0 +1,60 @@
+"""Reuse of a hand's last classification while it holds still.
+
+A hand resting in the cursor pose produces nearly the same landmarks every
+frame, and re-running every predicate and score on them gives the same
+answer. ``ClassificationCache`` keeps each tracked hand's last fully
+evaluated ``HandFeatures`` (with its landmark array) and scores on the hand's
+state. While no landmark has moved more than ``epsilon`` palm lengths from
+that array, the features and scores are reused. Every ``max_age`` seconds
+the hand is evaluated afresh regardless, and the debounce gates, sequences
+and cooldowns still run every frame on the reused result, so time-based
+gestures keep working.
+"""
+import math
+
+import numpy as np
+
+from src.airgesture.core.features import MIN_PALM_SIZE
+
+
+class ClassificationCache:
+    """Decides per hand and frame whether the last classification still holds."""
+
+    def __init__(self, epsilon=0.01, max_age=0.25, enabled=True):
+        self.epsilon = epsilon
+        self.max_age = max_age
+        self.enabled = enabled
+        self.evaluated = 0
+        self.reused = 0
+
+    def lookup(self, state, landmarks, label, timestamp):
+        """Return the reusable ``HandFeatures`` of a hand's state, or None.
+
+        ``landmarks`` is the hand's (21, 3) array in this frame and ``label``
+        its handedness; scores of the other hand's gestures are not reused.
+        """
+        features = state.features
+        if (not self.enabled or features is None or label != state.features_label or
+                timestamp - state.features_time > self.max_age):
+            self.evaluated += 1
+            return None
+        limit = self.epsilon * math.sqrt(max(features.palm_size, MIN_PALM_SIZE))
+        if float(np.abs(landmarks - features.landmarks).max()) > limit:
+            self.evaluated += 1
+            return None
+        self.reused += 1
+        return features
+
+    def store(self, state, features, label, timestamp):
+        """Remember a freshly evaluated hand."""
+        state.features = features
+        state.features_label = label
+        state.features_time = timestamp
+
+    def ratio(self):
+        total = self.evaluated + self.reused
+        return self.reused / total if total else 0.0
+
+    def summary(self):
+        return (f"{self.evaluated} evaluated, {self.reused} reused "
+                f"({self.ratio() * 100:.0f}% of hands)")
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from src.airgesture.core.landmarks import build_results, results_to_record
+
+logger = logging.getLogger(__name__)
+
+
+def config_fingerprint(backend_name, config):
+    """Hash a backend name and its settings into a short cache namespace."""
+    payload = json.dumps({'backend': backend_name, 'config': config}, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+class CachedBackend:
+    """Content-addressed on-disk cache in front of any landmark backend.
+
+    Frames are keyed by a BLAKE2 hash of their pixels together with the
+    backend/config fingerprint, and the landmark output is stored as a small
+    ``.npz`` entry. Replaying the same footage skips inference entirely.
+    The cache is bounded by ``max_bytes`` and evicts least recently used
+    entries; recency survives restarts through file modification times.
+    The directory is the source of truth, so worker processes can share it:
+    a lookup always tries the entry's file, and each process rescans the
+    directory after writing ``max_bytes / 16`` so the bound holds for
+    everyone's entries (N processes overshoot it by at most N/16).
+
+    Tracking-mode backends use previous frames as context. With
+    ``sequential`` a frame's key also covers every frame since the last
+    ``reset``, so a hit means the same footage in the same order. Such
+    backends are read through ``lookup``; ``process`` always runs them, so
+    their tracking state follows every frame.
+    """
+
+    def __init__(self, backend, cache_dir, fingerprint, max_bytes=512 * 1024 * 1024,
+                 sequential=False):
+        self.backend = backend
+        self.fingerprint = fingerprint
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.sequential = sequential
+        self.chain = b''
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'bytes': 0}
+
+        # Bytes this process writes between directory scans
+        self.scan_bytes = max(max_bytes // 16, 1)
+        self.unscanned = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.entries = OrderedDict()
+        self.scan()
+
+    def scan(self):
+        """Rebuild the LRU index and size from the files on disk, oldest first."""
+        found = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.npz') or name.endswith('.tmp.npz'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue  # evicted by another process meanwhile
+            found.append((stat.st_mtime, name[:-4], stat.st_size))
+        self.entries = OrderedDict((key, size) for _, key, size in sorted(found))
+        self.stats['bytes'] = sum(self.entries.values())
+        self.unscanned = 0
+
+    def key(self, frame):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.fingerprint.encode('ascii'))
+        digest.update(repr(frame.shape).encode('ascii'))
+        digest.update(np.ascontiguousarray(frame).data)
+        digest.update(self.chain)
+        key = digest.hexdigest()
+        if self.sequential:
+            self.chain = key.encode('ascii')
+        return key
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, key + '.npz')
+
+    def reset(self):
+        """Start a new sequence: clear the key chain and the backend's tracking state."""
+        self.chain = b''
+        if hasattr(self.backend, 'reset'):
+            self.backend.reset()
+
+    def lookup(self, frame):
+        """Cached results for ``frame``, or None without running the backend."""
+        return self.fetch(self.key(frame))
+
+    def fetch(self, key):
+        # Tried even when not indexed: another process may have written it
+        results = self.load(key)
+        if results is not None:
+            self.stats['hits'] += 1
+        return results
+
+    def process(self, frame):
+        """Return results for ``frame``, running the backend on a miss (always
+        for sequential backends)."""
+        key = self.key(frame)
+        if not self.sequential:
+            results = self.fetch(key)
+            if results is not None:
+                return results
+
+        self.stats['misses'] += 1
+        results = self.backend.process(frame)
+        self.store(key, results)
+        return results
+
+    def load(self, key):
+        path = self.path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                results = build_results(data['landmarks'], data['labels'], data['scores'],
+                                        data['world'])
+            os.utime(path)
+            size = os.path.getsize(path)
+        except (OSError, ValueError, KeyError):
+            # Not cached, evicted by another process or damaged; fall back to inference
+            self.forget(key)
+            return None
+        if key not in self.entries:
+            self.entries[key] = size
+            self.stats['bytes'] += size
+        self.entries.move_to_end(key)
+        return results
+
+    def store(self, key, results):
+        path = self.path(key)
+        # Per process, so two workers storing the same frame never share a file
+        tmp_path = f"{path[:-4]}.{os.getpid()}.tmp.npz"
+        try:
+            np.savez(tmp_path, **results_to_record(results))
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+        except OSError as e:
+            logger.warning(f"Could not write inference cache entry: {str(e)}")
+            return
+        self.forget(key)
+        self.entries[key] = size
+        self.stats['bytes'] += size
+        self.unscanned += size
+        if self.unscanned >= self.scan_bytes:
+            self.scan()
+        self.evict()
+
+    def forget(self, key):
+        size = self.entries.pop(key, None)
+        if size is not None:
+            self.stats['bytes'] -= size
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits ``max_bytes``."""
+        while self.stats['bytes'] > self.max_bytes and self.entries:
+            key, size = self.entries.popitem(last=False)
+            self.stats['bytes'] -= size
+            try:
+                os.remove(self.path(key))
+                self.stats['evictions'] += 1
+            except OSError:
+                pass  # already evicted by another process
+
+    def hit_rate(self):
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / lookups if lookups else 0.0
+
+    def close(self):
+        logger.info("Inference cache: %d hits, %d misses (%.0f%% hit rate), %d evictions, %.1f MB",
+                    self.stats['hits'], self.stats['misses'], self.hit_rate() * 100,
+                    self.stats['evictions'], self.stats['bytes'] / 1e6)
+        if hasattr(self.backend, 'close'):
+            self.backend.close()
@@ -0,0 +1,126 @@
+from collections import namedtuple
+from types import SimpleNamespace
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+# MediaPipe hand landmark indices
+WRIST = 0
+THUMB_CMC, THUMB_MCP, THUMB_IP, THUMB_TIP = 1, 2, 3, 4
+INDEX_MCP, INDEX_PIP, INDEX_DIP, INDEX_TIP = 5, 6, 7, 8
+MIDDLE_MCP, MIDDLE_PIP, MIDDLE_DIP, MIDDLE_TIP = 9, 10, 11, 12
+RING_MCP, RING_PIP, RING_DIP, RING_TIP = 13, 14, 15, 16
+PINKY_MCP, PINKY_PIP, PINKY_DIP, PINKY_TIP = 17, 18, 19, 20
+X, Y, Z = 0, 1, 2
+
+FINGER_TIPS = (INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP)
+FINGER_PIPS = (INDEX_PIP, MIDDLE_PIP, RING_PIP, PINKY_PIP)
+# The wrist and the four finger MCP joints
+PALM_LANDMARKS = (WRIST, INDEX_MCP, MIDDLE_MCP, RING_MCP, PINKY_MCP)
+
+# Same fields as the result of ``mediapipe.solutions.hands.Hands.process``
+HandResults = namedtuple('HandResults',
+                         ['multi_hand_landmarks', 'multi_hand_world_landmarks', 'multi_handedness'])
+
+
+def landmarks_to_array(hand_landmarks):
+    """Convert a MediaPipe landmark list into a (21, 3) float32 array."""
+    return np.array([(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark],
+                    dtype=np.float32)
+
+
+def results_to_array(results):
+    """Stack every detected hand of a ``Hands.process`` result into (hands, 21, 3).
+
+    All hands are read into one contiguous float32 buffer in a single pass.
+    """
+    hands = results.multi_hand_landmarks
+    if not hands:
+        return np.empty((0, NUM_LANDMARKS, 3), dtype=np.float32)
+    values = np.fromiter((value for hand in hands for lm in hand.landmark
+                          for value in (lm.x, lm.y, lm.z)),
+                         dtype=np.float32, count=len(hands) * NUM_LANDMARKS * 3)
+    return values.reshape(len(hands), NUM_LANDMARKS, 3)
+
+
+def results_to_world_array(results):
+    """Stack the world landmarks (metres, hand-centred) of every hand into (hands, 21, 3).
+
+    Returns None when the result has no world landmarks for every hand.
+    """
+    hands = results.multi_hand_landmarks or []
+    world_hands = getattr(results, 'multi_hand_world_landmarks', None) or []
+    if not hands or len(world_hands) < len(hands):
+        return None
+    values = np.fromiter((value for hand in world_hands[:len(hands)] for lm in hand.landmark
+                          for value in (lm.x, lm.y, lm.z)),
+                         dtype=np.float32, count=len(hands) * NUM_LANDMARKS * 3)
+    return values.reshape(len(hands), NUM_LANDMARKS, 3)
+
+
+def write_landmarks(hand_landmarks, landmarks):
+    """Copy a (21, 3) array back into a MediaPipe landmark list in place."""
+    for lm, (x, y, z) in zip(hand_landmarks.landmark, landmarks.tolist()):
+        lm.x = x
+        lm.y = y
+        lm.z = z
+
+
+def results_to_record(results):
+    """Flatten a ``Hands.process`` result into plain arrays for storage."""
+    landmarks = results_to_array(results)
+    world = np.full_like(landmarks, np.nan)
+    world_hands = getattr(results, 'multi_hand_world_landmarks', None) or []
+    for index, hand in enumerate(world_hands[:len(landmarks)]):
+        world[index] = landmarks_to_array(hand)
+    handedness = results.multi_handedness or []
+    return {
+        'landmarks': landmarks,
+        'world': world,
+        'labels': np.array([h.classification[0].label for h in handedness], dtype='<U5'),
+        'scores': np.array([h.classification[0].score for h in handedness], dtype=np.float32),
+    }
+
+
+def build_results(landmarks, labels, scores=None, world=None):
+    """Build a ``Hands.process``-style result from arrays.
+
+    Uses MediaPipe's protobuf types when MediaPipe is installed, so the result
+    works with ``drawing_utils``; otherwise plain objects with the same
+    attributes are returned.
+    """
+    if len(landmarks) == 0:
+        return HandResults(None, None, None)
+    if scores is None:
+        scores = np.ones(len(landmarks), dtype=np.float32)
+
+    try:
+        from mediapipe.framework.formats import classification_pb2, landmark_pb2
+    except ImportError:
+        landmark_pb2 = classification_pb2 = None
+
+    def landmark_list(array, normalized):
+        if landmark_pb2 is None:
+            return SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, z=z)
+                                             for x, y, z in array.tolist()])
+        hand = landmark_pb2.NormalizedLandmarkList() if normalized else landmark_pb2.LandmarkList()
+        for x, y, z in array.tolist():
+            hand.landmark.add(x=x, y=y, z=z)
+        return hand
+
+    def classification(label, score):
+        index = 1 if label == "Right" else 0
+        if classification_pb2 is None:
+            return SimpleNamespace(classification=[SimpleNamespace(index=index, label=label,
+                                                                   score=score)])
+        result = classification_pb2.ClassificationList()
+        result.classification.add(index=index, label=label, score=score)
+        return result
+
+    hands = [landmark_list(hand, True) for hand in landmarks]
+    handedness = [classification(str(label), float(score)) for label, score in zip(labels, scores)]
+    world_hands = None
+    if world is not None and not np.isnan(world).all():
+        world_hands = [landmark_list(hand, False) for hand in world]
+    return HandResults(hands, world_hands, handedness)
@@ -0,0 +1,232 @@
+"""Dynamic gestures (swipes, circles, flicks) from a short landmark history.
+
+Every tracked hand keeps a ``LandmarkHistory``, a fixed-size ring buffer of
+its recent (21, 3) landmark arrays and timestamps. Velocities and
+displacements are computed for all 21 landmarks at once. ``MotionRecognizer``
+consumes one frame at a time: it keeps running sums of the palm's path
+length and turning over a sliding time window, adding the newest step and
+dropping the ones that fall out of the window, so every frame costs the same
+however long the window is.
+"""
+import math
+
+import numpy as np
+
+from src.airgesture.core.landmarks import INDEX_TIP, NUM_LANDMARKS, PALM_LANDMARKS
+
+PALM = np.array(PALM_LANDMARKS)
+
+# A circle turns a little every frame; sharper turns (reversals, tracking
+# jumps) are corners and do not count towards one
+MAX_STEP_TURN = math.radians(90)
+
+
+class LandmarkHistory:
+    """Ring buffer of one hand's most recent landmark arrays and timestamps."""
+
+    def __init__(self, capacity=32):
+        self.capacity = capacity
+        self.landmarks = np.zeros((capacity, NUM_LANDMARKS, 3), dtype=np.float32)
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.count = 0
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def push(self, landmarks, timestamp):
+        """Store a frame; returns its slot."""
+        slot = self.count % self.capacity
+        self.landmarks[slot] = landmarks
+        self.timestamps[slot] = timestamp
+        self.count += 1
+        return slot
+
+    def slot(self, back=0):
+        """Slot of the frame ``back`` frames before the newest one."""
+        return (self.count - 1 - back) % self.capacity
+
+    def velocity(self):
+        """Per-landmark velocity over the last frame, (21, 3) units per second."""
+        if len(self) < 2:
+            return np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+        newest, previous = self.slot(0), self.slot(1)
+        dt = self.timestamps[newest] - self.timestamps[previous]
+        if dt <= 0:
+            return np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+        return (self.landmarks[newest] - self.landmarks[previous]) / dt
+
+    def displacement(self, since_slot):
+        """Per-landmark displacement from slot ``since_slot`` to the newest frame, (21, 3)."""
+        return self.landmarks[self.slot(0)] - self.landmarks[since_slot]
+
+    def ordered(self):
+        """The buffered frames oldest first, as (landmarks, timestamps) copies."""
+        slots = [(self.count - len(self) + i) % self.capacity for i in range(len(self))]
+        return self.landmarks[slots], self.timestamps[slots]
+
+    def clear(self):
+        self.count = 0
+
+
+class MotionRecognizer:
+    """Incremental swipe, circle and flick detection for one hand.
+
+    Positions are normalized image coordinates, so "up" is a decreasing y.
+    ``update`` returns the name of a gesture completed by this frame
+    (``swipe_left``, ``circle_clockwise``, ``flick_up``, ...) or None. After a
+    detection nothing fires for ``cooldown`` seconds and then until the palm
+    holds still for a frame; the window stays empty meanwhile, so the rest of
+    a long movement cannot complete a second gesture and one movement
+    produces one event.
+    """
+
+    def __init__(self, history=80, window=1.2, swipe_distance=0.25, swipe_straightness=0.8,
+                 circle_turn=300.0, circle_path=0.3, min_step=0.003, flick_speed=2.5,
+                 flick_palm_speed=0.6, cooldown=0.6):
+        self.history = LandmarkHistory(history)
+        self.window = window
+        self.swipe_distance = swipe_distance
+        self.swipe_straightness = swipe_straightness
+        self.circle_turn = math.radians(circle_turn)
+        self.circle_path = circle_path
+        self.min_step = min_step
+        self.flick_speed = flick_speed
+        self.flick_palm_speed = flick_palm_speed
+        self.cooldown = cooldown
+        # Per-slot palm step length and turning angle, and their window sums
+        self.step_length = np.zeros(history)
+        self.turn = np.zeros(history)
+        self.reset()
+
+    def reset(self):
+        self.history.clear()
+        self.step_length[:] = 0.0
+        self.turn[:] = 0.0
+        self.tail = 0              # count index of the oldest frame in the window
+        self.path_length = 0.0
+        self.turn_sum = 0.0
+        self.last_step = None
+        self.quiet_until = -math.inf
+        self.quiet = False
+
+    def update(self, landmarks, timestamp):
+        """Add one frame of a (21, 3) hand and return a completed gesture, or None."""
+        history = self.history
+        slot = history.push(landmarks, timestamp)
+        # Frames overwritten by the ring buffer leave the window as well
+        self.expire(timestamp - self.window, history.count - history.capacity)
+
+        velocity = history.velocity()
+        palm_velocity = velocity[PALM].mean(axis=0)
+        dt = timestamp - history.timestamps[history.slot(1)] if len(history) > 1 else 0.0
+        self.add_step(slot, palm_velocity[:2] * dt)
+
+        if self.quiet:
+            # Movement after a detection belongs to the gesture just detected
+            self.empty_window()
+            self.quiet = timestamp < self.quiet_until or self.step_length[slot] > 0.0
+            return None
+        if history.count - self.tail < 2:
+            return None
+        gesture = (self.flick(velocity, palm_velocity) or self.swipe() or self.circle())
+        if gesture is not None:
+            self.restart(timestamp)
+        return gesture
+
+    def expire(self, oldest_time, oldest_count):
+        """Drop frames older than ``oldest_time`` or overwritten in the buffer."""
+        history = self.history
+        while self.tail < history.count - 1:
+            slot = self.tail % history.capacity
+            if self.tail >= oldest_count and history.timestamps[slot] >= oldest_time:
+                break
+            self.tail += 1
+            # The step into the new oldest frame no longer belongs to the window
+            dropped = self.tail % history.capacity
+            self.path_length -= self.step_length[dropped]
+            self.turn_sum -= self.turn[dropped]
+            self.step_length[dropped] = self.turn[dropped] = 0.0
+
+    def add_step(self, slot, step):
+        length = math.hypot(step[0], step[1])
+        turn = 0.0
+        if length >= self.min_step:
+            if self.last_step is not None:
+                previous = self.last_step
+                turn = math.atan2(previous[0] * step[1] - previous[1] * step[0],
+                                  previous[0] * step[0] + previous[1] * step[1])
+                if abs(turn) > MAX_STEP_TURN:
+                    turn = 0.0
+            self.last_step = (float(step[0]), float(step[1]))
+        else:
+            length = 0.0
+        self.step_length[slot] = length
+        self.turn[slot] = turn
+        self.path_length += length
+        self.turn_sum += turn
+
+    def swipe(self):
+        displacement = self.history.displacement(self.tail % self.history.capacity)
+        dx, dy = displacement[PALM, :2].mean(axis=0)
+        distance = math.hypot(dx, dy)
+        if distance < self.swipe_distance or distance < self.swipe_straightness * self.path_length:
+            return None
+        if abs(dx) >= abs(dy):
+            return 'swipe_right' if dx > 0 else 'swipe_left'
+        return 'swipe_down' if dy > 0 else 'swipe_up'
+
+    def circle(self):
+        if abs(self.turn_sum) < self.circle_turn or self.path_length < self.circle_path:
+            return None
+        # With y pointing down, a positive turn is clockwise on screen
+        return 'circle_clockwise' if self.turn_sum > 0 else 'circle_counterclockwise'
+
+    def flick(self, velocity, palm_velocity):
+        """A fast fingertip movement relative to a steady palm."""
+        if math.hypot(palm_velocity[0], palm_velocity[1]) > self.flick_palm_speed:
+            return None
+        vx, vy = velocity[INDEX_TIP, :2] - palm_velocity[:2]
+        if math.hypot(vx, vy) < self.flick_speed:
+            return None
+        if abs(vx) >= abs(vy):
+            return 'flick_right' if vx > 0 else 'flick_left'
+        return 'flick_down' if vy > 0 else 'flick_up'
+
+    def restart(self, timestamp):
+        """Empty the window after a detection and start the cooldown."""
+        self.empty_window()
+        self.quiet_until = timestamp + self.cooldown
+        self.quiet = True
+
+    def empty_window(self):
+        """Start the window at the newest frame."""
+        capacity = self.history.capacity
+        for count in range(self.tail + 1, self.history.count):
+            self.step_length[count % capacity] = self.turn[count % capacity] = 0.0
+        self.tail = self.history.count - 1
+        self.path_length = self.turn_sum = 0.0
+        self.last_step = None
+
+
+class MotionRecognizerBank:
+    """Separate motion history and recognizer for every tracked hand."""
+
+    def __init__(self, **params):
+        self.params = params
+        self.recognizers = {}
+
+    def update(self, key, landmarks, timestamp):
+        """Feed hand ``key`` one frame; returns a completed dynamic gesture or None."""
+        recognizer = self.recognizers.get(key)
+        if recognizer is None:
+            recognizer = self.recognizers[key] = MotionRecognizer(**self.params)
+        return recognizer.update(landmarks, timestamp)
+
+    def prune(self, active_keys):
+        """Drop state for hands that are no longer tracked."""
+        for key in list(self.recognizers):
+            if key not in active_keys:
+                del self.recognizers[key]
+
+    def reset(self):
+        self.recognizers.clear()
@@ -0,0 +1,108 @@
+"""What the live pipeline computes for the active gesture profile.
+
+The profile is one of ``gesture_profiles.json``, the same file the profile
+checks and the tuner use; the actions it binds are the actions enabled. The
+live pipeline recognizes each action with its own gesture on a fixed hand
+(``ACTION_HANDS``, the priority chains of ``core.scores``), so a binding
+switches its action on, while the pose and hand it names are what the
+rule-based detector classifies. The plan derives from the enabled actions how
+many hands MediaPipe has to track, which hands get their features and
+predicates evaluated, which of them are scored and which per-frame
+conditions the enabled multi-step sequences and the cursor read. Everything
+else is left out of the per-frame work: a cursor-only profile tracks one
+hand and evaluates two switches and one predicate on it. Motion gestures are
+recognized on every tracked hand, and namaste whenever both hands are.
+"""
+from src.airgesture.core.profiles import ProfileError
+
+HANDS = ('Left', 'Right')
+
+# Hands each single-frame action needs; multi-step sequences take theirs
+# from GESTURE_SEQUENCES and motion gestures work on either hand
+ACTION_HANDS = {
+    'move_cursor': ('Right',),
+    'brightness_up': ('Right',),
+    'brightness_down': ('Right',),
+    'scroll_up': ('Left',),
+    'scroll_down': ('Left',),
+    'task_view': ('Left',),
+    'volume_up': ('Left',),
+    'volume_down': ('Left',),
+    'namaste': HANDS,
+}
+# Actions dispatched on their hand's top-scoring gesture (core.scores)
+SCORED_ACTIONS = ('brightness_up', 'brightness_down', 'scroll_up', 'scroll_down',
+                  'task_view', 'volume_up', 'volume_down')
+# Conditions the cursor reads besides those of the sequences
+CURSOR_CONDITIONS = ('spread', 'two_fingers_up')
+# Profile action names the live pipeline knows by another name
+PROFILE_ACTIONS = {'mouse_move': 'move_cursor'}
+
+
+class PipelinePlan:
+    """The hands, conditions, sequences and motion gestures one profile needs.
+
+    ``actions`` are the profile's enabled actions; ``sequences`` is
+    ``GESTURE_SEQUENCES``, reduced to the enabled ones, and ``motion_actions``
+    ``MOTION_CONFIG['actions']``. ``max_hands`` caps the hands to track.
+    Actions the live pipeline has no gesture for are kept in ``ignored``.
+    ``settings`` is the whole profile, for settings such as ``cursor_smoothing``.
+    """
+
+    def __init__(self, name, actions, sequences, motion_actions, max_hands=2, settings=None):
+        self.name = name
+        self.settings = settings or {}
+        actions = {PROFILE_ACTIONS.get(action, action) for action in actions}
+        known = set(ACTION_HANDS) | {sequence['name'] for sequence in sequences}
+        self.ignored = sorted(actions - known)
+        self.actions = actions & known
+
+        self.sequences = [sequence for sequence in sequences if sequence['name'] in self.actions]
+        self.motion_actions = dict(motion_actions)
+
+        hands = set()
+        for action in self.actions & set(ACTION_HANDS):
+            hands.update(ACTION_HANDS[action])
+        for sequence in self.sequences:
+            hand = sequence.get('hand', 'any')
+            hands.update(HANDS if hand == 'any' else (hand,))
+        # Hands whose features and predicates are evaluated
+        self.hands = tuple(hand for hand in HANDS if hand in hands)
+        self.scored = tuple(hand for hand in self.hands
+                            if any(action in self.actions and hand in ACTION_HANDS[action]
+                                   for action in SCORED_ACTIONS))
+        # Motion gestures alone need one hand of either side
+        self.max_hands = max(1, min(max_hands, len(self.hands)))
+        if self.hands == HANDS:
+            self.actions.add('namaste')
+
+        self.conditions = {}
+        for hand in self.hands:
+            names = []
+            if hand == 'Right' and 'move_cursor' in self.actions:
+                names.extend(CURSOR_CONDITIONS)
+            for sequence in self.sequences:
+                if sequence.get('hand', 'any') not in ('any', hand):
+                    continue
+                for step in sequence['steps']:
+                    for key in ('when', 'unless'):
+                        value = step.get(key) or []
+                        names.extend([value] if isinstance(value, str) else value)
+            self.conditions[hand] = tuple(dict.fromkeys(names))
+
+    def describe(self):
+        hands = ' and '.join(self.hands) or 'no'
+        ignored = f", no live gesture for {', '.join(self.ignored)}" if self.ignored else ''
+        return (f"profile {self.name}: tracking {self.max_hands} hand(s), evaluating {hands} "
+                f"hand gestures, {len(self.sequences)} sequence(s), "
+                f"{len(self.motion_actions)} motion gesture(s){ignored}")
+
+
+def plan_profile(profiles, name, sequences, motion_actions, max_hands=2):
+    """The ``PipelinePlan`` of profile ``name`` of ``profiles``, the profiles of
+    ``gesture_profiles.json`` by name (``core.profiles.load_profiles``)."""
+    if name not in profiles:
+        raise ProfileError(f"Unknown profile {name!r}; known: {', '.join(profiles)}")
+    profile = profiles[name]
+    return PipelinePlan(name, profile.get('actions', {}), sequences, motion_actions, max_hands,
+                        profile)
@@ -0,0 +1,128 @@
+"""Gesture predicates on per-hand ``HandFeatures``.
+
+Each hand is converted to a (21, 3) float32 array once per frame (see
+``landmarks.results_to_array``) and wrapped in a ``features.HandFeatures``.
+The predicates below read its lazily computed features, so overlapping
+checks (finger extension, fingertip distances) are computed once per hand
+and frame. Distances are compared squared against squared thresholds, taken
+from the threshold table of the hand's distance units.
+"""
+from src.airgesture.core.features import palm_scale
+from src.airgesture.core.landmarks import MIDDLE_TIP, PINKY_TIP, RING_TIP, WRIST
+from src.airgesture.utils.config import THRESHOLD_TABLES
+
+# Squared thresholds per distance unit: SQUARED_THRESHOLDS[units][name]
+SQUARED_THRESHOLDS = {units: {name: value ** 2 for name, value in table.items()}
+                      for units, table in THRESHOLD_TABLES.items()}
+
+
+def is_two_fingers_up(hand):
+    """Check if index and middle fingers are up."""
+    index_up, middle_up, _, _ = hand.fingers_up
+    y = hand.y
+    middle_tip = y[MIDDLE_TIP]
+    return index_up and middle_up and y[RING_TIP] > middle_tip and y[PINKY_TIP] > middle_tip
+
+
+def is_pinch(hand):
+    """Check if thumb and index finger are pinched."""
+    return hand.index_thumb_distance < SQUARED_THRESHOLDS[hand.units]['pinch_distance']
+
+
+def is_middle_thumb_tap(hand):
+    """Check if thumb and middle finger are tapped."""
+    return hand.middle_thumb_distance < SQUARED_THRESHOLDS[hand.units]['pinch_distance']
+
+
+def is_fingers_apart(hand):
+    """Check if index and middle fingers are spread apart."""
+    return hand.index_middle_distance > SQUARED_THRESHOLDS[hand.units]['fingers_apart_distance']
+
+
+def is_index_middle_fingers_together(hand):
+    """Check if index and middle fingers are close together."""
+    return hand.index_middle_distance < SQUARED_THRESHOLDS[hand.units]['fingers_together_distance']
+
+
+def is_five_fingers_up(hand):
+    """Check if all fingers are up (each tip above its PIP joint)."""
+    return hand.all_fingers_up
+
+
+def is_five_fingers_down(hand):
+    """Check if all fingers are down (each tip below its PIP joint)."""
+    return hand.all_fingers_down
+
+
+def is_full_palm_open(hand):
+    """Check if palm is fully open."""
+    return hand.all_fingers_up
+
+
+def is_pinky_finger_up(hand):
+    """Check if pinky finger is up."""
+    return hand.fingers_up[3]
+
+
+def is_pinky_finger_down(hand):
+    """Check if pinky finger is down while others are closed."""
+    return hand.all_fingers_down and hand.thumb_down
+
+
+def is_index_finger_up(hand):
+    """Check if index finger is up."""
+    return hand.fingers_up[0]
+
+
+def is_namaste(first, second):
+    """Check if two hands are in namaste position (wrists close together).
+
+    World landmarks are centred on each hand, so the wrists are always
+    compared in image space, scaled by the two hands' mean palm size.
+    """
+    first_x, first_y, _ = first.points[WRIST]
+    second_x, second_y, _ = second.points[WRIST]
+    distance = (first_x - second_x) ** 2 + (first_y - second_y) ** 2
+    if first.units != 'image':
+        distance *= palm_scale(first.units, (first.palm_size + second.palm_size) / 2)
+    return distance < SQUARED_THRESHOLDS[first.units]['namaste_distance']
+
+
+# Per-hand gesture labels in priority order, mirroring how the detector
+# dispatches each hand. A left hand that shows nothing else lowers the volume.
+RIGHT_HAND_GESTURES = ('left_click', 'right_click', 'click_ready', 'move_cursor',
+                       'brightness_up', 'brightness_down')
+LEFT_HAND_GESTURES = ('scroll_up', 'scroll_down', 'task_view', 'volume_up', 'volume_down')
+NO_GESTURE = 'none'
+
+
+def hand_gesture(hand, label):
+    """Return the gesture label of one hand's ``HandFeatures`` in this frame alone.
+
+    Cooldowns, hysteresis and debouncing (``core.debounce``) are not applied.
+    """
+    if label == "Right":
+        if is_fingers_apart(hand):
+            if is_pinch(hand):
+                return 'left_click'
+            if is_middle_thumb_tap(hand):
+                return 'right_click'
+            return 'click_ready'
+        if is_two_fingers_up(hand):
+            return 'move_cursor'
+        if is_pinky_finger_up(hand):
+            return 'brightness_up'
+        if is_pinky_finger_down(hand):
+            return 'brightness_down'
+        return NO_GESTURE
+
+    if is_index_middle_fingers_together(hand):
+        if is_two_fingers_up(hand):
+            return 'scroll_up'
+        if is_five_fingers_down(hand):
+            return 'scroll_down'
+    if is_full_palm_open(hand):
+        return 'task_view'
+    if is_index_finger_up(hand):
+        return 'volume_up'
+    return 'volume_down'
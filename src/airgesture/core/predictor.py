@@ -0,0 +1,65 @@
+import numpy as np
+
+
+class LandmarkPredictor:
+    """Constant-velocity landmark predictor for skipped and late frames.
+
+    Keeps an alpha-beta filter (the steady-state form of a constant-velocity
+    Kalman filter) for every coordinate of a (hands, 21, 3) landmark array.
+    ``update`` corrects the state with fresh landmarks, ``predict``
+    extrapolates it to any later time so the cursor can keep moving between
+    inferences and make up for inference latency.
+    """
+
+    def __init__(self, alpha=0.8, beta=0.5, max_horizon=0.1):
+        self.alpha = alpha
+        self.beta = beta
+        self.max_horizon = max_horizon  # seconds we are willing to extrapolate
+        self.reset()
+
+    def reset(self):
+        """Forget all state."""
+        self.position = None
+        self.velocity = None
+        self.timestamp = None
+        self._predicted = None
+
+    def update(self, landmarks, timestamp):
+        """Correct the state with landmarks observed at ``timestamp``."""
+        landmarks = np.asarray(landmarks, dtype=np.float32)
+        if self.position is None or self.position.shape != landmarks.shape:
+            # Hand count changed: start over from this observation
+            self.position = landmarks.copy()
+            self.velocity = np.zeros_like(landmarks)
+            self._predicted = np.empty_like(landmarks)
+            self.timestamp = timestamp
+            return self.position
+
+        dt = timestamp - self.timestamp
+        if dt <= 0:
+            self.position[...] = landmarks
+            return self.position
+
+        # predicted = position + velocity * dt, residual = landmarks - predicted
+        residual = self._predicted
+        np.multiply(self.velocity, dt, out=residual)
+        residual += self.position
+        self.position[...] = residual
+        np.subtract(landmarks, residual, out=residual)
+
+        self.position += self.alpha * residual
+        self.velocity += (self.beta / dt) * residual
+        self.timestamp = timestamp
+        return self.position
+
+    def predict(self, timestamp):
+        """Extrapolate the landmarks to ``timestamp``, or None before the first update.
+
+        The returned array is reused by the next ``predict`` or ``update`` call.
+        """
+        if self.position is None:
+            return None
+        horizon = min(max(timestamp - self.timestamp, 0.0), self.max_horizon)
+        np.multiply(self.velocity, horizon, out=self._predicted)
+        self._predicted += self.position
+        return self._predicted
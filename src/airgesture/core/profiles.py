@@ -0,0 +1,386 @@
+"""Load-time checks of a gesture profile, compiled into decision trees.
+
+A profile's ``actions`` bind each action to a gesture of one hand, written
+``"<gesture> - <Left|Right> hand"``. ``compile_profile`` checks the bindings
+against the profile's classifier:
+
+- ambiguous: one gesture of one hand bound to several actions (an error)
+- unknown: a gesture name the classifier never emits, such as "Palm up"
+- unreachable: a known gesture that never wins on that hand, because its
+  rule is for the other hand or higher-priority gestures always match first
+- overlapping: two bound gestures of one hand that can match together, so
+  the higher-priority one silently takes the shared poses
+
+For the rule-based classifiers (``GestureClassifier`` and ``RuleSet``) each
+hand's lookup table is then reduced to the bound gestures and grown into a
+decision tree over the classifier's tests. Tests that cannot change which
+bound gesture wins are dropped, so a hand is classified by evaluating only
+the few tests on one root-to-leaf path. Classifiers expose their tests as
+``tests``, one per code bit:
+
+- ``('position', first, second)``: ``flat[first] < flat[second]`` on the
+  raveled (21, 3) landmarks
+- ``('distance', a, b, squared_limit, below)``: squared distance of
+  landmarks ``a`` and ``b`` is below the limit (above when ``below`` is False)
+- ``('angle', a, b, c, cos_limit)``: the angle at ``b`` is below the limit,
+  compared as its cosine being above ``cos_limit``
+"""
+import json
+import math
+import re
+
+import numpy as np
+
+from src.airgesture.core.gesture_model import NO_GESTURE
+from src.airgesture.core.rules import LANDMARK_NAMES
+
+ERROR, WARNING = 'error', 'warning'
+HANDS = ('Left', 'Right')
+BINDING = re.compile(r'^\s*(.*?\S)\s+-\s+(Left|Right) hand\s*$')
+AXIS_RELATIONS = ('left of', 'above', 'nearer than')
+
+
+class ProfileError(ValueError):
+    """A profile whose gesture bindings cannot be used."""
+
+
+def parse_binding(text):
+    """Split ``"Pinch - Right hand"`` into ("Pinch", "Right")."""
+    match = BINDING.match(text) if isinstance(text, str) else None
+    if match is None:
+        raise ProfileError(f"Gesture {text!r} is not written as '<gesture> - <Left|Right> hand'")
+    return match.group(1), match.group(2)
+
+
+def load_profiles(path):
+    """The profiles of a ``gesture_profiles.json`` file, by name."""
+    try:
+        with open(path) as f:
+            return {profile['name']: profile for profile in json.load(f)['profiles']}
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        raise ProfileError(f"Cannot read profiles from {path}: {e}")
+
+
+def describe_test(test):
+    kind = test[0]
+    if kind == 'position':
+        first, second = divmod(test[1], 3), divmod(test[2], 3)
+        return (f"{LANDMARK_NAMES[first[0]]} {AXIS_RELATIONS[first[1]]} "
+                f"{LANDMARK_NAMES[second[0]]}")
+    if kind == 'distance':
+        relation = '<' if test[4] else '>'
+        return (f"distance({LANDMARK_NAMES[test[1]]}, {LANDMARK_NAMES[test[2]]}) "
+                f"{relation} {math.sqrt(test[3]):.3g}")
+    degrees = math.degrees(math.acos(max(-1.0, min(1.0, test[4]))))
+    return (f"angle({', '.join(LANDMARK_NAMES[i] for i in test[1:4])}) < {degrees:.0f}")
+
+
+def test_function(test):
+    """A function of the raveled landmark list evaluating one test."""
+    kind = test[0]
+    if kind == 'position':
+        _, first, second = test
+        return lambda flat: flat[first] < flat[second]
+    if kind == 'distance':
+        _, a, b, limit, below = test
+        a, b = a * 3, b * 3
+
+        def distance(flat):
+            dx = flat[a] - flat[b]
+            dy = flat[a + 1] - flat[b + 1]
+            dz = flat[a + 2] - flat[b + 2]
+            return (dx * dx + dy * dy + dz * dz < limit) == below
+        return distance
+
+    _, a, b, c, cos_limit = test
+    a, b, c = a * 3, b * 3, c * 3
+
+    def angle(flat):
+        u = [flat[a + k] - flat[b + k] for k in range(3)]
+        v = [flat[c + k] - flat[b + k] for k in range(3)]
+        norms = math.sqrt(sum(x * x for x in u) * sum(x * x for x in v))
+        return norms > 0 and sum(x * y for x, y in zip(u, v)) / norms > cos_limit
+    return angle
+
+
+def evaluate_tests(tests, landmarks):
+    """Evaluate tests on (N, 21, 3) hands at once; returns (N, tests) bools."""
+    landmarks = np.asarray(landmarks, dtype=np.float32)
+    flat = landmarks.reshape(len(landmarks), -1)
+    results = np.zeros((len(landmarks), len(tests)), dtype=bool)
+    for i, test in enumerate(tests):
+        if test[0] == 'position':
+            results[:, i] = flat[:, test[1]] < flat[:, test[2]]
+        elif test[0] == 'distance':
+            offsets = landmarks[:, test[1]] - landmarks[:, test[2]]
+            results[:, i] = ((offsets * offsets).sum(axis=1) < test[3]) == test[4]
+        else:
+            u = landmarks[:, test[1]] - landmarks[:, test[2]]
+            v = landmarks[:, test[3]] - landmarks[:, test[2]]
+            norms = np.sqrt((u * u).sum(axis=1) * (v * v).sum(axis=1))
+            with np.errstate(invalid='ignore', divide='ignore'):
+                results[:, i] = (norms > 0) & ((u * v).sum(axis=1) / norms > test[4])
+    return results
+
+
+def test_interval(test, value):
+    """The quantity a test measures and the interval it lies in when the test
+    gives ``value``, as (key, low, high)."""
+    kind = test[0]
+    if kind == 'position':
+        # flat[low] - flat[high] of the two coordinates, whichever way round
+        first, second = test[1], test[2]
+        negative = (first < second) == value
+        key = ('position', min(first, second), max(first, second))
+        return (key, -math.inf, 0.0) if negative else (key, 0.0, math.inf)
+    if kind == 'distance':
+        key, limit = ('distance',) + tuple(sorted(test[1:3])), test[3]
+        return (key, 0.0, limit) if value == test[4] else (key, limit, math.inf)
+    key, cos_limit = ('angle',) + tuple(test[1:4]), test[4]
+    return (key, cos_limit, 1.0) if value else (key, -1.0, cos_limit)
+
+
+def impossible_pairs(tests):
+    """(bit, value, other bit, other value) results that cannot occur together,
+    such as a position test and its reverse, or a distance below 0.08 but
+    not below 0.12."""
+    pairs = []
+    for first in range(len(tests)):
+        for second in range(first + 1, len(tests)):
+            for first_value in (False, True):
+                for second_value in (False, True):
+                    key, low, high = test_interval(tests[first], first_value)
+                    other, other_low, other_high = test_interval(tests[second], second_value)
+                    if key == other and (low >= other_high or other_low >= high):
+                        pairs.append((first, first_value, second, second_value))
+    return pairs
+
+
+def possible_codes(codes, impossible):
+    """Whether each code is a physically possible combination of test results."""
+    possible = np.ones(len(codes), dtype=bool)
+    for first, first_value, second, second_value in impossible:
+        possible &= ~((((codes >> first) & 1) == first_value) &
+                      (((codes >> second) & 1) == second_value))
+    return possible
+
+
+def entropy(values):
+    counts = np.bincount(values)
+    counts = counts[counts > 0]
+    return float(len(values) * math.log(len(values)) - (counts * np.log(counts)).sum())
+
+
+class DecisionTree:
+    """A binary tree over a classifier's tests, with a bound gesture at each leaf.
+
+    ``nodes`` holds (test, if false, if true) triples; a child below zero is
+    the leaf ``~child``, an index into ``leaves`` (None for no gesture).
+    """
+
+    def __init__(self, tests, targets, possible, leaves):
+        self.tests = tests
+        self.leaves = leaves
+        # Only tests that can change the outcome between two possible codes;
+        # if that leaves codes apart that no test separates, use them all
+        bits = [bit for bit in range(len(tests)) if self.matters(bit, targets, possible)]
+        for bits in (bits, list(range(len(tests)))):
+            self.nodes, self.unseparated = [], False
+            self.root = self.grow(np.flatnonzero(possible), targets, bits)
+            if not self.unseparated:
+                break
+        self.used = sorted({bit for bit, _, _ in self.nodes})
+        self.functions = [test_function(test) for test in tests]
+
+    @staticmethod
+    def matters(bit, targets, possible):
+        low = np.flatnonzero(possible & ((np.arange(len(targets)) >> bit) & 1 == 0))
+        high = low | (1 << bit)
+        both = possible[high]
+        return bool((targets[low[both]] != targets[high[both]]).any())
+
+    def grow(self, codes, targets, bits):
+        """Split ``codes`` on the test leaving the least entropy; returns the node."""
+        values = targets[codes]
+        if len(codes) == 0 or (values == values[0]).all():
+            return ~int(values[0]) if len(codes) else ~0
+        best, best_cost = None, None
+        for bit in bits:
+            high = ((codes >> bit) & 1).astype(bool)
+            count = int(high.sum())
+            if count == 0 or count == len(codes):
+                continue
+            cost = entropy(values[high]) + entropy(values[~high])
+            if best_cost is None or cost < best_cost:
+                best, best_cost, best_high = bit, cost, high
+        if best is None:
+            # Possible codes that no remaining test separates: keep the most common
+            self.unseparated = True
+            return ~int(np.bincount(values).argmax())
+        node = len(self.nodes)
+        self.nodes.append(None)
+        remaining = [bit for bit in bits if bit != best]
+        self.nodes[node] = (best, self.grow(codes[~best_high], targets, remaining),
+                            self.grow(codes[best_high], targets, remaining))
+        return node
+
+    def classify(self, flat):
+        """The bound gesture of a raveled (63,) landmark list, or None."""
+        node, nodes, functions = self.root, self.nodes, self.functions
+        while node >= 0:
+            bit, low, high = nodes[node]
+            node = high if functions[bit](flat) else low
+        return self.leaves[~node]
+
+    def depth(self, node=None):
+        node = self.root if node is None else node
+        if node < 0:
+            return 0
+        _, low, high = self.nodes[node]
+        return 1 + max(self.depth(low), self.depth(high))
+
+    def describe(self, node=None, indent=''):
+        """The tree as indented text, one line per test or leaf."""
+        node = self.root if node is None else node
+        if node < 0:
+            return [f"{indent}-> {self.leaves[~node] or 'no gesture'}"]
+        bit, low, high = self.nodes[node]
+        return ([f"{indent}if {describe_test(self.tests[bit])}:"] +
+                self.describe(high, indent + '    ') + [f"{indent}else:"] +
+                self.describe(low, indent + '    '))
+
+
+class CompiledProfile:
+    """A profile's checked gesture bindings and its per-hand decision trees."""
+
+    def __init__(self, profile, classifier):
+        self.name = profile.get('name', '')
+        self.classifier = classifier
+        self.issues = []
+        self.bindings = {}
+        self.parse_actions(profile.get('actions', {}))
+
+        names = getattr(classifier, 'names', None)
+        if names is None:
+            names = [label for label in classifier.labels.tolist() if label != NO_GESTURE]
+        self.names = list(names)
+        for (gesture, hand), actions in self.bindings.items():
+            if gesture not in self.names:
+                self.warn(f"{gesture} - {hand} hand ({', '.join(actions)}) is unreachable: "
+                          f"the classifier has no gesture {gesture!r}")
+
+        self.trees = {}
+        if hasattr(classifier, 'lookup_table'):
+            masks = classifier.rule_masks()
+            codes = possible = None
+            for hand in HANDS:
+                table = classifier.lookup_table(hand)
+                if table is None:
+                    continue
+                if codes is None:
+                    codes = np.arange(len(table), dtype=np.int64)
+                    possible = possible_codes(codes, impossible_pairs(classifier.tests))
+                self.trees[hand] = self.compile_hand(hand, table, masks, codes, possible)
+
+    def warn(self, message):
+        self.issues.append((WARNING, message))
+
+    def error(self, message):
+        self.issues.append((ERROR, message))
+
+    @property
+    def errors(self):
+        return [message for severity, message in self.issues if severity == ERROR]
+
+    def parse_actions(self, actions):
+        for action, text in actions.items():
+            try:
+                binding = parse_binding(text)
+            except ProfileError as e:
+                self.error(f"{action}: {e}")
+                continue
+            self.bindings.setdefault(binding, []).append(action)
+        for (gesture, hand), bound in self.bindings.items():
+            if len(bound) > 1:
+                self.error(f"{gesture} - {hand} hand is bound to {len(bound)} actions: "
+                           f"{', '.join(bound)}")
+
+    def compile_hand(self, hand, table, masks, codes, possible):
+        """Check one hand's bound gestures and grow its decision tree."""
+        numbers = table.astype(np.intp)
+
+        def can_overlap(first, second):
+            """Whether two rules can match this hand at once."""
+            if hand not in first[2] or hand not in second[2]:
+                return False
+            required, forbidden = first[0] | second[0], first[1] | second[1]
+            if required & forbidden:
+                return False
+            return bool((possible & ((codes & required) == required) &
+                         ((codes & forbidden) == 0)).any())
+
+        bound = [number for number, name in enumerate(self.names, 1)
+                 if (name, hand) in self.bindings]
+        winners = set(np.unique(numbers[possible]).tolist())
+
+        for number in bound:
+            name = self.names[number - 1]
+            required, forbidden, hands = masks[number - 1]
+            if hand not in hands:
+                self.warn(f"{name} - {hand} hand is unreachable: the gesture is only defined "
+                          f"for the {' and '.join(hands)} hand")
+            elif number not in winners:
+                before = [self.names[other - 1] for other in range(1, number)
+                          if can_overlap(masks[other - 1], masks[number - 1])]
+                self.warn(f"{name} - {hand} hand is unreachable: it is always preceded by "
+                          f"{', '.join(before) or 'impossible conditions'}")
+
+        reachable = [number for number in bound if number in winners]
+        for index, first in enumerate(reachable):
+            for second in reachable[index + 1:]:
+                if can_overlap(masks[first - 1], masks[second - 1]):
+                    self.warn(f"{self.names[first - 1]} and {self.names[second - 1]} - {hand} "
+                              f"hand overlap; {self.names[first - 1]} wins where both match")
+
+        # Leaves are the bound gestures; unbound winners act as no gesture
+        leaf = np.zeros(len(self.names) + 1, dtype=np.intp)
+        leaves = [None]
+        for number in reachable:
+            leaf[number] = len(leaves)
+            leaves.append(self.names[number - 1])
+        return DecisionTree(self.classifier.tests, leaf[numbers], possible, leaves)
+
+    def classify(self, landmarks, hand):
+        """The bound gesture of one (21, 3) hand labelled "Left"/"Right", or None."""
+        tree = self.trees.get(hand)
+        if tree is not None:
+            return tree.classify(landmarks.ravel().tolist())
+        gesture = self.classifier.classify(landmarks, hand)
+        return gesture if (gesture, hand) in self.bindings else None
+
+    def action(self, gesture, hand):
+        """The action bound to a gesture of one hand, or None."""
+        actions = self.bindings.get((gesture, hand))
+        return actions[0] if actions else None
+
+    @property
+    def hands(self):
+        """The hands the bindings use, in ``HANDS`` order."""
+        return tuple(hand for hand in HANDS if any(bound == hand for _, bound in self.bindings))
+
+    def used_tests(self):
+        """Descriptions of the tests the trees can evaluate."""
+        bits = sorted({bit for tree in self.trees.values() for bit in tree.used})
+        return [describe_test(self.classifier.tests[bit]) for bit in bits]
+
+
+def compile_profile(profile, classifier, strict=True):
+    """Check a profile's bindings against its classifier and build its trees.
+
+    With ``strict`` any error raises ``ProfileError``; warnings are left in
+    ``issues`` for the caller to report.
+    """
+    compiled = CompiledProfile(profile, classifier)
+    if strict and compiled.errors:
+        raise ProfileError(f"Profile {compiled.name!r}: " + "; ".join(compiled.errors))
+    return compiled
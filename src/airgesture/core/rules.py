@@ -0,0 +1,306 @@
+"""Declarative gesture rules, compiled once into shared numpy evaluators.
+
+A profile in ``gesture_profiles.json`` can define its gestures as a list of
+rules in priority order::
+
+    {"name": "Pinch", "hand": "Right",
+     "fingers": {"middle": "up"},
+     "when": [{"distance": ["index_tip", "thumb_tip"], "below": "pinch_threshold"}]}
+
+``hand`` is "Left", "Right" or "any" (the default). ``fingers`` maps thumb,
+index, middle, ring or pinky to "up" or "down" (tip above or below its PIP
+joint, the IP joint for the thumb). Every entry of ``when`` must hold:
+
+- ``{"above": [a, b]}``, ``below``, ``left_of``, ``right_of``, ``nearer``,
+  ``farther``: landmark ``a`` is higher, lower, ... than landmark ``b``
+- ``{"distance": [a, b], "below": t}`` or ``"above": t``: distance in
+  normalized image units; ``t`` is a number or the name of a profile setting
+- ``{"angle": [a, b, c], "below": degrees}`` or ``"above"``: the angle at
+  ``b`` between ``a`` and ``c``
+- ``{"not": condition}``
+
+Landmarks use MediaPipe's names in lower case (``wrist``, ``thumb_tip``,
+``index_pip``, ...). Compiling reduces every condition to a canonical term,
+so the same test written in two rules, or as a finger state in one and a
+comparison in another, is evaluated once. All position tests are one
+gather-and-compare, every distinct landmark pair and angle is measured once,
+and the rules are matched with a lookup table over the term bits, so adding
+gestures adds almost nothing to the per-hand cost.
+"""
+import numpy as np
+
+from src.airgesture.core.session import HANDEDNESS_CODES, NO_HAND
+
+LANDMARK_NAMES = (
+    'wrist',
+    'thumb_cmc', 'thumb_mcp', 'thumb_ip', 'thumb_tip',
+    'index_mcp', 'index_pip', 'index_dip', 'index_tip',
+    'middle_mcp', 'middle_pip', 'middle_dip', 'middle_tip',
+    'ring_mcp', 'ring_pip', 'ring_dip', 'ring_tip',
+    'pinky_mcp', 'pinky_pip', 'pinky_dip', 'pinky_tip',
+)
+LANDMARKS = {name: index for index, name in enumerate(LANDMARK_NAMES)}
+
+# Finger name -> (tip, joint it is compared against)
+FINGERS = {
+    'thumb': ('thumb_tip', 'thumb_ip'),
+    'index': ('index_tip', 'index_pip'),
+    'middle': ('middle_tip', 'middle_pip'),
+    'ring': ('ring_tip', 'ring_pip'),
+    'pinky': ('pinky_tip', 'pinky_pip'),
+}
+
+# Relation -> (axis, True if the first landmark has the smaller coordinate).
+# Image y grows downwards and z grows away from the camera.
+POSITIONS = {
+    'above': (1, True),
+    'below': (1, False),
+    'left_of': (0, True),
+    'right_of': (0, False),
+    'nearer': (2, True),
+    'farther': (2, False),
+}
+
+HANDS = ('Left', 'Right', 'any')
+
+# Up to this many distinct terms, rules are matched through a lookup table
+MAX_TABLE_BITS = 20
+
+
+class RuleError(ValueError):
+    """A gesture rule that cannot be compiled."""
+
+
+def landmark(name):
+    try:
+        return LANDMARKS[name]
+    except KeyError:
+        raise RuleError(f"Unknown landmark {name!r}") from None
+
+
+class TermPool:
+    """Canonical terms shared by all rules; ``add`` returns a term's index."""
+
+    def __init__(self):
+        self.terms = []
+        self.index = {}
+
+    def add(self, key):
+        if key not in self.index:
+            self.index[key] = len(self.terms)
+            self.terms.append(key)
+        return self.index[key]
+
+
+def threshold(value, settings):
+    if isinstance(value, str):
+        if value not in settings:
+            raise RuleError(f"Unknown setting {value!r}")
+        value = settings[value]
+    return float(value)
+
+
+def compile_condition(condition, pool, settings):
+    """Reduce one condition to a (term index, negated) literal."""
+    if not isinstance(condition, dict):
+        raise RuleError(f"Condition must be an object, got {condition!r}")
+    if 'not' in condition:
+        term, negated = compile_condition(condition['not'], pool, settings)
+        return term, not negated
+
+    if 'distance' in condition or 'angle' in condition:
+        kind = 'distance' if 'distance' in condition else 'angle'
+        points = tuple(landmark(name) for name in condition[kind])
+        if len(points) != (2 if kind == 'distance' else 3):
+            raise RuleError(f"Wrong number of landmarks in {condition!r}")
+        if kind == 'distance':
+            points = tuple(sorted(points))
+        elif points[0] > points[2]:
+            points = points[::-1]
+        bounds = [relation for relation in ('below', 'above') if relation in condition]
+        if len(bounds) != 1:
+            raise RuleError(f"{kind.title()} needs exactly one of 'below' or 'above': {condition!r}")
+        # "above t" is the negation of "below t", so both share one term; the
+        # setting a threshold names is kept so it can be tuned later
+        value = condition[bounds[0]]
+        setting = value if isinstance(value, str) else None
+        limit = threshold(value, settings)
+        return pool.add((kind, points, limit, setting)), bounds[0] == 'above'
+
+    relations = [relation for relation in POSITIONS if relation in condition]
+    if len(relations) != 1:
+        raise RuleError(f"Unrecognized condition {condition!r}")
+    first, second = (landmark(name) for name in condition[relations[0]])
+    axis, first_smaller = POSITIONS[relations[0]]
+    if not first_smaller:
+        first, second = second, first
+    return pool.add(('position', first * 3 + axis, second * 3 + axis)), False
+
+
+def compile_rule(rule, pool, settings):
+    """Return (name, hand, literals) for one rule."""
+    name = rule.get('name')
+    if not name:
+        raise RuleError(f"Rule without a name: {rule!r}")
+    hand = rule.get('hand', 'any')
+    if hand not in HANDS:
+        raise RuleError(f"Rule {name!r}: hand must be one of {', '.join(HANDS)}")
+
+    conditions = []
+    for finger, state in rule.get('fingers', {}).items():
+        if finger not in FINGERS or state not in ('up', 'down'):
+            raise RuleError(f"Rule {name!r}: bad finger state {finger}: {state}")
+        tip, joint = FINGERS[finger]
+        conditions.append({'above' if state == 'up' else 'below': [tip, joint]})
+    conditions.extend(rule.get('when', []))
+    if not conditions:
+        raise RuleError(f"Rule {name!r} has no conditions")
+    try:
+        return name, hand, [compile_condition(c, pool, settings) for c in conditions]
+    except RuleError as e:
+        raise RuleError(f"Rule {name!r}: {e}") from None
+
+
+class RuleSet:
+    """A profile's gesture rules, compiled for evaluation on (N, 21, 3) hands."""
+
+    def __init__(self, rules, settings=None):
+        settings = settings or {}
+        pool = TermPool()
+        compiled = [compile_rule(rule, pool, settings) for rule in rules]
+        if not compiled:
+            raise RuleError("No gesture rules")
+        self.names = [name for name, _, _ in compiled]
+        self.terms = pool.terms
+
+        positions = [i for i, term in enumerate(self.terms) if term[0] == 'position']
+        distances = [i for i, term in enumerate(self.terms) if term[0] == 'distance']
+        angles = [i for i, term in enumerate(self.terms) if term[0] == 'angle']
+        # Evaluation order: positions, distances, angles; column i of the
+        # term matrix is self.terms[self.order[i]]
+        self.order = positions + distances + angles
+        column = {term: i for i, term in enumerate(self.order)}
+
+        self.first = np.array([self.terms[i][1] for i in positions], dtype=np.intp)
+        self.second = np.array([self.terms[i][2] for i in positions], dtype=np.intp)
+
+        # Each distinct landmark pair is measured once, however many thresholds use it
+        pairs = sorted({self.terms[i][1] for i in distances})
+        self.pair_first = np.array([a for a, _ in pairs], dtype=np.intp)
+        self.pair_second = np.array([b for _, b in pairs], dtype=np.intp)
+        self.distance_pair = np.array([pairs.index(self.terms[i][1]) for i in distances],
+                                      dtype=np.intp)
+        self.distance_limit = np.array([self.terms[i][2] ** 2 for i in distances], dtype=np.float32)
+
+        # Angles are compared as cosines: angle < t exactly when cos(angle) > cos(t)
+        triples = sorted({self.terms[i][1] for i in angles})
+        self.triples = np.array(triples, dtype=np.intp).reshape(-1, 3)
+        self.angle_triple = np.array([triples.index(self.terms[i][1]) for i in angles],
+                                     dtype=np.intp)
+        self.angle_limit = np.array([np.cos(np.radians(self.terms[i][2])) for i in angles],
+                                    dtype=np.float32)
+
+        count = len(self.terms)
+        self.required = np.zeros((len(compiled), count), dtype=np.int32)
+        self.forbidden = np.zeros((len(compiled), count), dtype=np.int32)
+        # hands[h, r]: rule r applies to handedness code h (last row: unknown hand)
+        self.hands = np.zeros((len(HANDEDNESS_CODES) + 1, len(compiled)), dtype=bool)
+        for r, (_, hand, literals) in enumerate(compiled):
+            for term, negated in literals:
+                (self.forbidden if negated else self.required)[r, column[term]] = 1
+            if hand == 'any':
+                self.hands[:, r] = True
+            else:
+                self.hands[HANDEDNESS_CODES[hand], r] = True
+        self.weights = 1 << np.arange(count, dtype=np.int64)
+        self.table = self.build_table() if count <= MAX_TABLE_BITS else None
+
+        # Column i of the term matrix as a test for core.profiles, and the
+        # profile setting its threshold comes from (None for literals)
+        self.tests, self.test_settings = [], []
+        for i in self.order:
+            kind, points, *limit = self.terms[i]
+            if kind == 'position':
+                self.tests.append(('position', points, limit[0]))
+            elif kind == 'distance':
+                self.tests.append(('distance', points[0], points[1], limit[0] ** 2, True))
+            else:
+                self.tests.append(('angle',) + points + (float(np.cos(np.radians(limit[0]))),))
+            self.test_settings.append(limit[1] if kind != 'position' else None)
+
+    def build_table(self):
+        """Resolve every (hand, term code) to its highest-priority rule (0 for none)."""
+        weights = self.weights
+        codes = np.arange(1 << len(self.terms), dtype=np.int64)
+        table = np.zeros((len(self.hands), len(codes)), dtype=np.uint16)
+        for number in range(len(self.names), 0, -1):
+            required = int(self.required[number - 1] @ weights)
+            forbidden = int(self.forbidden[number - 1] @ weights)
+            matches = ((codes & required) == required) & ((codes & forbidden) == 0)
+            for hand in np.flatnonzero(self.hands[:, number - 1]):
+                table[hand, matches] = number
+        return table
+
+    def lookup_table(self, hand):
+        """The rule number (0 for none) of every term code for a "Left"/"Right"
+        hand, or None when there are too many terms for a table."""
+        if self.table is None:
+            return None
+        return self.table[HANDEDNESS_CODES[hand]]
+
+    def rule_masks(self):
+        """(required, forbidden, hands) term masks of every rule, in priority order."""
+        return [(int(self.required[r] @ self.weights), int(self.forbidden[r] @ self.weights),
+                 tuple(hand for hand, code in HANDEDNESS_CODES.items() if self.hands[code, r]))
+                for r in range(len(self.names))]
+
+    def evaluate(self, landmarks):
+        """Evaluate every distinct term of (N, 21, 3) hands; returns (N, terms) bools."""
+        landmarks = np.asarray(landmarks, dtype=np.float32)
+        flat = landmarks.reshape(len(landmarks), -1)
+        columns = [flat[:, self.first] < flat[:, self.second]]
+        if len(self.pair_first):
+            offsets = landmarks[:, self.pair_first] - landmarks[:, self.pair_second]
+            squared = np.einsum('nij,nij->ni', offsets, offsets)
+            columns.append(squared[:, self.distance_pair] < self.distance_limit)
+        if len(self.triples):
+            joints = landmarks[:, self.triples[:, 1]]
+            u = landmarks[:, self.triples[:, 0]] - joints
+            v = landmarks[:, self.triples[:, 2]] - joints
+            norms = np.sqrt(np.einsum('nij,nij->ni', u, u) * np.einsum('nij,nij->ni', v, v))
+            with np.errstate(invalid='ignore', divide='ignore'):
+                cosines = np.einsum('nij,nij->ni', u, v) / norms
+            columns.append(cosines[:, self.angle_triple] > self.angle_limit)
+        return np.concatenate(columns, axis=1)
+
+    def match(self, landmarks, handedness):
+        """Return the index of the first matching rule per hand, -1 for none.
+
+        ``handedness`` holds session codes (0 = Left, 1 = Right); any other
+        value, such as -1, matches only rules for "any" hand.
+        """
+        terms = self.evaluate(landmarks)
+        handedness = np.asarray(handedness, dtype=np.int64)
+        hands = np.where((handedness >= 0) & (handedness < len(HANDEDNESS_CODES)),
+                         handedness, len(HANDEDNESS_CODES))
+        if self.table is not None:
+            return self.table[hands, terms.astype(np.int64) @ self.weights].astype(np.intp) - 1
+
+        bits = terms.astype(np.int32)
+        matched = ((bits @ self.required.T == self.required.sum(axis=1)) &
+                   (bits @ self.forbidden.T == 0) & self.hands[hands])
+        return np.where(matched.any(axis=1), matched.argmax(axis=1), -1)
+
+    def classify_batch(self, landmarks, handedness):
+        """Gesture names of N hands, None where no rule matches."""
+        return [self.names[i] if i >= 0 else None for i in self.match(landmarks, handedness).tolist()]
+
+    def classify(self, landmarks, hand=None):
+        """Return the gesture name for one (21, 3) hand labelled "Left"/"Right", or None."""
+        if self.table is None:
+            number = self.match(landmarks[np.newaxis], [HANDEDNESS_CODES.get(hand, NO_HAND)])[0]
+        else:
+            terms = self.evaluate(landmarks[np.newaxis])[0]
+            row = HANDEDNESS_CODES.get(hand, len(HANDEDNESS_CODES))
+            number = int(self.table[row, int(terms @ self.weights)]) - 1
+        return self.names[number] if number >= 0 else None
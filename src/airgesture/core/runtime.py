@@ -0,0 +1,82 @@
+import logging
+import os
+
+import cv2
+
+logger = logging.getLogger(__name__)
+
+
+def parse_cpu_list(text):
+    """Parse a CPU list such as ``"0-2,5"`` into a sorted list of CPU ids."""
+    cpus = set()
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            first, last = part.split('-')
+            cpus.update(range(int(first), int(last) + 1))
+        else:
+            cpus.add(int(part))
+    return sorted(cpus)
+
+
+def available_cpus():
+    """Return the CPUs this process may run on."""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def configure_opencv(num_threads):
+    """Limit OpenCV's internal thread pool; None keeps OpenCV's default."""
+    if num_threads is not None:
+        cv2.setNumThreads(num_threads)
+
+
+def pin_current_thread(cpus):
+    """Pin the calling thread to ``cpus`` on Linux.
+
+    Threads started afterwards from this thread inherit the CPU set, which
+    is how the inference runtime's worker pool gets confined. Returns False
+    when pinning is unsupported or not requested.
+    """
+    if not cpus or not hasattr(os, 'sched_setaffinity'):
+        return False
+    try:
+        os.sched_setaffinity(0, cpus)
+        return True
+    except OSError as e:
+        logger.warning(f"Could not set CPU affinity {cpus}: {str(e)}")
+        return False
+
+
+def inference_cpus(config):
+    """Resolve the CPU set the inference stage should run on.
+
+    MediaPipe's solution API does not expose the TFLite/XNNPACK thread
+    count, so ``inference_threads`` is enforced by confining the thread that
+    builds the graph to that many CPUs.
+    """
+    cpus = config['affinity'].get('inference')
+    threads = config['inference_threads']
+    if cpus is None and threads is None:
+        return None
+    cpus = list(cpus) if cpus is not None else available_cpus()
+    if threads is not None:
+        cpus = cpus[:threads]
+    return cpus
+
+
+def configure_process(config):
+    """Apply the process-wide settings and pin the calling (UI) thread."""
+    configure_opencv(config['opencv_threads'])
+    if pin_current_thread(config['affinity'].get('ui')):
+        logger.info(f"UI thread pinned to CPUs {config['affinity']['ui']}")
+
+
+def configure_inference_thread(config):
+    """Pin the calling thread before it builds the inference backend."""
+    cpus = inference_cpus(config)
+    if pin_current_thread(cpus):
+        logger.info(f"Inference pinned to CPUs {cpus}")
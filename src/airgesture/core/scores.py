@@ -0,0 +1,194 @@
+"""Continuous confidence scores for the per-hand gestures.
+
+The predicates answer yes or no, so a pinch barely under its threshold looks
+the same as a firm one. Here every test behind them becomes a signed margin
+(how far a fingertip is above its joint, in palm lengths, or how far a
+distance is past its threshold, relative to it), squashed to (0, 1) by a
+logistic with a per-kind softness; 0.5 is exactly the predicate's threshold.
+A gesture's raw score is the minimum of its tests, and the gestures of one
+hand form a priority chain like ``predicates.hand_gesture``: each scores at
+most one minus the best raw score before it. The top-scoring gesture is
+therefore the boolean label whenever its score is above 0.5.
+
+Margins are collected per hand, then the scores of all hands in a frame (or
+all N hands of a batch) are computed in one vectorized pass.
+"""
+import math
+from collections import deque
+
+import numpy as np
+
+from src.airgesture.core import landmarks as L
+from src.airgesture.core import predicates as P
+from src.airgesture.core.features import MIN_PALM_SIZE
+from src.airgesture.core.session import HANDEDNESS_CODES
+from src.airgesture.utils.config import THRESHOLD_TABLES
+
+# Signed margins, positive when the test holds, and the kind of each
+MARGINS = ('index_up', 'middle_up', 'ring_up', 'pinky_up', 'thumb_down',
+           'ring_below_middle', 'pinky_below_middle',
+           'pinch', 'middle_tap', 'apart', 'together')
+MARGIN_KINDS = ('finger',) * 7 + ('distance',) * 4
+
+TWO_FINGERS_UP = ('index_up', 'middle_up', 'ring_below_middle', 'pinky_below_middle')
+ALL_FINGERS_DOWN = ('-index_up', '-middle_up', '-ring_up', '-pinky_up')
+
+# Priority chains mirroring predicates.hand_gesture; "-" negates a test and
+# an empty test list always holds
+RIGHT_CHAIN = (
+    ('left_click', ('apart', 'pinch')),
+    ('right_click', ('apart', 'middle_tap')),
+    ('click_ready', ('apart',)),
+    ('move_cursor', TWO_FINGERS_UP),
+    ('brightness_up', ('pinky_up',)),
+    ('brightness_down', ALL_FINGERS_DOWN + ('thumb_down',)),
+    (P.NO_GESTURE, ()),
+)
+LEFT_CHAIN = (
+    ('scroll_up', ('together',) + TWO_FINGERS_UP),
+    ('scroll_down', ('together',) + ALL_FINGERS_DOWN),
+    ('task_view', ('index_up', 'middle_up', 'ring_up', 'pinky_up')),
+    ('volume_up', ('index_up',)),
+    ('volume_down', ()),
+)
+GESTURE_NAMES = tuple(name for name, _ in RIGHT_CHAIN + LEFT_CHAIN)
+
+
+
+def hand_margins(hand):
+    """The signed margins of one hand's ``HandFeatures``, in ``MARGINS`` order."""
+    y = hand.y
+    palm = math.sqrt(max(hand.palm_size, MIN_PALM_SIZE))
+    thresholds = THRESHOLD_TABLES[hand.units]
+    pinch = thresholds['pinch_distance']
+    apart = thresholds['fingers_apart_distance']
+    together = thresholds['fingers_together_distance']
+    spread = math.sqrt(hand.index_middle_distance)
+    middle_tip = y[L.MIDDLE_TIP]
+    return [(y[pip] - y[tip]) / palm for tip, pip in zip(L.FINGER_TIPS, L.FINGER_PIPS)] + [
+        (y[L.THUMB_TIP] - y[L.THUMB_IP]) / palm,
+        (y[L.RING_TIP] - middle_tip) / palm,
+        (y[L.PINKY_TIP] - middle_tip) / palm,
+        (pinch - math.sqrt(hand.index_thumb_distance)) / pinch,
+        (pinch - math.sqrt(hand.middle_thumb_distance)) / pinch,
+        (spread - apart) / apart,
+        (together - spread) / together,
+    ]
+
+
+def batch_margins(landmarks, features, units='image'):
+    """``hand_margins`` for N hands from ``batch.batch_features``, as (N, len(MARGINS))."""
+    y = np.asarray(landmarks, dtype=np.float32)[:, :, L.Y]
+    palm = np.sqrt(np.maximum(features['palm_size'], MIN_PALM_SIZE))[:, np.newaxis]
+    thresholds = THRESHOLD_TABLES[units]
+    pinch = thresholds['pinch_distance']
+    apart = thresholds['fingers_apart_distance']
+    together = thresholds['fingers_together_distance']
+    spread = np.sqrt(features['index_middle_distance'])
+    middle_tip = y[:, L.MIDDLE_TIP]
+    fingers = (y[:, L.FINGER_PIPS] - y[:, L.FINGER_TIPS]) / palm
+    others = np.stack([
+        y[:, L.THUMB_TIP] - y[:, L.THUMB_IP],
+        y[:, L.RING_TIP] - middle_tip,
+        y[:, L.PINKY_TIP] - middle_tip,
+    ], axis=1) / palm
+    distances = np.stack([
+        (pinch - np.sqrt(features['index_thumb_distance'])) / pinch,
+        (pinch - np.sqrt(features['middle_thumb_distance'])) / pinch,
+        (spread - apart) / apart,
+        (together - spread) / together,
+    ], axis=1)
+    return np.concatenate([fingers, others, distances], axis=1)
+
+
+def compile_chain(chain):
+    """Index and sign matrices gathering each gesture's tests from the margins.
+
+    Unused slots point at an extra always-true column past the margins.
+    """
+    width = max(len(tests) for _, tests in chain) or 1
+    index = np.full((len(chain), width), len(MARGINS))
+    sign = np.ones((len(chain), width))
+    for row, (_, tests) in enumerate(chain):
+        for column, test in enumerate(tests):
+            negated = test.startswith('-')
+            index[row, column] = MARGINS.index(test.lstrip('-'))
+            sign[row, column] = -1.0 if negated else 1.0
+    return index, sign
+
+
+class GestureScorer:
+    """Scores every gesture of every hand of a frame in one pass.
+
+    ``softness`` maps a margin kind ('finger', 'distance') to the margin at
+    which a test scores about 0.73; smaller is sharper.
+    """
+
+    def __init__(self, softness=None):
+        softness = dict({'finger': 0.1, 'distance': 0.15}, **(softness or {}))
+        # Scale per margin, with the always-true column last
+        self.scale = np.array([1.0 / softness[kind] for kind in MARGIN_KINDS] + [1.0])
+        # Both chains in one gather; each row keeps only its own hand's columns
+        self.index, self.sign = compile_chain(RIGHT_CHAIN + LEFT_CHAIN)
+        self.chains = (slice(0, len(RIGHT_CHAIN)), slice(len(RIGHT_CHAIN), len(GESTURE_NAMES)))
+
+    def score(self, margins, handedness):
+        """Scores of (N, len(MARGINS)) margins, as (N, len(GESTURE_NAMES)).
+
+        ``handedness`` holds "Left"/"Right" labels or session codes; each row
+        scores only its own hand's gestures, and rows of neither hand are 0.
+        """
+        margins = np.asarray(margins, dtype=np.float64).reshape(-1, len(MARGINS))
+        scaled = np.empty((len(margins), len(MARGINS) + 1))
+        scaled[:, :-1] = margins
+        scaled[:, -1] = np.inf
+        scaled *= self.scale
+        raw = (0.5 + 0.5 * np.tanh(0.5 * scaled[:, self.index] * self.sign)).min(axis=2)
+
+        # Each gesture is held back by the best raw score before it in its chain
+        scores = raw.copy()
+        for chain in self.chains:
+            before = np.maximum.accumulate(raw[:, chain], axis=1)[:, :-1]
+            scores[:, chain.start + 1:chain.stop] = np.minimum(raw[:, chain.start + 1:chain.stop],
+                                                              1.0 - before)
+
+        handedness = np.asarray(handedness)
+        if handedness.dtype.kind in 'US':
+            is_right, is_left = handedness == "Right", handedness == "Left"
+        else:
+            is_right = handedness == HANDEDNESS_CODES['Right']
+            is_left = handedness == HANDEDNESS_CODES['Left']
+        scores[~is_right, self.chains[0]] = 0.0
+        scores[~is_left, self.chains[1]] = 0.0
+        return scores
+
+    def score_hands(self, hands, labels):
+        """Scores of a frame's ``HandFeatures`` with their handedness labels."""
+        return self.score([hand_margins(hand) for hand in hands], labels)
+
+
+def top_gestures(scores):
+    """The best gesture name and its score for every row of ``scores``."""
+    best = scores.argmax(axis=1)
+    return [(GESTURE_NAMES[column], float(scores[row, column]))
+            for row, column in enumerate(best.tolist())]
+
+
+class GestureEventLog:
+    """Recent dispatched gesture events with their scores, and per-gesture totals."""
+
+    def __init__(self, capacity=200):
+        self.events = deque(maxlen=capacity)
+        self.counts = {}
+        self.score_sums = {}
+
+    def record(self, timestamp, hand_id, gesture, event, score):
+        self.events.append((timestamp, hand_id, gesture, event, score))
+        self.counts[gesture] = self.counts.get(gesture, 0) + 1
+        self.score_sums[gesture] = self.score_sums.get(gesture, 0.0) + score
+
+    def summary(self):
+        if not self.counts:
+            return "no gesture events"
+        return ", ".join(f"{gesture} x{count} (mean score {self.score_sums[gesture] / count:.2f})"
+                         for gesture, count in sorted(self.counts.items()))
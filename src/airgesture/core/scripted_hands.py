@@ -0,0 +1,246 @@
+"""Deterministic stand-in for MediaPipe ``Hands`` driven by a gesture script.
+
+A script is a list of steps, one per line or separated by ``;``:
+
+    <start>[-<end>] <left|right> <pose> [at X,Y | from X,Y to X,Y]
+
+Times are seconds of virtual time, positions are normalized image
+coordinates of the palm centre. A step with a single time is held for
+``tap`` seconds. For example::
+
+    0.0-1.0 right two_fingers_up from 0.3,0.5 to 0.7,0.5
+    1.2 right pinch
+    2.0-2.5 left open_palm at 0.3,0.5
+
+Virtual time advances by one frame (``1 / fps``) per ``process`` call, so a
+script produces the same landmarks on every run regardless of how fast the
+pipeline runs. ``latency`` adds a synthetic inference cost per call.
+"""
+import random
+import time
+
+import numpy as np
+
+from src.airgesture.core.landmarks import (INDEX_MCP, MIDDLE_MCP, NUM_LANDMARKS, PINKY_MCP,
+                                           RING_MCP, THUMB_CMC, build_results)
+
+# Hand-local geometry in units of ``scale``: x to the thumb side is negative
+# for a right hand, y points down as in image coordinates.
+WRIST_OFFSET = (0.0, 0.9)  # wrist position relative to the palm centre
+FINGER_BASES = {
+    'index': (-0.3, -0.9),
+    'middle': (-0.1, -0.95),
+    'ring': (0.1, -0.9),
+    'pinky': (0.3, -0.8),
+}
+FINGER_FIRST_LANDMARK = {'thumb': THUMB_CMC, 'index': INDEX_MCP, 'middle': MIDDLE_MCP,
+                         'ring': RING_MCP, 'pinky': PINKY_MCP}
+FINGER_LENGTH = {'index': 1.0, 'middle': 1.05, 'ring': 1.0, 'pinky': 0.8}
+
+# Each pose lists its extended fingers, per-finger sideways splay, and an
+# optional fingertip the thumb tip touches.
+POSES = {
+    'fist': {'extended': ()},
+    'open_palm': {'extended': ('thumb', 'index', 'middle', 'ring', 'pinky'),
+                  'splay': {'index': -0.3, 'ring': 0.2, 'pinky': 0.4}},
+    'index_up': {'extended': ('index',)},
+    'two_fingers_up': {'extended': ('index', 'middle')},
+    'spread': {'extended': ('index', 'middle'), 'splay': {'index': -0.5, 'middle': 0.4}},
+    'pinch': {'extended': ('index', 'middle'), 'splay': {'index': -0.5, 'middle': 0.4},
+              'touch': 'index'},
+    'middle_tap': {'extended': ('index', 'middle'), 'splay': {'index': -0.5, 'middle': 0.4},
+                   'touch': 'middle'},
+    'pinky_up': {'extended': ('pinky',)},
+}
+
+# Ready-made scripts for benchmarks, each a few seconds long
+SCRIPTS = {
+    'cursor_sweep': "0.0-2.0 right two_fingers_up from 0.3,0.4 to 0.7,0.6",
+    'click': "0.0-0.5 right two_fingers_up; 0.5-0.8 right spread; 0.8 right pinch; "
+             "0.9-1.2 right spread",
+    'right_click': "0.0-0.5 right spread; 0.5 right middle_tap; 0.6-1.0 right spread",
+    'task_view': "0.0-0.5 left fist at 0.3,0.5; 0.5-1.0 left open_palm at 0.3,0.5",
+    'swipe': "0.0-0.5 right open_palm at 0.3,0.5; 0.5-0.8 right open_palm from 0.3,0.5 to 0.7,0.5; "
+             "0.8-1.5 right open_palm at 0.7,0.5; 1.5-1.8 right open_palm from 0.7,0.5 to 0.3,0.5; "
+             "1.8-2.5 right open_palm at 0.3,0.5",
+    'two_hands': "0.0-3.0 right two_fingers_up from 0.6,0.3 to 0.8,0.7; "
+                 "0.0-3.0 left index_up at 0.3,0.5; 1.5 right pinch at 0.8,0.7",
+}
+
+
+def finger_points(base, extended, splay, length, folded_sign):
+    """Return MCP, PIP, DIP and tip positions of one finger in hand units."""
+    x, y = base
+    if extended:
+        return [(x + splay * f, y - length * f) for f in (0.0, 0.45, 0.75, 1.0)]
+    # Curled: the tip ends up below the PIP joint
+    return [(x, y), (x, y - 0.35), (x + folded_sign * 0.05, y - 0.15), (x, y + 0.05)]
+
+
+def make_pose(name, label="Right", center=(0.5, 0.5), scale=0.1):
+    """Build the (21, 3) landmarks of a named pose at ``center``."""
+    pose = POSES[name]
+    extended = pose['extended']
+    splay = pose.get('splay', {})
+
+    local = np.zeros((NUM_LANDMARKS, 2))
+    local[0] = WRIST_OFFSET
+    for finger, base in FINGER_BASES.items():
+        first = FINGER_FIRST_LANDMARK[finger]
+        local[first:first + 4] = finger_points(base, finger in extended, splay.get(finger, 0.0),
+                                               FINGER_LENGTH[finger], 1.0)
+    if 'thumb' in extended:
+        local[1:5] = [(-0.35, 0.4), (-0.6, 0.0), (-0.8, -0.35), (-0.95, -0.65)]
+    else:
+        local[1:5] = [(-0.35, 0.4), (-0.55, 0.1), (-0.5, -0.2), (-0.35, -0.1)]
+    touch = pose.get('touch')
+    if touch is not None:
+        local[4] = local[FINGER_FIRST_LANDMARK[touch] + 3] + (0.05, 0.05)
+
+    if label == "Left":
+        local[:, 0] = -local[:, 0]
+    landmarks = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+    landmarks[:, 0] = center[0] + local[:, 0] * scale
+    landmarks[:, 1] = center[1] + local[:, 1] * scale
+    return landmarks
+
+
+def pose_corpus(count, noise=0.02, seed=0):
+    """Return ``count`` noisy hands of random poses, sides and positions.
+
+    Gives (landmarks (count, 21, 3) float32, labels) for checking that two
+    classifiers agree; the noise makes near-threshold hands common.
+    """
+    rng = np.random.default_rng(seed)
+    names = list(POSES)
+    landmarks = np.empty((count, NUM_LANDMARKS, 3), dtype=np.float32)
+    labels = []
+    for i in range(count):
+        label = "Right" if rng.random() < 0.5 else "Left"
+        center = rng.uniform(0.2, 0.8, 2)
+        landmarks[i] = make_pose(names[rng.integers(len(names))], label, center,
+                                 rng.uniform(0.06, 0.14))
+        labels.append(label)
+    landmarks += rng.normal(0.0, noise, landmarks.shape).astype(np.float32)
+    return landmarks, labels
+
+
+def parse_point(text):
+    x, y = text.split(',')
+    return float(x), float(y)
+
+
+def parse_script(script, tap=0.1):
+    """Parse a script string into a list of step dicts."""
+    default_centers = {"Right": (0.65, 0.5), "Left": (0.35, 0.5)}
+    steps = []
+    for line in script.replace(';', '\n').splitlines():
+        words = line.split()
+        if not words or words[0].startswith('#'):
+            continue
+        if len(words) < 3:
+            raise ValueError(f"Incomplete script step: {line.strip()!r}")
+
+        times = words[0].split('-')
+        start = float(times[0])
+        end = float(times[1]) if len(times) > 1 else start + tap
+        label = words[1].capitalize()
+        if label not in default_centers:
+            raise ValueError(f"Unknown hand {words[1]!r} in script step: {line.strip()!r}")
+        pose = words[2]
+        if pose not in POSES:
+            raise ValueError(f"Unknown pose {pose!r}, expected one of {', '.join(POSES)}")
+
+        begin = finish = default_centers[label]
+        rest = words[3:]
+        if rest[:1] == ['at'] and len(rest) == 2:
+            begin = finish = parse_point(rest[1])
+        elif rest[:1] == ['from'] and len(rest) == 4 and rest[2] == 'to':
+            begin, finish = parse_point(rest[1]), parse_point(rest[3])
+        elif rest:
+            raise ValueError(f"Could not parse position in script step: {line.strip()!r}")
+        steps.append({'start': start, 'end': end, 'label': label, 'pose': pose,
+                      'from': begin, 'to': finish})
+    return steps
+
+
+class ScriptedHands:
+    """Replay a gesture script through the ``Hands.process`` interface."""
+
+    def __init__(self, script, fps=30.0, latency=0.0, jitter=0.0, noise=0.0, loop=False,
+                 scale=0.1, seed=0):
+        self.steps = parse_script(script) if isinstance(script, str) else script
+        self.fps = fps
+        self.latency = latency
+        self.jitter = jitter
+        self.noise = noise
+        self.loop = loop
+        self.scale = scale
+        self.seed = seed
+        self.duration = max((step['end'] for step in self.steps), default=0.0)
+        self.reset()
+
+    def reset(self):
+        """Rewind to the start of the script."""
+        self.frame_index = 0
+        self.latency_rng = random.Random(self.seed)
+        self.noise_rng = np.random.default_rng(self.seed)
+
+    def current_time(self):
+        t = self.frame_index / self.fps
+        if self.loop and self.duration > 0:
+            t %= self.duration
+        return t
+
+    def hands_at(self, t):
+        """Return (landmarks, labels) of the hands visible at virtual time ``t``."""
+        active = {}
+        for step in self.steps:
+            if step['start'] <= t < step['end']:
+                # Later steps override earlier ones for the same hand
+                active[step['label']] = step
+
+        landmarks, labels = [], []
+        for label, step in active.items():
+            progress = (t - step['start']) / (step['end'] - step['start'])
+            center = (step['from'][0] + (step['to'][0] - step['from'][0]) * progress,
+                      step['from'][1] + (step['to'][1] - step['from'][1]) * progress)
+            landmarks.append(make_pose(step['pose'], label, center, self.scale))
+            labels.append(label)
+        if not landmarks:
+            return np.empty((0, NUM_LANDMARKS, 3), dtype=np.float32), []
+        return np.stack(landmarks), labels
+
+    def process(self, frame_rgb):
+        """Return the scripted hands for the next frame; ``frame_rgb`` is ignored."""
+        if self.latency > 0 or self.jitter > 0:
+            time.sleep(max(0.0, self.latency_rng.gauss(self.latency, self.jitter)))
+
+        landmarks, labels = self.hands_at(self.current_time())
+        self.frame_index += 1
+        if self.noise > 0 and len(landmarks):
+            landmarks = landmarks + self.noise_rng.normal(0.0, self.noise, landmarks.shape).astype(np.float32)
+        return build_results(landmarks, labels)
+
+    def draw_landmarks(self, frame_rgb, hand_landmarks):
+        """Scripted hands are not drawn on the (blank) preview."""
+
+    def close(self):
+        pass
+
+
+class BlankCamera:
+    """Camera stand-in that returns the same black frame forever."""
+
+    def __init__(self, frame_size=(640, 480)):
+        self.frame_size = frame_size
+        self.frame = np.zeros((frame_size[1], frame_size[0], 3), dtype=np.uint8)
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        return True, self.frame
+
+    def release(self):
+        pass
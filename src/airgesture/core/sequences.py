@@ -0,0 +1,184 @@
+"""Multi-step gestures run as small finite-state machines.
+
+A sequence is a list of steps, each a set of per-frame conditions that must
+hold, and each later step must follow the previous one within ``within``
+seconds. The spread-then-pinch click is::
+
+    {'name': 'left_click', 'hand': 'Right', 'click': 'left',
+     'steps': [{'when': 'spread'},
+               {'when': 'pinch', 'within': 0.6}]}
+
+``when`` and ``unless`` take a condition name or a list of names; the
+detector reports the names (``spread``, ``pinch``, ``middle_tap``, ...) as a
+dict of booleans every frame. ``hand`` is "Left", "Right" or "any".
+
+``SequenceMachine`` compiles its sequences once into transition tables
+indexed by (sequence, state, condition code), where the code packs this
+frame's conditions into one integer, so a frame costs one table lookup per
+sequence whatever its steps and conditions. The machine holds no progress:
+each hand keeps its own ``SequenceProgress``, so two hands or two people
+never advance each other's sequences. A completed sequence fires once and
+waits for its last step to be released before it can start again.
+"""
+import numpy as np
+
+DEFAULT_WITHIN = 0.6
+MAX_CONDITIONS = 12  # the tables have 2 ** conditions columns
+
+# Table entries pack the next state with these flags
+FIRE, REFRESH = 1, 2
+INFINITY = float('inf')
+
+
+class SequenceError(ValueError):
+    """A sequence definition that cannot be compiled."""
+
+
+def condition_names(value):
+    if value is None:
+        return []
+    return [value] if isinstance(value, str) else list(value)
+
+
+class SequenceProgress:
+    """One hand's current state and step deadline in every sequence of a machine."""
+
+    def __init__(self, count):
+        self.states = [0] * count
+        self.deadlines = [INFINITY] * count
+
+    def reset(self):
+        self.states[:] = [0] * len(self.states)
+        self.deadlines[:] = [INFINITY] * len(self.deadlines)
+
+
+class SequenceMachine:
+    """Compiled transition tables for the sequences of one hand.
+
+    ``hand`` keeps only the sequences for that hand ("Left" or "Right") and
+    the ones for "any"; None keeps all of them.
+    """
+
+    def __init__(self, definitions, hand=None):
+        self.definitions = [definition for definition in definitions
+                            if hand is None or definition.get('hand', 'any') in ('any', hand)]
+        self.names = tuple(definition['name'] for definition in self.definitions)
+        self.by_name = dict(zip(self.names, self.definitions))
+        self.conditions = []
+        steps = [self.parse_steps(definition) for definition in self.definitions]
+        if len(self.conditions) > MAX_CONDITIONS:
+            raise SequenceError(f"Sequences use {len(self.conditions)} conditions, "
+                                f"at most {MAX_CONDITIONS} are supported")
+        self.bits = {name: 1 << index for index, name in enumerate(self.conditions)}
+        self.compile(steps)
+
+    def condition_mask(self, names):
+        mask = 0
+        for name in names:
+            if name not in self.conditions:
+                self.conditions.append(name)
+            mask |= 1 << self.conditions.index(name)
+        return mask
+
+    def parse_steps(self, definition):
+        """Return the (required mask, forbidden mask, within) of every step."""
+        name = definition.get('name')
+        if not name:
+            raise SequenceError(f"Sequence without a name: {definition!r}")
+        steps = definition.get('steps')
+        if not steps:
+            raise SequenceError(f"Sequence {name!r} has no steps")
+        parsed = []
+        for step in steps:
+            required = condition_names(step.get('when'))
+            if not required:
+                raise SequenceError(f"Step of sequence {name!r} has no 'when': {step!r}")
+            within = float(step.get('within', DEFAULT_WITHIN))
+            if within <= 0:
+                raise SequenceError(f"Step of sequence {name!r} has a non-positive 'within'")
+            parsed.append((self.condition_mask(required),
+                           self.condition_mask(condition_names(step.get('unless'))), within))
+        return parsed
+
+    def compile(self, steps):
+        """Build the next-state, refresh and fire tables of every sequence.
+
+        State 0 is idle, state k waits for step k after step k - 1 matched,
+        and the last state (one per step) holds a fired sequence until its
+        last step is released. A transition that changes state or sees the
+        previous step again refreshes the step deadline.
+        """
+        count = len(steps)
+        states = max((len(parsed) for parsed in steps), default=0) + 1
+        codes = np.arange(1 << len(self.conditions))
+        self.next_state = np.zeros((count, states, len(codes)), dtype=np.intp)
+        self.refresh = np.zeros((count, states, len(codes)), dtype=bool)
+        self.fires = np.zeros((count, states, len(codes)), dtype=bool)
+        # Seconds allowed in each waiting state before falling back to idle
+        self.timeouts = np.full((count, states), np.inf)
+
+        for row, parsed in enumerate(steps):
+            matches = [((codes & required) == required) & ((codes & forbidden) == 0)
+                       for required, forbidden, within in parsed]
+            last = len(parsed)
+            next_state, refresh, fires = (self.next_state[row], self.refresh[row],
+                                          self.fires[row])
+            for state in range(last):
+                next_state[state] = state
+                if state > 0:
+                    self.timeouts[row, state] = parsed[state][2]
+                    # Seeing the previous step again keeps the sequence alive
+                    refresh[state] = matches[state - 1]
+                advance = matches[state]
+                next_state[state][advance] = state + 1
+                refresh[state] |= advance
+                if state + 1 == last:
+                    fires[state] = advance
+
+            # A fired sequence is held while its last step lasts, then acts as idle
+            held = matches[last - 1]
+            next_state[last] = np.where(held, last, next_state[0])
+            refresh[last] = ~held
+            fires[last] = ~held & fires[0]
+
+        # One flat list per sequence with the next state and flags packed into
+        # each entry; per-hand updates are a handful of scalar lookups
+        packed = self.next_state << 2 | self.refresh * REFRESH | self.fires * FIRE
+        self.tables = [table.ravel().tolist() for table in packed]
+        self.timeouts = self.timeouts.tolist()
+        self.stride = len(codes)
+
+    def start(self):
+        """Fresh per-hand progress through this machine's sequences."""
+        return SequenceProgress(len(self.names))
+
+    def encode(self, conditions):
+        """Pack a dict of condition booleans into a table column."""
+        code = 0
+        for name, bit in self.bits.items():
+            if conditions.get(name):
+                code |= bit
+        return code
+
+    def update(self, progress, conditions, timestamp):
+        """Advance one hand's ``progress``; returns the names of sequences completed now."""
+        code = self.encode(conditions)
+        states, deadlines = progress.states, progress.deadlines
+        fired = []
+        for row, table in enumerate(self.tables):
+            state = states[row]
+            if timestamp > deadlines[row]:
+                state = 0
+                deadlines[row] = INFINITY
+            entry = table[state * self.stride + code]
+            state = states[row] = entry >> 2
+            if entry & REFRESH:
+                deadlines[row] = timestamp + self.timeouts[row][state]
+            if entry & FIRE:
+                fired.append(self.names[row])
+        return fired
+
+    def waiting(self, progress, name):
+        """Whether sequence ``name`` has started but not yet completed for this hand."""
+        row = self.names.index(name)
+        return 0 < progress.states[row] < len(self.by_name[name]['steps'])
@@ -0,0 +1,74 @@
+"""Recorded landmark sessions stored as compressed ``.npz`` files.
+
+A session holds one row per processed frame:
+
+    timestamps  (N,) float64, seconds since the start of the recording
+    landmarks   (N, H, 21, 3) float32, NaN where no hand was detected
+    handedness  (N, H) int8, 0 = Left, 1 = Right, -1 = no hand
+
+Extra arrays (for example gesture labels) are stored alongside under their
+own names. Labelled sessions carry a ``labels`` (N, H) string array with ""
+for unlabelled hands.
+"""
+import numpy as np
+
+from src.airgesture.core.landmarks import NUM_LANDMARKS
+
+HANDEDNESS_CODES = {'Left': 0, 'Right': 1}
+NO_HAND = -1
+
+
+def empty_session(num_frames, max_hands):
+    """Allocate session arrays for ``num_frames`` frames of up to ``max_hands`` hands."""
+    return {
+        'timestamps': np.zeros(num_frames, dtype=np.float64),
+        'landmarks': np.full((num_frames, max_hands, NUM_LANDMARKS, 3), np.nan, dtype=np.float32),
+        'handedness': np.full((num_frames, max_hands), NO_HAND, dtype=np.int8),
+    }
+
+
+def save_session(path, timestamps, landmarks, handedness, **extra):
+    """Write a session to ``path``."""
+    np.savez_compressed(path, timestamps=timestamps, landmarks=landmarks,
+                        handedness=handedness, **extra)
+
+
+def load_session(path):
+    """Read a session written by :func:`save_session` into a dict of arrays."""
+    with np.load(path, allow_pickle=False) as data:
+        return {key: data[key] for key in data.files}
+
+
+def concatenate_sessions(sessions, max_hands):
+    """Join sessions frame-wise; returns an empty session for an empty list."""
+    if not sessions:
+        return empty_session(0, max_hands)
+    return {key: np.concatenate([session[key] for session in sessions])
+            for key in ('timestamps', 'landmarks', 'handedness')}
+
+
+def session_labels(session, label=None):
+    """The (frames, hands) gesture labels of a session, "" where there is no
+    labelled hand; ``label`` labels every detected hand at once."""
+    present = session['handedness'] != NO_HAND
+    if label is not None:
+        labels = np.full(present.shape, label)
+    elif 'labels' in session:
+        labels = session['labels']
+    else:
+        raise ValueError("session has no 'labels' array")
+    return np.where(present, labels, '')
+
+
+def parse_labelled_inputs(items, default_label=None):
+    """Split ``session.npz=Label`` arguments into paths and labels (None when not given)."""
+    paths, labels = [], []
+    for item in items:
+        path, separator, label = item.rpartition('=')
+        if separator and path.endswith('.npz'):
+            paths.append(path)
+            labels.append(label)
+        else:
+            paths.append(item)
+            labels.append(default_label)
+    return paths, labels
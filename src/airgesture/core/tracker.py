@@ -0,0 +1,167 @@
+import math
+
+from src.airgesture.core.landmarks import PALM_LANDMARKS, WRIST
+
+
+class HandState:
+    """Gesture state that belongs to one tracked hand."""
+
+    def __init__(self, gestures=None):
+        self.smoothed_cursor_x = None
+        self.smoothed_cursor_y = None
+        self.cursor_active = True
+        self.last_palm_open_time = 0
+        # Debounced gesture gates and hysteresis switches (core.debounce)
+        self.gestures = gestures
+        # Progress through multi-step gestures by handedness (core.sequences)
+        self.sequences = {}
+        # This frame's gesture scores (core.scores) and the best of them
+        self.scores = None
+        self.top_gesture = None
+        self.top_score = 0.0
+        # Last fully evaluated HandFeatures, reused while the hand holds still
+        self.features = None
+        self.features_label = None
+        self.features_time = 0.0
+
+
+class Track:
+    """A hand followed across frames under a persistent ID."""
+
+    def __init__(self, track_id, history, state):
+        self.id = track_id
+        self.wrist_x = self.wrist_y = 0.0
+        self.palm_x = self.palm_y = 0.0
+        self.missed = 0
+        self.state = state
+        # Ring buffer of recent handedness votes, 1 for Right and 0 for Left
+        self.votes = [0] * history
+        self.vote_count = 0
+        self.right_votes = 0
+
+    def observe(self, landmarks, label):
+        self.wrist_x, self.wrist_y, self.palm_x, self.palm_y = hand_position(landmarks)
+        self.missed = 0
+
+        vote = 1 if label == "Right" else 0
+        slot = self.vote_count % len(self.votes)
+        if self.vote_count >= len(self.votes):
+            self.right_votes -= self.votes[slot]
+        self.votes[slot] = vote
+        self.right_votes += vote
+        self.vote_count += 1
+
+    @property
+    def label(self):
+        """Majority handedness over the recent label history."""
+        seen = min(self.vote_count, len(self.votes))
+        return "Right" if self.right_votes * 2 >= seen else "Left"
+
+
+def hand_position(landmarks):
+    """Return the wrist and palm-centre x/y of a (21, 3) landmark array as floats."""
+    palm_x = palm_y = 0.0
+    for index in PALM_LANDMARKS:
+        palm_x += float(landmarks[index, 0])
+        palm_y += float(landmarks[index, 1])
+    count = len(PALM_LANDMARKS)
+    return (float(landmarks[WRIST, 0]), float(landmarks[WRIST, 1]),
+            palm_x / count, palm_y / count)
+
+
+class HandTracker:
+    """Assign persistent IDs to detected hands across frames.
+
+    Each frame's hands are matched to existing tracks by wrist and palm-centre
+    distance, with a penalty when the detected handedness disagrees with the
+    track's label history. Handedness flicker therefore no longer resets
+    per-hand state, and a hand that drops out for a few frames keeps its ID.
+    """
+
+    def __init__(self, max_distance=0.25, label_penalty=0.05, history=15, max_missed=5,
+                 state_factory=HandState):
+        self.max_distance = max_distance
+        self.label_penalty = label_penalty
+        self.history = history
+        self.max_missed = max_missed
+        self.state_factory = state_factory
+        self.tracks = []
+        self.next_id = 0
+
+    def reset(self):
+        self.tracks = []
+
+    def cost(self, track, landmarks, label):
+        wrist_x, wrist_y, palm_x, palm_y = hand_position(landmarks)
+        distance = (math.hypot(wrist_x - track.wrist_x, wrist_y - track.wrist_y) +
+                    math.hypot(palm_x - track.palm_x, palm_y - track.palm_y)) / 2
+        if distance > self.max_distance:
+            return math.inf
+        if label != track.label:
+            distance += self.label_penalty
+        return distance
+
+    def update(self, landmarks, labels):
+        """Match this frame's hands to tracks.
+
+        ``landmarks`` is a (hands, 21, 3) array and ``labels`` the detected
+        handedness of each hand. Returns the matched track for every hand,
+        in detection order.
+        """
+        count = len(labels)
+        matched = [None] * count
+        if count == 2 and len(self.tracks) <= 2:
+            self.match_pair(landmarks, labels, matched)
+        else:
+            self.match_greedy(landmarks, labels, matched)
+
+        for track in self.tracks:
+            track.missed += 1
+        for index in range(count):
+            track = matched[index]
+            if track is None:
+                track = Track(self.next_id, self.history, self.state_factory())
+                self.next_id += 1
+                self.tracks.append(track)
+                matched[index] = track
+            track.observe(landmarks[index], labels[index])
+
+        self.tracks = [track for track in self.tracks if track.missed <= self.max_missed]
+        return matched
+
+    def match_pair(self, landmarks, labels, matched):
+        """Exhaustive two-hand matching using scalar costs only."""
+        if not self.tracks:
+            return
+        first = self.tracks[0]
+        second = self.tracks[1] if len(self.tracks) > 1 else None
+
+        straight = self.cost(first, landmarks[0], labels[0])
+        crossed = self.cost(first, landmarks[1], labels[1])
+        if second is not None:
+            straight += self.cost(second, landmarks[1], labels[1])
+            crossed += self.cost(second, landmarks[0], labels[0])
+
+        if straight == math.inf and crossed == math.inf:
+            # At most one pairing is viable, fall back to the general matcher
+            self.match_greedy(landmarks, labels, matched)
+        elif straight <= crossed:
+            matched[0], matched[1] = first, second
+        else:
+            matched[0], matched[1] = second, first
+
+    def match_greedy(self, landmarks, labels, matched):
+        """Repeatedly take the cheapest remaining hand/track pair."""
+        costs = [(self.cost(track, landmarks[index], labels[index]), index, track)
+                 for index in range(len(labels)) for track in self.tracks]
+        costs.sort(key=lambda item: item[0])
+        used = set()
+        for cost, index, track in costs:
+            if cost == math.inf:
+                break
+            if matched[index] is None and track.id not in used:
+                matched[index] = track
+                used.add(track.id)
+
+    def active_ids(self):
+        return [track.id for track in self.tracks]
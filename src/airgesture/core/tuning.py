@@ -0,0 +1,209 @@
+"""Search a gesture profile's thresholds against a labelled landmark corpus.
+
+A ``ThresholdSweep`` evaluates a rule-based classifier (``GestureClassifier``
+or ``RuleSet``) on every labelled hand of a corpus for many values of the
+profile settings its distance tests name, such as ``pinch_threshold``. The
+tests that do not depend on those settings are evaluated once and packed
+into a partial code; each candidate only re-compares the tuned distances,
+measured once, against its thresholds and looks the codes up in the
+classifier's table. The last setting is swept as one (hands, values) array,
+so a candidate costs a few array operations however many hands there are.
+
+Metrics follow ``core.evaluation``: recall is averaged over the labelled
+gestures, and a false activation is a hand switching to a gesture it is not
+labelled with, counted once per switch, per minute of recording.
+
+``tune_smoothing`` picks the cursor smoothing factor: the exponential
+smoothing whose cursor stays closest to a centred moving average of the
+fingertip, the path without jitter and without the lag a live filter adds.
+"""
+import itertools
+
+import numpy as np
+
+from src.airgesture.core.evaluation import NONE
+from src.airgesture.core.landmarks import INDEX_TIP
+from src.airgesture.core.profiles import ProfileError, evaluate_tests
+from src.airgesture.core.session import HANDEDNESS_CODES
+
+
+class ThresholdSweep:
+    """A classifier's labelled-corpus metrics as a function of its thresholds.
+
+    ``landmarks`` (N, 21, 3) and ``handedness`` (N,) are the labelled hands,
+    ``truth`` their (N,) gesture names, ``previous`` the index of the same
+    hand slot in the frame before (-1 for none) and ``minutes`` the
+    recording time they cover.
+    """
+
+    def __init__(self, classifier, settings, landmarks, handedness, truth, previous, minutes):
+        if not hasattr(classifier, 'lookup_table'):
+            raise ProfileError("Only rule-based profiles can be tuned, not trained models")
+        tables = [classifier.lookup_table(hand) for hand in HANDEDNESS_CODES]
+        if any(table is None for table in tables):
+            raise ProfileError("The profile has too many tests for a lookup table")
+        self.tables = np.stack(tables)
+        self.settings = list(settings)
+
+        tests = classifier.tests
+        columns = {}
+        for i, (test, setting) in enumerate(zip(tests, classifier.test_settings)):
+            if setting in self.settings and test[0] == 'distance':
+                columns.setdefault(setting, []).append(i)
+        missing = [setting for setting in self.settings if setting not in columns]
+        if missing:
+            raise ProfileError(f"The profile has no distance test using {', '.join(missing)}")
+
+        landmarks = np.asarray(landmarks, dtype=np.float32)
+        weights = 1 << np.arange(len(tests), dtype=np.int64)
+        fixed = [i for i in range(len(tests)) if not any(i in c for c in columns.values())]
+        bits = evaluate_tests([tests[i] for i in fixed], landmarks)
+        self.base = (bits @ weights[fixed]).astype(np.int32)
+        # Per tuned setting: squared distances, "below" flags and code weights
+        self.measured = []
+        for setting in self.settings:
+            bits = columns[setting]
+            offsets = [landmarks[:, tests[i][1]] - landmarks[:, tests[i][2]] for i in bits]
+            squared = np.stack([(offset * offset).sum(axis=1) for offset in offsets], axis=1)
+            below = np.array([tests[i][4] for i in bits])
+            self.measured.append((squared, below, weights[bits]))
+        # Current value of each setting, from its first test
+        self.current = {setting: float(np.sqrt(tests[columns[setting][0]][3]))
+                        for setting in self.settings}
+
+        self.hands = np.clip(np.asarray(handedness, dtype=np.intp), 0, len(tables) - 1)
+        self.previous = np.asarray(previous, dtype=np.intp)
+        self.minutes = minutes
+        # Gesture numbers as the table holds them; labels the classifier
+        # cannot produce get numbers past its own and are never predicted
+        names = [NONE] + list(classifier.names)
+        truth = np.asarray(truth).astype(str)
+        extra = sorted(set(truth.tolist()) - set(names))
+        self.names = names + extra
+        index = {name: number for number, name in enumerate(self.names)}
+        self.truth = np.array([index[name] for name in truth.tolist()], dtype=np.intp)
+        self.support = np.bincount(self.truth, minlength=len(self.names))
+        self.gestures = np.flatnonzero(self.support[1:]) + 1
+
+    def codes(self, setting, values):
+        """(N, values) code contributions of one tuned setting."""
+        squared, below, weights = self.measured[self.settings.index(setting)]
+        limits = np.asarray(values, dtype=np.float32) ** 2
+        codes = np.zeros((len(squared), len(limits)), dtype=np.int32)
+        for t in range(squared.shape[1]):
+            codes += ((squared[:, t, None] < limits) == below[t]) * np.int32(weights[t])
+        return codes
+
+    def metrics(self, predicted):
+        """Recall, accuracy and false activations per minute of (N, V) predictions."""
+        hits = predicted == self.truth[:, None]
+        recall = np.zeros(predicted.shape[1])
+        for gesture in self.gestures:
+            recall += hits[self.truth == gesture].sum(axis=0) / self.support[gesture]
+        recall /= max(len(self.gestures), 1)
+
+        before = np.where(self.previous[:, None] >= 0, predicted[self.previous], 0)
+        onsets = (predicted != 0) & (predicted != before)
+        false = (onsets & ~hits).sum(axis=0)
+        return {
+            'recall': recall,
+            'accuracy': hits.mean(axis=0) if len(hits) else np.zeros(predicted.shape[1]),
+            'false_activations': false,
+            'false_activations_per_minute': false / self.minutes if self.minutes else false * 0.0,
+        }
+
+    def evaluate(self, grid):
+        """Metrics of every combination of ``grid`` {setting: values}, as a list
+        of (values dict, metrics dict) in product order."""
+        *outer, last = self.settings
+        last_codes = self.codes(last, grid[last])
+        outer_codes = {setting: self.codes(setting, grid[setting]) for setting in outer}
+        results = []
+        for combination in itertools.product(*[range(len(grid[setting])) for setting in outer]):
+            codes = self.base + sum(outer_codes[setting][:, i]
+                                    for setting, i in zip(outer, combination))
+            predicted = self.tables[self.hands[:, None], codes[:, None] + last_codes]
+            metrics = self.metrics(predicted)
+            for j, value in enumerate(grid[last]):
+                values = {setting: float(grid[setting][i]) for setting, i in zip(outer, combination)}
+                values[last] = float(value)
+                results.append((values, {key: float(metric[j]) for key, metric in metrics.items()}))
+        return results
+
+
+def select_candidate(results, max_false_activations):
+    """The candidate with the highest recall whose false activations per minute
+    stay within the target, and whether any did; otherwise the one with the
+    fewest false activations."""
+    feasible = [result for result in results
+                if result[1]['false_activations_per_minute'] <= max_false_activations]
+    if feasible:
+        return max(feasible, key=lambda result: (result[1]['recall'],
+                                                 -result[1]['false_activations_per_minute'])), True
+    return min(results, key=lambda result: (result[1]['false_activations_per_minute'],
+                                            -result[1]['recall'])), False
+
+
+def refine_grid(grid, values):
+    """A grid of the same size around ``values``, spanning two steps of ``grid``."""
+    refined = {}
+    for setting, points in grid.items():
+        step = (points[-1] - points[0]) / max(len(points) - 1, 1)
+        low = max(values[setting] - step, 1e-4)
+        refined[setting] = np.linspace(low, values[setting] + step, len(points))
+    return refined
+
+
+def cursor_tracks(landmarks, handedness, truth, gesture, hand):
+    """Index fingertip (x, y) tracks of one hand slot while labelled ``gesture``.
+
+    ``landmarks`` is (frames, hands, 21, 3), ``handedness`` and ``truth``
+    (frames, hands); returns a list of (T, 2) arrays, one per unbroken run.
+    """
+    tracks = []
+    selected = (truth == gesture) & (handedness == HANDEDNESS_CODES[hand])
+    for slot in range(selected.shape[1]):
+        edges = np.diff(np.concatenate([[0], selected[:, slot].astype(np.int8), [0]]))
+        for start, stop in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)):
+            tracks.append(landmarks[start:stop, slot, INDEX_TIP, :2].astype(np.float64))
+    return tracks
+
+
+def tune_smoothing(tracks, candidates, window=5):
+    """(best factor, RMS error per candidate) of exponential cursor smoothing.
+
+    Each candidate ``a`` smooths a track as the detector does,
+    ``s = a * x + (1 - a) * s``, starting at the first point, and is scored
+    by its distance to the centred ``window``-frame moving average once the
+    smoothing has settled. Tracks shorter than two windows are skipped.
+    """
+    tracks = [track for track in tracks if len(track) >= 2 * window]
+    candidates = np.asarray(candidates, dtype=np.float64)
+    if not tracks:
+        return None, None
+    length = max(len(track) for track in tracks)
+    points = np.full((length, len(tracks), 2), np.nan)
+    for k, track in enumerate(tracks):
+        points[:len(track), k] = track
+
+    # Centred moving average; NaN past the ends of a track
+    cumulative = np.nancumsum(np.concatenate([np.zeros((1, len(tracks), 2)), points]), axis=0)
+    half = window // 2
+    reference = np.full_like(points, np.nan)
+    reference[half:length - half] = (cumulative[window:] - cumulative[:-window]) / window
+    ends = np.array([len(track) for track in tracks])
+    frames = np.arange(length)[:, None]
+    reference[(frames < window) | (frames >= ends - half)] = np.nan
+
+    alpha = candidates[:, None, None]
+    smoothed = np.repeat(points[0][None], len(candidates), axis=0)
+    error = np.zeros(len(candidates))
+    count = 0
+    for t in range(1, length):
+        smoothed = alpha * points[t] + (1 - alpha) * smoothed
+        valid = ~np.isnan(reference[t, :, 0])
+        if valid.any():
+            error += ((smoothed[:, valid] - reference[t, valid]) ** 2).sum(axis=(1, 2))
+            count += int(valid.sum())
+    rms = np.sqrt(error / max(count, 1))
+    return float(candidates[np.argmin(rms)]), rms
@@ -0,0 +1,119 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceWatchdog:
+    """Run hand tracking on a worker thread under a per-frame deadline.
+
+    A frame whose inference misses the deadline is dropped and ``process``
+    returns None, so the UI timer never blocks for longer than the deadline.
+    While that call is still stuck, later frames are dropped immediately.
+    If the stall lasts longer than ``restart_after`` seconds the backend is
+    abandoned and a fresh one is built with ``factory`` on a new worker.
+    """
+
+    def __init__(self, factory, hands, deadline=0.1, restart_after=2.0):
+        self.factory = factory
+        self.hands = hands
+        self.deadline = deadline
+        self.restart_after = restart_after
+
+        self.executor = self.create_executor()
+        self.pending = None
+        self.stall_started = None
+        self.stats = {
+            'frames': 0,
+            'stalls': 0,
+            'dropped': 0,
+            'restarts': 0,
+            'worst_latency': 0.0,
+        }
+
+    def create_executor(self):
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix="Inference")
+
+    def process(self, frame_rgb):
+        """Return the tracking results for ``frame_rgb``, or None if the frame was dropped."""
+        self.stats['frames'] += 1
+        if not self.check_pending():
+            self.stats['dropped'] += 1
+            return None
+
+        submitted = time.perf_counter()
+        future = self.executor.submit(self.timed_process, self.hands, frame_rgb)
+        try:
+            return future.result(timeout=self.deadline)
+        except TimeoutError:
+            self.stats['stalls'] += 1
+            self.stats['dropped'] += 1
+            self.pending = future
+            self.stall_started = submitted
+            return None
+
+    def timed_process(self, hands, frame_rgb):
+        start = time.perf_counter()
+        try:
+            return hands.process(frame_rgb)
+        finally:
+            self.stats['worst_latency'] = max(self.stats['worst_latency'],
+                                              time.perf_counter() - start)
+
+    def check_pending(self):
+        """Return True when the worker is free to take a new frame."""
+        if self.pending is not None:
+            if not self.pending.done():
+                stalled_for = time.perf_counter() - self.stall_started
+                self.stats['worst_latency'] = max(self.stats['worst_latency'], stalled_for)
+                if stalled_for > self.restart_after:
+                    self.restart()
+                return False
+            error = self.pending.exception()
+            if error is not None:
+                logger.error(f"Inference backend failed: {str(error)}")
+            self.pending = None
+
+        if self.hands is None:
+            # Rebuilding the backend failed, try again after another interval
+            if time.perf_counter() - self.stall_started > self.restart_after:
+                self.restart()
+            return False
+        self.stall_started = None
+        return True
+
+    def restart(self):
+        """Abandon the stuck backend and build a new one on a fresh worker."""
+        self.stats['restarts'] += 1
+        logger.warning(f"Inference stalled, restarting backend (restart {self.stats['restarts']})")
+        self.executor.shutdown(wait=False)
+        self.executor = self.create_executor()
+        self.hands = None
+        self.pending = self.executor.submit(self.rebuild)
+        self.stall_started = time.perf_counter()
+
+    def rebuild(self):
+        self.hands = self.factory()
+
+    def reload(self):
+        """Replace the backend with a fresh one from ``factory``, e.g. after its
+        settings changed. Frames are dropped until the new one is ready."""
+        hands, self.hands = self.hands, None
+        self.pending = self.executor.submit(self.replace, hands)
+        self.stall_started = time.perf_counter()
+
+    def replace(self, hands):
+        if hands is not None:
+            hands.close()
+        self.hands = self.factory()
+
+    def close(self):
+        """Stop the worker and release the backend if it is not stuck."""
+        self.executor.shutdown(wait=False)
+        if self.pending is None and self.hands is not None:
+            self.hands.close()
+        logger.info("Inference watchdog: %d frames, %d stalls, %d dropped, %d restarts, "
+                    "worst latency %.1f ms", self.stats['frames'], self.stats['stalls'],
+                    self.stats['dropped'], self.stats['restarts'],
+                    self.stats['worst_latency'] * 1000)
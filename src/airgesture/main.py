@@ -5,10 +5,15 @@ import os
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, project_root)
 
+import logging
 from PyQt5.QtWidgets import QApplication
 from src.airgesture.ui.main_window import AirGestureApp
+from src.airgesture.core.runtime import configure_process
+from src.airgesture.utils.config import LOGGING_CONFIG, RUNTIME_CONFIG
 
 def main():
+    logging.basicConfig(**LOGGING_CONFIG)
+    configure_process(RUNTIME_CONFIG)
     app = QApplication(sys.argv)
     window = AirGestureApp()
     window.show()
@@ -0,0 +1,144 @@
+"""Benchmark the gesture pipeline headlessly on scripted hands.
+
+The detector runs on a blank camera, a ``ScriptedHands`` backend with a
+configurable synthetic inference latency, and recording actions instead of
+the real mouse and keyboard. Every stage after inference (tracking,
+smoothing, motion gestures, drawing, gesture classification and dispatch,
+and optionally the Qt frame conversion) is timed separately, so its own
+cost can be measured without a camera, a GPU or MediaPipe inference in the
+loop.
+
+    python -m src.airgesture.tools.bench_pipeline
+    python -m src.airgesture.tools.bench_pipeline --script two_hands --latency 0.015 --ui
+    python -m src.airgesture.tools.bench_pipeline --script "0-2 right spread; 1 right pinch"
+    python -m src.airgesture.tools.bench_pipeline --profile Cursor
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from src.airgesture.core.actions import RecordingActions
+from src.airgesture.core.gesture_detector import GestureDetector
+from src.airgesture.core.scripted_hands import SCRIPTS, BlankCamera, ScriptedHands
+
+
+def timed(function, samples):
+    """Wrap ``function`` so each call's duration is appended to ``samples``."""
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - start)
+    return wrapper
+
+
+def instrument(detector):
+    """Time the detector's pipeline stages; returns {stage: samples}."""
+    stages = {name: [] for name in ('frame', 'inference', 'tracking', 'smoothing', 'drawing',
+                                    'motion', 'right hand', 'left hand', 'cursor')}
+    detector.process_frame = timed(detector.process_frame, stages['frame'])
+    detector.watchdog.process = timed(detector.watchdog.process, stages['inference'])
+    detector.tracker.update = timed(detector.tracker.update, stages['tracking'])
+    detector.filter_landmarks = timed(detector.filter_landmarks, stages['smoothing'])
+    detector.update_predictor = timed(detector.update_predictor, stages['smoothing'])
+    detector.update_motion = timed(detector.update_motion, stages['motion'])
+    detector.draw_landmarks = timed(detector.draw_landmarks, stages['drawing'])
+    detector.process_right_hand = timed(detector.process_right_hand, stages['right hand'])
+    detector.process_left_hand = timed(detector.process_left_hand, stages['left hand'])
+    detector.update_cursor_position = timed(detector.update_cursor_position, stages['cursor'])
+    return stages
+
+
+def make_ui_stage(samples):
+    """Return the main window's frame-to-pixmap conversion, timed, on an offscreen Qt."""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtCore import QSize, Qt
+    from PyQt5.QtGui import QImage, QPixmap
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([])
+    label_size = QSize(600, 350)
+
+    def show(frame):
+        height, width, channel = frame.shape
+        q_image = QImage(frame.data, width, height, 3 * width, QImage.Format_RGB888)
+        pixmap = QPixmap.fromImage(q_image)
+        return pixmap.scaled(label_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+    show.app = app
+    return timed(show, samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the gesture pipeline on scripted hands.")
+    parser.add_argument('--script', default='two_hands',
+                        help=f"script text or one of: {', '.join(SCRIPTS)}")
+    parser.add_argument('--frames', type=int, default=1000, help="frames to run")
+    parser.add_argument('--fps', type=float, default=30.0, help="virtual frame rate of the script")
+    parser.add_argument('--latency', type=float, default=0.0, help="synthetic inference latency (s)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="latency standard deviation (s)")
+    parser.add_argument('--noise', type=float, default=0.0, help="landmark noise (normalized units)")
+    parser.add_argument('--size', default='640x480', help="camera frame size")
+    parser.add_argument('--ui', action='store_true', help="include the Qt frame conversion")
+    parser.add_argument('--profile', help="profile of gesture_profiles.json to run (default: configured)")
+    args = parser.parse_args()
+
+    script = SCRIPTS.get(args.script, args.script)
+    width, height = (int(v) for v in args.size.split('x'))
+
+    def factory():
+        return ScriptedHands(script, args.fps, args.latency, args.jitter, args.noise, loop=True)
+
+    actions = RecordingActions()
+    detector = GestureDetector(camera=BlankCamera((width, height)), hands_factory=factory,
+                               actions=actions)
+    detector.warmup.finished.wait()
+    if not detector.is_ready():
+        raise SystemExit(f"Backend failed to start: {detector.warmup.error}")
+    if args.profile:
+        if not detector.change_profile(args.profile):
+            raise SystemExit(f"Unknown profile {args.profile!r}")
+        if detector.watchdog.pending is not None:
+            # Wait for the backend rebuilt for the profile's hand count
+            detector.watchdog.pending.result()
+    detector.watchdog.hands.reset()
+    detector.toggle()
+
+    stages = instrument(detector)
+    show = None
+    if args.ui:
+        stages['ui'] = []
+        show = make_ui_stage(stages['ui'])
+
+    start = time.perf_counter()
+    for _ in range(args.frames):
+        frame = detector.process_frame()
+        if show is not None and frame is not None:
+            show(frame)
+    elapsed = time.perf_counter() - start
+    watchdog_stats = dict(detector.watchdog.stats)
+    detector.cleanup()
+
+    frame_total = sum(stages['frame']) + sum(stages.get('ui', []))
+    print(f"{args.frames} frames in {elapsed:.2f} s: {args.frames / elapsed:.1f} fps, "
+          f"synthetic latency {args.latency * 1000:.1f} ms")
+    print(f"{'stage':<12} {'calls':>6} {'mean ms':>8} {'p50 ms':>7} {'p99 ms':>7} {'share':>6}")
+    for name, samples in stages.items():
+        if not samples:
+            continue
+        values = np.array(samples) * 1000
+        share = sum(samples) / frame_total * 100 if frame_total else 0.0
+        print(f"{name:<12} {len(values):>6} {values.mean():>8.3f} {np.percentile(values, 50):>7.3f} "
+              f"{np.percentile(values, 99):>7.3f} {share:>5.1f}%")
+    print("Cursor time is included in 'right hand'; 'frame' includes every stage but 'ui'.")
+    print(f"Dropped frames: {watchdog_stats['dropped']}, stalls: {watchdog_stats['stalls']}")
+    print(f"Gesture features: {detector.feature_stats.summary()}")
+    print(f"Gesture classification: {detector.classification_cache.summary()}")
+    print("Actions: " + ", ".join(f"{name} x{count}" for name, count in sorted(actions.counts.items())))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+"""Microbenchmark per-hand gesture classification: protobuf vs. array predicates.
+
+"protobuf" is the previous implementation: every predicate looks landmarks
+up on the MediaPipe landmark list through ``HandLandmark`` attributes and
+builds temporary ``np.array`` objects for distances. "array" runs the
+predicates of ``core/predicates.py`` on the hand's (21, 3) float32 array,
+through a fresh per-hand ``HandFeatures`` cache as the detector does.
+"extract" is the one-off conversion to that array, which the detector
+already does for tracking and smoothing. Both sides evaluate the predicates
+the detector checks for a right and a left hand, on the scripted poses, and
+the results are checked to agree.
+
+A second table shows what the fingertip distance units cost per hand
+(palm-length normalization adds one distance and a scale factor), and how
+many pose labels survive the hand appearing smaller or larger, as when the
+user stands farther from or nearer to the camera.
+
+    python -m src.airgesture.tools.bench_predicates
+    python -m src.airgesture.tools.bench_predicates --repeat 20000
+"""
+import argparse
+import enum
+import time
+
+import numpy as np
+
+from src.airgesture.core import landmarks as L
+from src.airgesture.core import predicates
+from src.airgesture.core.features import DISTANCE_UNITS, FeatureStats, HandFeatures
+from src.airgesture.core.landmarks import build_results, results_to_array
+from src.airgesture.core.scripted_hands import POSES, make_pose
+from src.airgesture.utils.config import GESTURE_THRESHOLDS
+
+try:
+    from mediapipe.python.solutions.hands import HandLandmark
+except ImportError:
+    HandLandmark = enum.IntEnum('HandLandmark', {
+        name: getattr(L, name.replace('_FINGER', ''))
+        for name in ('WRIST', 'THUMB_IP', 'THUMB_TIP', 'INDEX_FINGER_PIP', 'INDEX_FINGER_TIP',
+                     'MIDDLE_FINGER_PIP', 'MIDDLE_FINGER_TIP', 'RING_FINGER_PIP',
+                     'RING_FINGER_TIP', 'PINKY_PIP', 'PINKY_TIP')})
+
+
+class ProtobufPredicates:
+    """The detector's previous predicates, kept verbatim as the baseline."""
+
+    mp_hands = type('mp_hands', (), {'HandLandmark': HandLandmark})
+
+    def is_two_fingers_up(self, hand_landmarks):
+        index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP].y
+        index_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_PIP].y
+        middle_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP].y
+        middle_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_PIP].y
+        ring_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.RING_FINGER_TIP].y
+        pinky_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_TIP].y
+        return (index_tip < index_pip and middle_tip < middle_pip and
+                ring_tip > middle_tip and pinky_tip > middle_tip)
+
+    def tip_distance(self, hand_landmarks, first, second):
+        a = hand_landmarks.landmark[first]
+        b = hand_landmarks.landmark[second]
+        return np.linalg.norm(np.array([a.x, a.y, a.z]) - np.array([b.x, b.y, b.z]))
+
+    def is_pinch(self, hand_landmarks):
+        return self.tip_distance(hand_landmarks, self.mp_hands.HandLandmark.INDEX_FINGER_TIP,
+                                 self.mp_hands.HandLandmark.THUMB_TIP) < GESTURE_THRESHOLDS['pinch_distance']
+
+    def is_middle_thumb_tap(self, hand_landmarks):
+        return self.tip_distance(hand_landmarks, self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP,
+                                 self.mp_hands.HandLandmark.THUMB_TIP) < GESTURE_THRESHOLDS['pinch_distance']
+
+    def is_fingers_apart(self, hand_landmarks):
+        return self.tip_distance(hand_landmarks, self.mp_hands.HandLandmark.INDEX_FINGER_TIP,
+                                 self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP) > GESTURE_THRESHOLDS['fingers_apart_distance']
+
+    def is_index_middle_fingers_together(self, hand_landmarks):
+        return self.tip_distance(hand_landmarks, self.mp_hands.HandLandmark.INDEX_FINGER_TIP,
+                                 self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP) < GESTURE_THRESHOLDS['fingers_together_distance']
+
+    def finger_tips(self):
+        return [self.mp_hands.HandLandmark.INDEX_FINGER_TIP, self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP,
+                self.mp_hands.HandLandmark.RING_FINGER_TIP, self.mp_hands.HandLandmark.PINKY_TIP]
+
+    def is_five_fingers_up(self, hand_landmarks):
+        return all(hand_landmarks.landmark[finger].y < hand_landmarks.landmark[finger - 2].y
+                   for finger in self.finger_tips())
+
+    def is_five_fingers_down(self, hand_landmarks):
+        return all(hand_landmarks.landmark[finger].y > hand_landmarks.landmark[finger - 2].y
+                   for finger in self.finger_tips())
+
+    def is_full_palm_open(self, hand_landmarks):
+        return self.is_five_fingers_up(hand_landmarks)
+
+    def is_pinky_finger_up(self, hand_landmarks):
+        return (hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_TIP].y <
+                hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_PIP].y)
+
+    def is_pinky_finger_down(self, hand_landmarks):
+        lm = hand_landmarks.landmark
+        marks = self.mp_hands.HandLandmark
+        return (lm[marks.PINKY_TIP].y > lm[marks.PINKY_PIP].y and
+                lm[marks.INDEX_FINGER_TIP].y > lm[marks.INDEX_FINGER_PIP].y and
+                lm[marks.MIDDLE_FINGER_TIP].y > lm[marks.MIDDLE_FINGER_PIP].y and
+                lm[marks.RING_FINGER_TIP].y > lm[marks.RING_FINGER_PIP].y and
+                lm[marks.THUMB_TIP].y > lm[marks.THUMB_IP].y)
+
+    def is_index_finger_up(self, hand_landmarks):
+        return (hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP].y <
+                hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_PIP].y)
+
+
+# Predicates evaluated per hand, in the order the detector checks them
+PREDICATE_NAMES = ('is_fingers_apart', 'is_two_fingers_up', 'is_pinch', 'is_middle_thumb_tap',
+                   'is_pinky_finger_up', 'is_pinky_finger_down', 'is_index_middle_fingers_together',
+                   'is_five_fingers_down', 'is_full_palm_open', 'is_index_finger_up')
+
+
+def classify_protobuf(checks, results):
+    return [[check(hand) for check in checks] for hand in results.multi_hand_landmarks]
+
+
+def classify_array(checks, landmarks, stats=None, units='image', world=None):
+    if world is None:
+        return [[check(features) for check in checks]
+                for features in (HandFeatures(hand, stats, units) for hand in landmarks)]
+    return [[check(features) for check in checks]
+            for features in (HandFeatures(hand, stats, units, hand_world)
+                             for hand, hand_world in zip(landmarks, world))]
+
+
+def measure(function, repeat, *args):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(*args)
+    return (time.perf_counter() - start) / repeat
+
+
+# Scripted hand sizes standing in for users nearer to and farther from the camera
+HAND_SCALES = (0.04, 0.06, 0.1, 0.16, 0.24)
+REFERENCE_SCALE = 0.1
+
+
+def pose_labels(units, scale):
+    """Gesture label of every scripted pose as a right and a left hand."""
+    return [predicates.hand_gesture(HandFeatures(make_pose(pose, label, scale=scale), units=units),
+                                    label)
+            for pose in POSES for label in ("Right", "Left")]
+
+
+def compare_units(array_checks, repeat):
+    """Per-hand cost of each distance unit, and label stability across hand sizes."""
+    landmarks = np.stack([make_pose(pose) for pose in POSES])
+    # Only the cost matters here, so the image landmarks stand in for world ones
+    world = landmarks - landmarks.mean(axis=1, keepdims=True)
+    print(f"\n{'units':<8} {'array us':>9} {'added us':>9}   "
+          + "  ".join(f"{'x%.1f' % (scale / REFERENCE_SCALE):>5}" for scale in HAND_SCALES))
+    baseline = None
+    for units in DISTANCE_UNITS:
+        cost = measure(classify_array, max(1, repeat // len(POSES)), array_checks, landmarks,
+                       None, units, world if units == 'world' else None) / len(POSES) * 1e6
+        baseline = cost if baseline is None else baseline
+        reference = pose_labels(units, REFERENCE_SCALE)
+        stable = []
+        for scale in HAND_SCALES:
+            labels = pose_labels(units, scale)
+            stable.append(sum(a == b for a, b in zip(labels, reference)) / len(reference) * 100)
+        print(f"{units:<8} {cost:>9.2f} {cost - baseline:>+9.2f}   "
+              + "  ".join(f"{share:>4.0f}%" for share in stable))
+    print("Columns x0.4 ... x2.4: share of pose labels unchanged at that hand size "
+          "(world units without world landmarks use the palm length)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare protobuf and array gesture predicates.")
+    parser.add_argument('--repeat', type=int, default=5000, help="classifications per pose")
+    args = parser.parse_args()
+
+    baseline = ProtobufPredicates()
+    protobuf_checks = [getattr(baseline, name) for name in PREDICATE_NAMES]
+    array_checks = [getattr(predicates, name) for name in PREDICATE_NAMES]
+
+    print(f"{'pose':<16} {'protobuf us':>11} {'array us':>9} {'extract us':>10} {'speedup':>8}")
+    totals = np.zeros(3)
+    for pose in POSES:
+        results = build_results(make_pose(pose)[np.newaxis], ["Right"])
+        landmarks = results_to_array(results)
+        expected = classify_protobuf(protobuf_checks, results)
+        if classify_array(array_checks, landmarks) != expected:
+            raise SystemExit(f"Array predicates disagree with the baseline on pose {pose!r}")
+
+        timings = np.array([measure(classify_protobuf, args.repeat, protobuf_checks, results),
+                            measure(classify_array, args.repeat, array_checks, landmarks),
+                            measure(results_to_array, args.repeat, results)])
+        totals += timings
+        before, after, extract = timings * 1e6
+        print(f"{pose:<16} {before:>11.2f} {after:>9.2f} {extract:>10.2f} {before / after:>7.1f}x")
+    before, after, extract = totals / len(POSES) * 1e6
+    print(f"{'mean':<16} {before:>11.2f} {after:>9.2f} {extract:>10.2f} {before / after:>7.1f}x")
+    print(f"Including extraction: {before / (after + extract):.1f}x")
+
+    stats = FeatureStats()
+    classify_array(array_checks, results_to_array(results), stats)
+    print(f"Features per hand: {stats.summary()}")
+
+    compare_units(array_checks, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
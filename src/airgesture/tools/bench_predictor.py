@@ -0,0 +1,103 @@
+"""Replay benchmark for the landmark predictor.
+
+Replays a recorded landmark session (or a synthetic one) as if inference
+ran every ``interval`` frames and took ``latency`` seconds, and compares the
+cursor error of showing the last available landmarks against showing
+landmarks extrapolated by :class:`LandmarkPredictor`.
+
+    python -m src.airgesture.tools.bench_predictor --session clip.npz
+    python -m src.airgesture.tools.bench_predictor --latency 20 30 40 --interval 1 2 3
+"""
+import argparse
+
+import numpy as np
+
+from src.airgesture.core.landmarks import INDEX_TIP
+from src.airgesture.core.predictor import LandmarkPredictor
+from src.airgesture.core.session import load_session
+
+SCREEN_SIZE = np.array([1920, 1080], dtype=np.float32)
+
+
+def synthetic_track(duration=20.0, fps=30.0, noise=0.002, seed=0):
+    """Generate a single-hand track that sweeps and circles across the frame."""
+    rng = np.random.default_rng(seed)
+    timestamps = np.arange(0.0, duration, 1.0 / fps)
+    shape = rng.normal(0.0, 0.05, (21, 3)).astype(np.float32)
+    centre = np.stack([
+        0.5 + 0.3 * np.sin(2 * np.pi * 0.25 * timestamps) * np.cos(2 * np.pi * 0.05 * timestamps),
+        0.5 + 0.2 * np.sin(2 * np.pi * 0.4 * timestamps),
+        np.zeros_like(timestamps),
+    ], axis=1).astype(np.float32)
+    landmarks = centre[:, None, :] + shape[None, :, :]
+    landmarks += rng.normal(0.0, noise, landmarks.shape).astype(np.float32)
+    return timestamps, landmarks
+
+
+def session_track(path):
+    """Return the timestamps and (N, 21, 3) landmarks of the first hand in a session."""
+    session = load_session(path)
+    landmarks = session['landmarks'][:, 0]
+    present = ~np.isnan(landmarks).any(axis=(1, 2))
+    return session['timestamps'][present], landmarks[present]
+
+
+def replay(timestamps, landmarks, latency, interval, predictor):
+    """Replay a track and return per-frame (stale error, predicted error, data age)."""
+    predictor.reset()
+    observed = np.arange(0, len(timestamps), interval)
+    ready_at = timestamps[observed] + latency
+
+    stale_errors, predicted_errors, ages = [], [], []
+    next_obs = 0
+    latest = None
+    for i, now in enumerate(timestamps):
+        while next_obs < len(observed) and ready_at[next_obs] <= now:
+            latest = observed[next_obs]
+            predictor.update(landmarks[latest][None], timestamps[latest])
+            next_obs += 1
+        if latest is None:
+            continue
+
+        truth = landmarks[i, INDEX_TIP, :2] * SCREEN_SIZE
+        stale = landmarks[latest, INDEX_TIP, :2] * SCREEN_SIZE
+        predicted = predictor.predict(now)[0, INDEX_TIP, :2] * SCREEN_SIZE
+        stale_errors.append(np.linalg.norm(stale - truth))
+        predicted_errors.append(np.linalg.norm(predicted - truth))
+        ages.append(now - timestamps[latest])
+    return np.array(stale_errors), np.array(predicted_errors), np.array(ages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark landmark prediction on a replayed session.")
+    parser.add_argument('--session', help="landmark session (.npz); a synthetic track is used if omitted")
+    parser.add_argument('--latency', type=float, nargs='+', default=[20.0, 30.0, 40.0],
+                        help="inference latencies to simulate, in ms")
+    parser.add_argument('--interval', type=int, nargs='+', default=[1, 2, 3],
+                        help="run inference every N frames")
+    parser.add_argument('--alpha', type=float, default=0.8)
+    parser.add_argument('--beta', type=float, default=0.5)
+    parser.add_argument('--max-horizon', type=float, default=0.1, help="seconds")
+    args = parser.parse_args()
+
+    if args.session:
+        timestamps, landmarks = session_track(args.session)
+    else:
+        timestamps, landmarks = synthetic_track()
+    predictor = LandmarkPredictor(args.alpha, args.beta, args.max_horizon)
+
+    print(f"{len(timestamps)} frames, index fingertip error in pixels on a "
+          f"{int(SCREEN_SIZE[0])}x{int(SCREEN_SIZE[1])} screen")
+    print(f"{'latency':>8} {'interval':>8} {'age ms':>8} "
+          f"{'stale mean':>11} {'stale p95':>10} {'pred mean':>10} {'pred p95':>9}")
+    for latency in args.latency:
+        for interval in args.interval:
+            stale, predicted, ages = replay(timestamps, landmarks, latency / 1000.0,
+                                            interval, predictor)
+            print(f"{latency:>8.0f} {interval:>8d} {ages.mean() * 1000:>8.1f} "
+                  f"{stale.mean():>11.1f} {np.percentile(stale, 95):>10.1f} "
+                  f"{predicted.mean():>10.1f} {np.percentile(predicted, 95):>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""Sweep OpenCV / inference thread counts and CPU affinity on a recorded clip.
+
+Every combination runs in a fresh process, so thread pools and CPU masks
+never leak from one run into the next. Each run replays the clip through
+the same per-frame work as the app (flip, colour conversion, hand
+tracking) and reports throughput and latency percentiles.
+
+    python -m src.airgesture.tools.bench_threads clip.mp4
+    python -m src.airgesture.tools.bench_threads clip.mp4 --opencv-threads 0 1 2 \\
+        --inference-threads 1 2 4 --inference-cpus 2-3
+"""
+import argparse
+import itertools
+import multiprocessing
+import time
+
+import cv2
+import numpy as np
+
+from src.airgesture.core.runtime import (configure_opencv, inference_cpus,
+                                         parse_cpu_list, pin_current_thread)
+from src.airgesture.utils.config import GESTURE_CONFIG
+
+
+def load_clip(path, max_frames):
+    """Decode up to ``max_frames`` frames of a video into memory."""
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    if not frames:
+        raise RuntimeError(f"Could not read any frames from {path}")
+    return frames
+
+
+def run_combination(path, max_frames, warmup_frames, settings):
+    """Benchmark one settings combination; runs in its own process."""
+    import mediapipe as mp
+
+    configure_opencv(settings['opencv_threads'])
+    pin_current_thread(inference_cpus(settings))
+    hands = mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=GESTURE_CONFIG['max_num_hands'],
+        min_detection_confidence=GESTURE_CONFIG['min_detection_confidence'],
+        min_tracking_confidence=GESTURE_CONFIG['min_tracking_confidence'],
+        model_complexity=GESTURE_CONFIG['model_complexity']
+    )
+    frames = load_clip(path, max_frames)
+
+    latencies = []
+    start = None
+    for i, frame in enumerate(frames):
+        if i == warmup_frames:
+            start = time.perf_counter()
+        frame_start = time.perf_counter()
+        frame_rgb = cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB)
+        hands.process(frame_rgb)
+        if i >= warmup_frames:
+            latencies.append(time.perf_counter() - frame_start)
+    elapsed = time.perf_counter() - start if start is not None else 0.0
+    hands.close()
+    return len(latencies), elapsed, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep thread and affinity settings on a recorded clip.")
+    parser.add_argument('clip', help="video file to replay")
+    parser.add_argument('--frames', type=int, default=300, help="frames to replay per run")
+    parser.add_argument('--warmup', type=int, default=20, help="frames excluded from timing")
+    parser.add_argument('--opencv-threads', type=int, nargs='+', default=[None],
+                        help="values for cv2.setNumThreads (0 disables OpenCV threading)")
+    parser.add_argument('--inference-threads', type=int, nargs='+', default=[None],
+                        help="CPUs the inference runtime may use")
+    parser.add_argument('--inference-cpus', nargs='+', default=[None],
+                        help="CPU lists to pin inference to, e.g. 2-3 (Linux only)")
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context('spawn')
+    print(f"{'cv threads':>10} {'inf threads':>11} {'inf cpus':>9} "
+          f"{'fps':>7} {'p50 ms':>7} {'p99 ms':>7}")
+    for opencv_threads, inference_threads, cpus in itertools.product(
+            args.opencv_threads, args.inference_threads, args.inference_cpus):
+        settings = {
+            'opencv_threads': opencv_threads,
+            'inference_threads': inference_threads,
+            'affinity': {'inference': parse_cpu_list(cpus) if cpus else None},
+        }
+        with ctx.Pool(1) as pool:
+            count, elapsed, latencies = pool.apply(
+                run_combination, (args.clip, args.frames, args.warmup, settings))
+
+        latencies = np.array(latencies) * 1000
+        fps = count / elapsed if elapsed else 0.0
+        p50 = np.percentile(latencies, 50) if count else float('nan')
+        p99 = np.percentile(latencies, 99) if count else float('nan')
+        print(f"{str(opencv_threads):>10} {str(inference_threads):>11} {str(cpus):>9} "
+              f"{fps:>7.1f} {p50:>7.1f} {p99:>7.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""Check the batched classifier against the live per-hand one, and time both.
+
+Every hand is classified twice: once per hand through ``HandFeatures`` and
+``predicates.hand_gesture``, as the detector does, and once for all hands
+through ``batch.classify_batch``. Labels, predicates and features must agree
+on every hand, and the top confidence score (``core.scores``) must pick the
+same gesture wherever it is above 0.5. Hands come from a noisy corpus of the scripted poses, or from
+landmark sessions written by ``extract_landmarks``.
+
+    python -m src.airgesture.tools.check_batch
+    python -m src.airgesture.tools.check_batch --count 100000 --noise 0.03
+    python -m src.airgesture.tools.check_batch landmarks/*.npz
+    python -m src.airgesture.tools.check_batch --units image
+"""
+import argparse
+import time
+from collections import Counter
+
+import numpy as np
+
+from src.airgesture.core import predicates
+from src.airgesture.core.batch import batch_features, classify_batch
+from src.airgesture.core.features import DISTANCE_UNITS, HandFeatures
+from src.airgesture.core.scores import GestureScorer, batch_margins, top_gestures
+from src.airgesture.core.scripted_hands import pose_corpus
+from src.airgesture.core.session import HANDEDNESS_CODES, NO_HAND, load_session
+from src.airgesture.utils.config import FEATURE_CONFIG, SCORE_CONFIG
+
+FEATURE_NAMES = tuple(batch_features(np.zeros((0, 21, 3))))
+LABELS = {code: label for label, code in HANDEDNESS_CODES.items()}
+
+
+def load_hands(paths):
+    """Gather every detected hand of the sessions as (landmarks, labels)."""
+    landmarks, labels = [], []
+    for path in paths:
+        session = load_session(path)
+        present = session['handedness'] != NO_HAND
+        landmarks.append(session['landmarks'][present])
+        labels.extend(LABELS[code] for code in session['handedness'][present].tolist())
+    return np.concatenate(landmarks), labels
+
+
+def live_gestures(landmarks, labels, units):
+    """Classify hand by hand, as the detector does."""
+    return [predicates.hand_gesture(HandFeatures(hand, units=units), label)
+            for hand, label in zip(landmarks, labels)]
+
+
+def live_values(landmarks, predicate_names, units):
+    """Evaluate every predicate and feature hand by hand."""
+    values = {name: [] for name in predicate_names}
+    features = {name: [] for name in FEATURE_NAMES}
+    for hand in landmarks:
+        hand_features = HandFeatures(hand, units=units)
+        for name in values:
+            values[name].append(getattr(predicates, name)(hand_features))
+        for name in features:
+            features[name].append(getattr(hand_features, name))
+    return values, features
+
+
+def mismatches(live, batched):
+    """Count hands where the two sides differ, per label/predicate/feature."""
+    gestures, values, features = live
+    batch_gestures, batch_values, batch_features_ = batched
+    counts = {'gesture': int(np.sum(np.array(gestures) != batch_gestures))}
+    for name, column in values.items():
+        counts[name] = int(np.sum(np.array(column) != batch_values[name]))
+    for name, column in features.items():
+        expected = np.array(column)
+        if expected.dtype.kind == 'f':
+            different = ~np.isclose(expected, batch_features_[name], rtol=1e-5, atol=1e-9)
+        else:
+            different = expected != batch_features_[name]
+        counts[name] = int(np.sum(different.reshape(len(expected), -1).any(axis=1)))
+    return {name: count for name, count in counts.items() if count}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check batched gesture classification against the live path.")
+    parser.add_argument('sessions', nargs='*', help="landmark sessions (.npz); default: scripted poses")
+    parser.add_argument('--count', type=int, default=20000, help="corpus size without sessions")
+    parser.add_argument('--noise', type=float, default=0.02, help="corpus landmark noise")
+    parser.add_argument('--seed', type=int, default=0, help="corpus random seed")
+    parser.add_argument('--units', choices=DISTANCE_UNITS, default=FEATURE_CONFIG['units'],
+                        help="fingertip distance units (default: %(default)s)")
+    args = parser.parse_args()
+
+    if args.sessions:
+        landmarks, labels = load_hands(args.sessions)
+    else:
+        landmarks, labels = pose_corpus(args.count, args.noise, args.seed)
+    if not len(landmarks):
+        raise SystemExit("No hands to classify")
+
+    start = time.perf_counter()
+    gestures = live_gestures(landmarks, labels, args.units)
+    live_time = time.perf_counter() - start
+    start = time.perf_counter()
+    batched = classify_batch(landmarks, labels, args.units)
+    batch_time = time.perf_counter() - start
+    live = (gestures,) + live_values(landmarks, batched[1], args.units)
+
+    print(f"{len(landmarks)} hands: live {live_time / len(landmarks) * 1e6:.2f} us/hand, "
+          f"batch {batch_time / len(landmarks) * 1e6:.3f} us/hand "
+          f"({live_time / batch_time:.0f}x)")
+    print("Gestures: " + ", ".join(f"{name} x{count}"
+                                   for name, count in sorted(Counter(gestures).items())))
+    different = mismatches(live, batched)
+    if different:
+        raise SystemExit("Batch disagrees with the live classifier: " +
+                         ", ".join(f"{name} on {count} hands" for name, count in different.items()))
+    print("Batch and live classification agree on every hand.")
+
+    scores = GestureScorer(SCORE_CONFIG['softness']).score(
+        batch_margins(landmarks, batched[2], args.units), labels)
+    top = top_gestures(scores)
+    confident = [(name, label) for (name, score), label in zip(top, batched[0]) if score > 0.5]
+    wrong = sum(name != label for name, label in confident)
+    print(f"Top scores above 0.5 on {len(confident) / len(top) * 100:.1f}% of hands, "
+          f"mean top score {np.mean([score for _, score in top]):.2f}")
+    if wrong:
+        raise SystemExit(f"Top-scoring gesture disagrees with the label on {wrong} hands")
+    print("Top-scoring gestures agree with the labels.")
+
+
+if __name__ == '__main__':
+    main()
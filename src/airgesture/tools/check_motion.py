@@ -0,0 +1,118 @@
+"""Check that scripted hand movements produce exactly the expected motion gestures.
+
+Every scenario moves a synthetic hand along a path at ``--fps`` and feeds it
+to a ``MotionRecognizer`` built from ``MOTION_CONFIG``: one movement, however
+slow or long, must produce one event, a still or jittering hand none, and
+two movements separated by a pause two. Also reports the cost per frame.
+
+    python -m src.airgesture.tools.check_motion
+    python -m src.airgesture.tools.check_motion --fps 60 --noise 0.003
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.airgesture.core.motion import MotionRecognizer
+from src.airgesture.utils.config import MOTION_CONFIG
+
+
+def still(duration, at):
+    return lambda t: np.broadcast_to(at, (len(t), 2)) + 0.0 * t[:, None]
+
+
+def line(duration, start, end):
+    """Constant-speed movement from ``start`` to ``end``."""
+    start, end = np.array(start), np.array(end)
+    return lambda t: start + (end - start) * (t[:, None] / duration)
+
+
+def circle(duration, centre, radius, turns=1.0, clockwise=True):
+    """``turns`` turns around ``centre`` at constant speed; y points down."""
+    sign = 1.0 if clockwise else -1.0
+    return lambda t: np.array(centre) + radius * np.stack(
+        [np.cos(sign * 2 * np.pi * turns * t / duration),
+         np.sin(sign * 2 * np.pi * turns * t / duration)], axis=1)
+
+
+def path(segments, fps):
+    """Concatenate (duration, builder, *args) segments into (timestamps, palm xy)."""
+    timestamps, points, offset = [], [], 0.0
+    for duration, builder, *args in segments:
+        t = np.arange(0.0, duration, 1.0 / fps)
+        points.append(builder(duration, *args)(t))
+        timestamps.append(t + offset)
+        offset += duration
+    return np.concatenate(timestamps), np.concatenate(points)
+
+
+# Name, segments, expected events in order
+SCENARIOS = [
+    ("still hand", [(3.0, still, (0.5, 0.5))], []),
+    ("quick swipe", [(0.5, still, (0.2, 0.5)), (0.25, line, (0.2, 0.5), (0.7, 0.5)),
+                     (1.0, still, (0.7, 0.5))], ['swipe_right']),
+    ("slow swipe", [(0.5, still, (0.2, 0.5)), (0.5, line, (0.2, 0.5), (0.8, 0.5)),
+                    (1.5, still, (0.8, 0.5))], ['swipe_right']),
+    ("long swipe", [(0.5, still, (0.9, 0.5)), (1.5, line, (0.9, 0.5), (0.1, 0.5)),
+                    (1.0, still, (0.1, 0.5))], ['swipe_left']),
+    ("swipe and back", [(0.5, still, (0.2, 0.5)), (0.4, line, (0.2, 0.5), (0.7, 0.5)),
+                        (0.4, line, (0.7, 0.5), (0.2, 0.5)), (1.0, still, (0.2, 0.5))],
+     ['swipe_right']),
+    ("two swipes", [(0.5, still, (0.5, 0.2)), (0.4, line, (0.5, 0.2), (0.5, 0.7)),
+                    (1.0, still, (0.5, 0.7)), (0.4, line, (0.5, 0.7), (0.5, 0.2)),
+                    (1.0, still, (0.5, 0.2))], ['swipe_down', 'swipe_up']),
+    ("one-second circle", [(0.5, still, (0.62, 0.5)), (1.0, circle, (0.5, 0.5), 0.12),
+                           (1.0, still, (0.62, 0.5))], ['circle_clockwise']),
+    ("slow circle", [(0.5, still, (0.62, 0.5)), (1.2, circle, (0.5, 0.5), 0.12, 1.0, False),
+                     (1.0, still, (0.62, 0.5))], ['circle_counterclockwise']),
+]
+
+
+def run(recognizer, timestamps, palm, shape, noise, rng):
+    """Feed the recognizer a hand moving along ``palm``; returns (events, seconds)."""
+    landmarks = np.empty((len(timestamps), 21, 3), dtype=np.float32)
+    landmarks[:] = shape
+    landmarks[:, :, :2] += palm[:, None, :].astype(np.float32)
+    landmarks += rng.normal(0.0, noise, landmarks.shape).astype(np.float32)
+    recognizer.reset()
+    events = []
+    start = time.perf_counter()
+    for frame, timestamp in zip(landmarks, timestamps):
+        gesture = recognizer.update(frame, timestamp)
+        if gesture is not None:
+            events.append((gesture, float(timestamp)))
+    return events, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check motion gestures on scripted movements.")
+    parser.add_argument('--fps', type=float, default=30.0, help="frames per second")
+    parser.add_argument('--noise', type=float, default=0.002, help="landmark noise")
+    parser.add_argument('--seed', type=int, default=0, help="random seed")
+    args = parser.parse_args()
+
+    params = {key: value for key, value in MOTION_CONFIG.items() if key not in ('enabled', 'actions')}
+    recognizer = MotionRecognizer(**params)
+    rng = np.random.default_rng(args.seed)
+    shape = rng.normal(0.0, 0.03, (21, 3)).astype(np.float32)
+
+    failures, frames, elapsed = [], 0, 0.0
+    for name, segments, expected in SCENARIOS:
+        timestamps, palm = path(segments, args.fps)
+        events, seconds = run(recognizer, timestamps, palm, shape, args.noise, rng)
+        frames += len(timestamps)
+        elapsed += seconds
+        found = [gesture for gesture, _ in events]
+        described = ", ".join(f"{gesture} at {at:.2f} s" for gesture, at in events) or "no events"
+        print(f"{name:>18}: {described}")
+        if found != expected:
+            failures.append(f"{name}: expected {expected or 'no events'}, got {found or 'none'}")
+
+    print(f"{frames} frames, {elapsed / frames * 1e6:.1f} us per frame")
+    if failures:
+        raise SystemExit("Motion gestures differ:\n  " + "\n  ".join(failures))
+    print("Every movement produced exactly the expected events.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Check gesture profiles and print the decision trees they compile to.
+
+Every profile of ``gesture_profiles.json`` is compiled as the detector does
+on load (``core.profiles``): ambiguous bindings are errors, and gestures the
+classifier never emits, gestures that can never win on their hand and
+overlapping bound gestures are warnings. For the rule-based classifiers the
+per-hand decision trees are summarized, or printed in full with ``--tree``.
+The exit status is 1 when any profile has errors.
+
+    python -m src.airgesture.tools.check_profiles
+    python -m src.airgesture.tools.check_profiles my_profiles.json --profile Default --tree
+"""
+import argparse
+import json
+import time
+
+from src.airgesture.core.gesture_classifier import build_classifier
+from src.airgesture.core.profiles import compile_profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check gesture profiles and their decision trees.")
+    parser.add_argument('path', nargs='?', default='gesture_profiles.json',
+                        help="profiles file (default: gesture_profiles.json)")
+    parser.add_argument('--profile', help="check only this profile")
+    parser.add_argument('--tree', action='store_true', help="print the decision trees")
+    args = parser.parse_args()
+
+    with open(args.path) as f:
+        profiles = json.load(f)["profiles"]
+    if args.profile:
+        profiles = [profile for profile in profiles if profile.get('name') == args.profile]
+        if not profiles:
+            raise SystemExit(f"No profile named {args.profile!r} in {args.path}")
+
+    failed = False
+    for profile in profiles:
+        start = time.perf_counter()
+        compiled = compile_profile(profile, build_classifier(profile), strict=False)
+        elapsed = time.perf_counter() - start
+        print(f"Profile {compiled.name!r}: {len(compiled.bindings)} bindings, "
+              f"compiled in {elapsed * 1000:.0f} ms")
+        for severity, message in compiled.issues:
+            print(f"  {severity}: {message}")
+        failed = failed or bool(compiled.errors)
+
+        if not compiled.trees:
+            print("  no decision tree; the classifier runs on every hand")
+        for hand, tree in compiled.trees.items():
+            print(f"  {hand} hand: depth {tree.depth()}, {len(tree.nodes)} tests, "
+                  f"{len(tree.used)} of {len(tree.tests)} distinct tests used")
+            if args.tree:
+                for line in tree.describe():
+                    print("    " + line)
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
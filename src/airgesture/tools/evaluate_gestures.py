@@ -0,0 +1,217 @@
+"""Evaluate a gesture classifier on labelled landmark sessions.
+
+Sessions are recorded or extracted with ``extract_landmarks`` and labelled
+as for ``train_classifier``: a ``labels`` (frames, hands) array, or
+``session.npz=Label`` for a whole session. Every labelled hand is run
+through the classifier and the per-gesture precision and recall, the
+confusion matrix, false activations per minute and the classification
+throughput (hands per second, batched and one hand at a time) are printed.
+``--json`` writes the same report for scripts, ``--history`` appends it as
+one line to a JSON-lines file so runs can be compared over time. Every
+report records the thresholds it ran with under their config name:
+``GESTURE_THRESHOLDS`` for image units, ``PALM_THRESHOLDS`` or
+``WORLD_THRESHOLDS`` for the others.
+
+Classifiers:
+
+    live            the detector's per-frame gestures (predicates.hand_gesture)
+    scores          the top confidence score, "none" below its min_score
+    profile:<name>  the rules, model or default classifier of a gesture_profiles.json profile
+
+    python -m src.airgesture.tools.evaluate_gestures labelled/*.npz
+    python -m src.airgesture.tools.evaluate_gestures labelled/*.npz --classifier scores --units image
+    python -m src.airgesture.tools.evaluate_gestures fist.npz=none --classifier profile:Default --history eval.jsonl
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from src.airgesture.core import predicates
+from src.airgesture.core.batch import batch_features, classify_batch
+from src.airgesture.core.evaluation import NONE, Evaluation, format_confusion
+from src.airgesture.core.features import DISTANCE_UNITS, HandFeatures
+from src.airgesture.core.scores import GestureScorer, batch_margins, top_gestures
+from src.airgesture.core.session import (HANDEDNESS_CODES, NO_HAND, load_session,
+                                         parse_labelled_inputs, session_labels)
+from src.airgesture.utils.config import FEATURE_CONFIG, SCORE_CONFIG, THRESHOLD_TABLES
+
+LABELS = {code: label for label, code in HANDEDNESS_CODES.items()}
+# Config name of the threshold table of each distance unit
+THRESHOLD_NAMES = {'image': 'GESTURE_THRESHOLDS', 'palm': 'PALM_THRESHOLDS',
+                   'world': 'WORLD_THRESHOLDS'}
+
+
+def threshold_settings(units):
+    """The distance units and their threshold table, under its config name."""
+    return {'units': units, THRESHOLD_NAMES[units]: THRESHOLD_TABLES[units]}
+
+
+class LiveClassifier:
+    """The detector's single-frame gesture labels."""
+
+    def __init__(self, units):
+        self.units = units
+        self.settings = threshold_settings(units)
+
+    def classify_batch(self, landmarks, handedness):
+        return classify_batch(landmarks, handedness, self.units)[0].tolist()
+
+    def classify(self, hand, label):
+        return predicates.hand_gesture(HandFeatures(hand, units=self.units), label)
+
+
+class ScoreClassifier:
+    """The top-scoring gesture where it reaches its ``min_score``, as the detector dispatches."""
+
+    def __init__(self, units):
+        self.units = units
+        self.scorer = GestureScorer(SCORE_CONFIG['softness'])
+        self.min_scores = SCORE_CONFIG['min_score']
+        self.settings = dict(threshold_settings(units), softness=SCORE_CONFIG['softness'],
+                             min_score=self.min_scores)
+
+    def gated(self, scores):
+        return [gesture if score >= self.min_scores.get(gesture, self.min_scores['default'])
+                else NONE for gesture, score in top_gestures(scores)]
+
+    def classify_batch(self, landmarks, handedness):
+        features = batch_features(landmarks, self.units)
+        return self.gated(self.scorer.score(batch_margins(landmarks, features, self.units),
+                                            handedness))
+
+    def classify(self, hand, label):
+        return self.gated(self.scorer.score_hands([HandFeatures(hand, units=self.units)],
+                                                  [label]))[0]
+
+
+class ProfileClassifier:
+    """The classifier a ``gesture_profiles.json`` profile builds."""
+
+    def __init__(self, name, path):
+        from src.airgesture.core.gesture_classifier import build_classifier
+
+        with open(path) as f:
+            profiles = {profile['name']: profile for profile in json.load(f)['profiles']}
+        if name not in profiles:
+            raise SystemExit(f"No profile named {name!r} in {path}")
+        self.settings = profiles[name]
+        self.classifier = build_classifier(self.settings)
+
+    def classify_batch(self, landmarks, handedness):
+        return [NONE if name is None else name
+                for name in self.classifier.classify_batch(landmarks, handedness)]
+
+    def classify(self, hand, label):
+        name = self.classifier.classify(hand, label)
+        return NONE if name is None else name
+
+
+def make_classifier(kind, units, profiles_path):
+    if kind == 'live':
+        return LiveClassifier(units)
+    if kind == 'scores':
+        return ScoreClassifier(units)
+    if kind.startswith('profile:'):
+        return ProfileClassifier(kind.split(':', 1)[1], profiles_path)
+    raise SystemExit(f"Unknown classifier {kind!r}; use live, scores or profile:<name>")
+
+
+def predict_session(classifier, session):
+    """The (frames, hands) predictions of a session, "" where there is no hand."""
+    landmarks, handedness = session['landmarks'], session['handedness']
+    present = handedness != NO_HAND
+    predicted = np.full(handedness.shape, '', dtype=object)
+    if present.any():
+        predicted[present] = classifier.classify_batch(landmarks[present], handedness[present])
+    return predicted.astype(str)
+
+
+def measure_throughput(classifier, landmarks, handedness, single=2000):
+    """Hands per second classified in one batch and one at a time."""
+    start = time.perf_counter()
+    classifier.classify_batch(landmarks, handedness)
+    batch = len(landmarks) / max(time.perf_counter() - start, 1e-9)
+
+    count = min(single, len(landmarks))
+    labels = [LABELS[code] for code in handedness[:count].tolist()]
+    start = time.perf_counter()
+    for hand, label in zip(landmarks[:count], labels):
+        classifier.classify(hand, label)
+    one = count / max(time.perf_counter() - start, 1e-9)
+    return {'batch_hands_per_second': batch, 'single_hands_per_second': one}
+
+
+def print_report(report):
+    print(f"{report['classifier']} on {report['hands']} labelled hands, "
+          f"{report['minutes']:.1f} min of {len(report['sessions'])} session(s)")
+    table = THRESHOLD_NAMES.get(report['settings'].get('units'))
+    if table in report['settings']:
+        print(f"Thresholds: {table} ({report['settings']['units']} units) " +
+              ", ".join(f"{name}={value}" for name, value in report['settings'][table].items()))
+    print(f"Accuracy: {report['accuracy'] * 100:.1f}%, false activations: "
+          f"{report['false_activations']} ({report['false_activations_per_minute']:.2f} per minute)")
+    print(f"{'gesture':<18} {'precision':>9} {'recall':>7} {'f1':>6} {'support':>8} {'false act.':>10}")
+    for name, metrics in report['gestures'].items():
+        print(f"{name:<18} {metrics['precision'] * 100:>8.1f}% {metrics['recall'] * 100:>6.1f}% "
+              f"{metrics['f1']:>6.3f} {metrics['support']:>8} {metrics['false_activations']:>10}")
+    print("Confusion (labels down, predictions across):")
+    for line in format_confusion(report['labels'], np.array(report['confusion'])):
+        print("  " + line)
+    throughput = report['throughput']
+    print(f"Throughput: {throughput['batch_hands_per_second']:,.0f} hands/s batched, "
+          f"{throughput['single_hands_per_second']:,.0f} hands/s one at a time")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate a gesture classifier on labelled sessions.")
+    parser.add_argument('sessions', nargs='+', help="labelled sessions (.npz), optionally as session.npz=Label")
+    parser.add_argument('--label', help="label for every hand of sessions given without one")
+    parser.add_argument('--classifier', default='live', help="live, scores or profile:<name>")
+    parser.add_argument('--units', choices=DISTANCE_UNITS, default=FEATURE_CONFIG['units'],
+                        help="distance units of the live and score classifiers")
+    parser.add_argument('--profiles', default='gesture_profiles.json', help="profiles file")
+    parser.add_argument('--json', help="write the report to this file")
+    parser.add_argument('--history', help="append the report as one line to this JSON-lines file")
+    args = parser.parse_args()
+
+    classifier = make_classifier(args.classifier, args.units, args.profiles)
+    evaluation = Evaluation()
+    paths, labels = parse_labelled_inputs(args.sessions, args.label)
+    all_landmarks, all_handedness = [], []
+    for path, label in zip(paths, labels):
+        session = load_session(path)
+        try:
+            truth = session_labels(session, label)
+        except ValueError:
+            raise SystemExit(f"{path} has no 'labels' array; label it as {path}=Label")
+        evaluation.add_session(session['timestamps'], truth, predict_session(classifier, session))
+        labelled = truth != ''
+        all_landmarks.append(session['landmarks'][labelled])
+        all_handedness.append(session['handedness'][labelled])
+
+    landmarks, handedness = np.concatenate(all_landmarks), np.concatenate(all_handedness)
+    if not len(landmarks):
+        raise SystemExit("No labelled hands")
+
+    report = {'classifier': args.classifier,
+              'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+              'sessions': paths,
+              'settings': classifier.settings}
+    report.update(evaluation.report())
+    report['throughput'] = measure_throughput(classifier, landmarks, handedness)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.json}")
+    if args.history:
+        with open(args.history, 'a') as f:
+            f.write(json.dumps(report) + '\n')
+        print(f"Appended to {args.history}")
+
+
+if __name__ == '__main__':
+    main()
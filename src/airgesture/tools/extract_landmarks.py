@@ -0,0 +1,283 @@
+"""Offline landmark extraction over videos and image folders.
+
+Videos are split into chunks of frames and image folders into batches of
+images; chunks are fanned out to a pool of worker processes, each with its
+own MediaPipe ``Hands`` instance (``static_image_mode`` for still images).
+Every input produces one landmark session (see ``core/session.py``) in the
+output directory. Finished chunks are kept until their file is complete, so
+an interrupted run picks up where it stopped.
+
+    python -m src.airgesture.tools.extract_landmarks recordings/ -o landmarks/
+    python -m src.airgesture.tools.extract_landmarks a.mp4 b.mp4 -o out/ --workers 8 --pin
+    python -m src.airgesture.tools.extract_landmarks clips/ -o out/ --cache .landmark_cache
+"""
+import argparse
+import glob
+import multiprocessing
+import os
+import time
+
+import cv2
+import numpy as np
+
+from src.airgesture.core.inference_cache import CachedBackend, config_fingerprint
+from src.airgesture.core.landmarks import results_to_array
+from src.airgesture.core.runtime import available_cpus, configure_opencv, pin_current_thread
+from src.airgesture.core.session import (HANDEDNESS_CODES, concatenate_sessions,
+                                         empty_session, load_session, save_session)
+from src.airgesture.utils.config import GESTURE_CONFIG
+
+VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv', '.webm'}
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp'}
+
+# Per-process state, set up by init_worker
+_worker = {}
+
+
+def init_worker(max_hands, pin, cache_dir, cache_bytes):
+    """Create the per-process settings; Hands instances are built lazily."""
+    configure_opencv(1)
+    if pin:
+        cpus = available_cpus()
+        identity = multiprocessing.current_process()._identity
+        worker_index = identity[0] - 1 if identity else 0
+        pin_current_thread([cpus[worker_index % len(cpus)]])
+    _worker['max_hands'] = max_hands
+    _worker['cache'] = (cache_dir, cache_bytes)
+    _worker['hands'] = {}
+
+
+def get_hands(static_image_mode):
+    hands = _worker['hands'].get(static_image_mode)
+    if hands is None:
+        import mediapipe as mp
+        settings = {
+            'static_image_mode': static_image_mode,
+            'max_num_hands': _worker['max_hands'],
+            'min_detection_confidence': GESTURE_CONFIG['min_detection_confidence'],
+            'min_tracking_confidence': GESTURE_CONFIG['min_tracking_confidence'],
+            'model_complexity': GESTURE_CONFIG['model_complexity'],
+        }
+        hands = mp.solutions.hands.Hands(**settings)
+
+        cache_dir, cache_bytes = _worker['cache']
+        if cache_dir:
+            fingerprint = config_fingerprint(f"mediapipe.hands {mp.__version__}", settings)
+            hands = CachedBackend(hands, cache_dir, fingerprint, cache_bytes,
+                                  sequential=not static_image_mode)
+        _worker['hands'][static_image_mode] = hands
+    return hands
+
+
+def cache_counts():
+    """Total cache hits and misses of this worker so far."""
+    hits = misses = 0
+    for hands in _worker['hands'].values():
+        if isinstance(hands, CachedBackend):
+            hits += hands.stats['hits']
+            misses += hands.stats['misses']
+    return hits, misses
+
+
+def record(session, row, results):
+    """Store one frame's results in row ``row`` of ``session``."""
+    landmarks = results_to_array(results)[:_worker['max_hands']]
+    session['landmarks'][row, :len(landmarks)] = landmarks
+    for index, handedness in enumerate((results.multi_handedness or [])[:len(landmarks)]):
+        session['handedness'][row, index] = HANDEDNESS_CODES[handedness.classification[0].label]
+
+
+def extract_video_chunk(path, start, end):
+    """Extract frames [start, end) of a video; ``end`` None reads to the end.
+
+    Tracking starts afresh at every chunk, so its landmarks do not depend on
+    what the worker processed before. A cached chunk is used only when every
+    frame hits; otherwise the whole chunk is run through the backend.
+    """
+    hands = get_hands(False)
+    if isinstance(hands, CachedBackend):
+        session = read_video_chunk(hands, path, start, end, cached_only=True)
+        if session is not None:
+            return session
+    return read_video_chunk(hands, path, start, end)
+
+
+def read_video_chunk(hands, path, start, end, cached_only=False):
+    """Run frames [start, end) through a freshly reset backend; with
+    ``cached_only`` returns None at the first frame missing from the cache."""
+    hands.reset()
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+
+    rows = []
+    index = start
+    while end is None or index < end:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        row = empty_session(1, _worker['max_hands'])
+        row['timestamps'][0] = index / fps
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        results = hands.lookup(rgb) if cached_only else hands.process(rgb)
+        if results is None:
+            cap.release()
+            return None
+        record(row, 0, results)
+        rows.append(row)
+        index += 1
+    cap.release()
+    return concatenate_sessions(rows, _worker['max_hands'])
+
+
+def extract_images(paths, first_index):
+    """Extract a batch of still images; timestamps are image indices."""
+    hands = get_hands(True)
+    session = empty_session(len(paths), _worker['max_hands'])
+    for row, path in enumerate(paths):
+        session['timestamps'][row] = first_index + row
+        image = cv2.imread(path)
+        if image is not None:
+            record(session, row, hands.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB)))
+    return session
+
+
+def run_task(task):
+    """Run one chunk and write it to its part file; executes in a worker."""
+    start = time.perf_counter()
+    hits, misses = cache_counts()
+    if task['kind'] == 'video':
+        session = extract_video_chunk(task['source'], task['start'], task['end'])
+    else:
+        session = extract_images(task['images'], task['start'])
+    write_session(task['part'], session)
+    end_hits, end_misses = cache_counts()
+    return (task, len(session['timestamps']), time.perf_counter() - start,
+            end_hits - hits, end_misses - misses)
+
+
+def write_session(path, session, **extra):
+    """Write a session atomically so an interrupted run never leaves half a file."""
+    tmp_path = path + '.tmp.npz'
+    save_session(tmp_path, session['timestamps'], session['landmarks'],
+                 session['handedness'], **extra)
+    os.replace(tmp_path, path)
+
+
+def find_inputs(paths):
+    """Expand the command line into video files and image folders."""
+    videos, folders = [], []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                if any(os.path.splitext(f)[1].lower() in IMAGE_EXTENSIONS for f in files):
+                    folders.append(root)
+                videos.extend(os.path.join(root, f) for f in sorted(files)
+                              if os.path.splitext(f)[1].lower() in VIDEO_EXTENSIONS)
+        elif os.path.splitext(path)[1].lower() in VIDEO_EXTENSIONS:
+            videos.append(path)
+    return videos, folders
+
+
+def output_name(path):
+    """Flatten an input path into an output file stem."""
+    stem = os.path.splitext(os.path.normpath(path))[0] if os.path.isfile(path) else os.path.normpath(path)
+    return stem.replace(os.sep, '__').replace(':', '').lstrip('._') or 'root'
+
+
+def plan(videos, folders, out_dir, chunk_frames, chunk_images, max_hands):
+    """Split every input that has no finished output into chunk tasks."""
+    parts_dir = os.path.join(out_dir, '.parts')
+    jobs = []
+    inputs = [(path, 'video') for path in videos] + [(path, 'images') for path in folders]
+    for path, kind in inputs:
+        name = output_name(path)
+        output = os.path.join(out_dir, name + '.npz')
+        if os.path.exists(output):
+            continue
+
+        tasks = []
+        if kind == 'video':
+            cap = cv2.VideoCapture(path)
+            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            cap.release()
+            starts = list(range(0, frame_count, chunk_frames)) if frame_count > 0 else [0]
+            for number, start in enumerate(starts):
+                last = number == len(starts) - 1
+                tasks.append({'kind': kind, 'source': path, 'start': start,
+                              'end': None if last else start + chunk_frames})
+        else:
+            images = sorted(glob.glob(os.path.join(path, '*')))
+            images = [f for f in images if os.path.splitext(f)[1].lower() in IMAGE_EXTENSIONS]
+            for start in range(0, len(images), chunk_images):
+                tasks.append({'kind': kind, 'source': path, 'start': start,
+                              'images': images[start:start + chunk_images]})
+
+        for number, task in enumerate(tasks):
+            task['part'] = os.path.join(parts_dir, f"{name}.{number:05d}.npz")
+        jobs.append({'name': name, 'output': output, 'tasks': tasks, 'max_hands': max_hands,
+                     'images': [f for task in tasks for f in task.get('images', [])]})
+    return jobs
+
+
+def merge(job):
+    """Concatenate a file's chunk parts into its final session and drop the parts."""
+    parts = [load_session(task['part']) for task in job['tasks']]
+    session = concatenate_sessions(parts, job['max_hands'])
+    extra = {'files': np.array(job['images'])} if job['images'] else {}
+    write_session(job['output'], session, **extra)
+    for task in job['tasks']:
+        os.remove(task['part'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract hand landmarks from videos and image folders.")
+    parser.add_argument('inputs', nargs='+', help="video files or directories")
+    parser.add_argument('-o', '--output', required=True, help="output directory")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument('--chunk-frames', type=int, default=900, help="video frames per task")
+    parser.add_argument('--chunk-images', type=int, default=200, help="images per task")
+    parser.add_argument('--max-hands', type=int, default=GESTURE_CONFIG['max_num_hands'])
+    parser.add_argument('--pin', action='store_true', help="pin each worker to its own CPU (Linux)")
+    parser.add_argument('--cache', help="inference cache directory, reused across runs")
+    parser.add_argument('--cache-size', type=float, default=2048, help="cache size limit in MB")
+    args = parser.parse_args()
+
+    os.makedirs(os.path.join(args.output, '.parts'), exist_ok=True)
+    videos, folders = find_inputs(args.inputs)
+    jobs = plan(videos, folders, args.output, args.chunk_frames, args.chunk_images, args.max_hands)
+
+    remaining = {job['name']: sum(not os.path.exists(t['part']) for t in job['tasks']) for job in jobs}
+    pending = [task for job in jobs for task in job['tasks'] if not os.path.exists(task['part'])]
+    jobs_by_part = {task['part']: job for job in jobs for task in job['tasks']}
+    print(f"{len(videos)} videos, {len(folders)} image folders, "
+          f"{len(jobs)} to extract, {len(pending)} chunks pending")
+
+    # Inputs whose chunks all survived an earlier interrupted run
+    for job in jobs:
+        if remaining[job['name']] == 0:
+            merge(job)
+
+    total_frames = hits = misses = 0
+    start = time.perf_counter()
+    init_args = (args.max_hands, args.pin, args.cache, int(args.cache_size * 1024 * 1024))
+    with multiprocessing.Pool(args.workers, init_worker, init_args) as pool:
+        for done, (task, frames, _, task_hits, task_misses) in enumerate(
+                pool.imap_unordered(run_task, pending), 1):
+            total_frames += frames
+            hits += task_hits
+            misses += task_misses
+            elapsed = time.perf_counter() - start
+            cache_note = f", cache {hits} hits / {misses} misses" if args.cache else ""
+            print(f"[{done}/{len(pending)}] {os.path.basename(task['part'])}: {frames} frames, "
+                  f"{total_frames / elapsed:.1f} frames/s overall{cache_note}", flush=True)
+
+            job = jobs_by_part[task['part']]
+            remaining[job['name']] -= 1
+            if remaining[job['name']] == 0:
+                merge(job)
+                print(f"Wrote {job['output']}", flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""Train a kNN or MLP gesture classifier from labelled landmark sessions.
+
+Sessions come from ``extract_landmarks`` or a recording; hands are labelled
+by a ``labels`` (frames, hands) string array stored in the session ("" for
+unlabelled hands), or all at once as ``session.npz=Label`` or ``--label``.
+Label hands that show no gesture as "none" so the model can learn to reject
+them. Part of the data is held out to report accuracy and per-hand inference
+time: the last ``--holdout`` share of every session's frames by default, or
+whole sessions with ``--split session``. Neighbouring frames are nearly
+identical, so a random per-frame split would mostly measure memorization.
+The model is then written as the next version of ``--output`` and can be
+selected by a profile's ``"model"`` entry.
+
+    python -m src.airgesture.tools.train_classifier labelled/*.npz -o models/hands
+    python -m src.airgesture.tools.train_classifier pinch.npz=Pinch fist.npz=none -o models/hands
+    python -m src.airgesture.tools.train_classifier labelled/*.npz -o models/hands --kind mlp --hidden 64
+    python -m src.airgesture.tools.train_classifier labelled/*.npz -o models/hands --split session
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from src.airgesture.core.gesture_model import (GestureModel, KNNModel, MLPModel, next_model_path,
+                                               normalize_hands)
+from src.airgesture.core.session import load_session, parse_labelled_inputs, session_labels
+
+
+def load_labelled(paths, labels):
+    """Gather labelled hands; ``labels[i]`` overrides the labels of session ``i``.
+
+    Also returns the session number and frame index of every hand.
+    """
+    landmarks, handedness, names, sessions, frames = [], [], [], [], []
+    for number, (path, label) in enumerate(zip(paths, labels)):
+        session = load_session(path)
+        try:
+            labelled = session_labels(session, label)
+        except ValueError:
+            raise SystemExit(f"{path} has no 'labels' array; label it as {path}=Label")
+        present = labelled != ''
+        landmarks.append(session['landmarks'][present])
+        handedness.append(session['handedness'][present])
+        names.append(labelled[present])
+        frames.append(np.nonzero(present)[0])
+        sessions.append(np.full(len(frames[-1]), number))
+    return (np.concatenate(landmarks), np.concatenate(handedness), np.concatenate(names),
+            np.concatenate(sessions), np.concatenate(frames))
+
+
+def holdout_mask(sessions, frames, share, split, rng):
+    """Hands to hold out, and a description of the split.
+
+    ``block`` holds out the last ``share`` of every session's frames, so each
+    session and label is seen on both sides but no held-out frame sits
+    between training frames; ``session`` holds out whole sessions at random.
+    """
+    held_out = np.zeros(len(frames), dtype=bool)
+    numbers = np.unique(sessions)
+    if split == 'session':
+        count = min(max(int(round(share * len(numbers))), 1), len(numbers) - 1)
+        chosen = rng.choice(numbers, count, replace=False) if count > 0 else []
+        held_out = np.isin(sessions, chosen)
+        return held_out, f"{len(chosen)} of {len(numbers)} session(s) held out"
+    for number in numbers:
+        rows = sessions == number
+        cutoff = np.quantile(frames[rows], 1 - share) if share > 0 else np.inf
+        held_out[rows] = frames[rows] >= cutoff
+    return held_out, f"last {share * 100:.0f}% of the frames of each session held out"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train a gesture classifier from labelled sessions.")
+    parser.add_argument('sessions', nargs='+', help="landmark sessions (.npz), optionally as session.npz=Label")
+    parser.add_argument('--label', help="label for every hand of sessions given without one")
+    parser.add_argument('-o', '--output', required=True, help="model name, e.g. models/hands")
+    parser.add_argument('--kind', choices=('knn', 'mlp'), default='knn', help="model type")
+    parser.add_argument('--k', type=int, default=5, help="kNN neighbours")
+    parser.add_argument('--max-per-label', type=int, default=300,
+                        help="kNN index size per label; inference cost grows with it")
+    parser.add_argument('--hidden', type=int, default=32, help="MLP hidden units")
+    parser.add_argument('--epochs', type=int, default=300, help="MLP training steps")
+    parser.add_argument('--holdout', type=float, default=0.2, help="share of frames or sessions held out")
+    parser.add_argument('--split', choices=('block', 'session'), default='block',
+                        help="hold out the end of every session, or whole sessions")
+    parser.add_argument('--seed', type=int, default=0, help="random seed")
+    args = parser.parse_args()
+
+    paths, labels = parse_labelled_inputs(args.sessions, args.label)
+    landmarks, handedness, names, sessions, frames = load_labelled(paths, labels)
+    if not len(landmarks):
+        raise SystemExit("No labelled hands")
+    label_names, targets = np.unique(names, return_inverse=True)
+    features = normalize_hands(landmarks, handedness)
+
+    rng = np.random.default_rng(args.seed)
+    held_out, split = holdout_mask(sessions, frames, args.holdout, args.split, rng)
+    if not held_out.any() or held_out.all():
+        held_out[:] = False
+    train = ~held_out
+
+    start = time.perf_counter()
+    if args.kind == 'knn':
+        model = KNNModel.train(features[train], targets[train], label_names, args.k,
+                               args.max_per_label, args.seed)
+    else:
+        model = MLPModel.train(features[train], targets[train], label_names, args.hidden,
+                               args.epochs, seed=args.seed)
+    print(f"Trained {args.kind} on {train.sum()} hands, {len(label_names)} labels "
+          f"in {time.perf_counter() - start:.1f} s")
+
+    classifier = GestureModel(model)
+    if held_out.any():
+        predicted, _ = classifier.predict(landmarks[held_out], handedness[held_out])
+        expected = label_names[targets[held_out]]
+        accuracy = float(np.mean(predicted == expected))
+        print(f"Held-out accuracy: {accuracy * 100:.1f}% on {held_out.sum()} hands ({split})")
+        for name in label_names:
+            rows = expected == name
+            if rows.any():
+                print(f"  {name:<20} {np.mean(predicted[rows] == name) * 100:5.1f}% of {rows.sum()}")
+        classifier.metadata['accuracy'] = accuracy
+        classifier.metadata['split'] = split
+    else:
+        print(f"No hands held out ({split}); accuracy not measured")
+
+    sample, hand = landmarks[0], handedness[0]
+    repeat = 2000
+    start = time.perf_counter()
+    for _ in range(repeat):
+        classifier.predict(sample[np.newaxis], [hand])
+    print(f"Inference: {(time.perf_counter() - start) / repeat * 1e6:.1f} us per hand")
+
+    classifier.metadata.update({'hands': int(train.sum()),
+                                'sessions': [os.path.basename(path) for path in paths],
+                                'trained': time.strftime('%Y-%m-%d %H:%M:%S')})
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    path = next_model_path(args.output)
+    classifier.save(path)
+    print(f"Wrote {path}")
+
+
+if __name__ == '__main__':
+    main()
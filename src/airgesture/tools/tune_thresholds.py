@@ -0,0 +1,241 @@
+"""Tune a gesture profile's thresholds on labelled landmark sessions.
+
+Sessions are labelled as for ``evaluate_gestures`` with the profile's
+gesture names. The distance thresholds the profile's rules name
+(``pinch_threshold``, ``finger_distance_threshold``) are searched on a grid
+around their current values, refined around the best point for ``--rounds``
+rounds, and evaluated on every labelled hand at once (``core.tuning``). The
+chosen values have the highest mean recall whose false activations stay
+within ``--max-false-activations`` per minute. A setting only moves the
+results through a distance test that names it: the Default rules test
+``pinch_threshold`` but have no fingers-apart test, so there
+``finger_distance_threshold`` is reported and left unchanged.
+``cursor_smoothing`` is tuned on the fingertip track of the hand bound to
+``mouse_move``; the detectors read it from the active profile, so set
+``GESTURE_CONFIG['profile']`` to the tuned profile's name to use it.
+
+The result is written as a new profile, "<profile> tuned" by default, into
+the profiles file or ``--output``, with the metrics it was chosen on.
+
+    python -m src.airgesture.tools.tune_thresholds labelled/*.npz
+    python -m src.airgesture.tools.tune_thresholds labelled/*.npz --profile Default --max-false-activations 0.5
+    python -m src.airgesture.tools.tune_thresholds labelled/*.npz --range pinch_threshold=0.05:0.2 -o tuned.json
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from src.airgesture.core.gesture_classifier import build_classifier
+from src.airgesture.core.evaluation import NONE, Evaluation, session_duration
+from src.airgesture.core.profiles import ProfileError, parse_binding
+from src.airgesture.core.session import (NO_HAND, load_session, parse_labelled_inputs,
+                                         session_labels)
+from src.airgesture.core.tuning import (ThresholdSweep, cursor_tracks, refine_grid,
+                                        select_candidate, tune_smoothing)
+
+TUNABLE = ('pinch_threshold', 'finger_distance_threshold')
+CURSOR_ACTION = 'mouse_move'
+
+
+def load_corpus(paths, labels):
+    """Labelled sessions and their labelled hands flattened frame by frame."""
+    sessions, landmarks, handedness, truth, previous = [], [], [], [], []
+    offset, minutes = 0, 0.0
+    for path, label in zip(paths, labels):
+        session = load_session(path)
+        try:
+            session['truth'] = session_labels(session, label)
+        except ValueError:
+            raise SystemExit(f"{path} has no 'labels' array; label it as {path}=Label")
+        labelled = session['truth'] != ''
+        # Index of every labelled hand in the flattened corpus, -1 elsewhere
+        index = np.full(labelled.shape, -1, dtype=np.intp)
+        index[labelled] = np.arange(offset, offset + labelled.sum())
+        before = np.vstack([np.full((1, labelled.shape[1]), -1, dtype=np.intp), index[:-1]])
+        landmarks.append(session['landmarks'][labelled])
+        handedness.append(session['handedness'][labelled])
+        truth.append(session['truth'][labelled])
+        previous.append(before[labelled])
+        offset += int(labelled.sum())
+        minutes += session_duration(session['timestamps']) / 60
+        sessions.append(session)
+    if not offset:
+        raise SystemExit("No labelled hands")
+    return (sessions, np.concatenate(landmarks), np.concatenate(handedness),
+            np.concatenate(truth), np.concatenate(previous), minutes)
+
+
+def parse_ranges(items):
+    ranges = {}
+    for item in items or []:
+        name, _, bounds = item.partition('=')
+        try:
+            low, high = (float(value) for value in bounds.split(':'))
+        except ValueError:
+            raise SystemExit(f"Bad range {item!r}; use NAME=LOW:HIGH")
+        ranges[name] = (low, high)
+    return ranges
+
+
+def search(sweep, grid, rounds, max_false_activations):
+    """Evaluate the grid, then finer grids around the best point; returns the
+    results of every round and the seconds spent evaluating."""
+    results, elapsed = [], 0.0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        results.extend(sweep.evaluate(grid))
+        elapsed += time.perf_counter() - start
+        (values, _), _ = select_candidate(results, max_false_activations)
+        grid = refine_grid(grid, values)
+    return results, elapsed
+
+
+def describe(values, metrics):
+    settings = ', '.join(f"{name}={value:.4f}" for name, value in values.items())
+    return (f"{settings}: recall {metrics['recall'] * 100:.1f}%, accuracy "
+            f"{metrics['accuracy'] * 100:.1f}%, {metrics['false_activations_per_minute']:.2f} "
+            f"false activations per minute")
+
+
+def evaluate_profile(profile, sessions):
+    """The ``core.evaluation`` report of a profile's classifier on the sessions."""
+    classifier = build_classifier(profile)
+    evaluation = Evaluation()
+    for session in sessions:
+        handedness = session['handedness']
+        present = handedness != NO_HAND
+        predicted = np.full(handedness.shape, '', dtype=object)
+        if present.any():
+            names = classifier.classify_batch(session['landmarks'][present], handedness[present])
+            predicted[present] = [NONE if name is None else name for name in names]
+        evaluation.add_session(session['timestamps'], session['truth'], predicted.astype(str))
+    return evaluation.report()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune a gesture profile's thresholds on labelled sessions.")
+    parser.add_argument('sessions', nargs='+', help="labelled sessions (.npz), optionally as session.npz=Label")
+    parser.add_argument('--label', help="label for every hand of sessions given without one")
+    parser.add_argument('--profile', default='Default', help="profile to tune")
+    parser.add_argument('--profiles', default='gesture_profiles.json', help="profiles file")
+    parser.add_argument('--tune', nargs='+', default=list(TUNABLE), help="settings to tune")
+    parser.add_argument('--range', action='append', metavar='NAME=LOW:HIGH',
+                        help="search range of a setting (default: current value +/- --span)")
+    parser.add_argument('--span', type=float, default=0.5, help="relative default search range")
+    parser.add_argument('--steps', type=int, default=17, help="grid points per setting")
+    parser.add_argument('--rounds', type=int, default=3, help="grid refinements around the best point")
+    parser.add_argument('--max-false-activations', type=float, default=1.0,
+                        help="target false activations per minute")
+    parser.add_argument('--smoothing-steps', type=int, default=19,
+                        help="cursor_smoothing candidates between 0.05 and 0.95")
+    parser.add_argument('--name', help="name of the tuned profile (default: '<profile> tuned')")
+    parser.add_argument('-o', '--output', help="profiles file to write (default: --profiles)")
+    parser.add_argument('--dry-run', action='store_true', help="print the result without writing it")
+    args = parser.parse_args()
+
+    with open(args.profiles) as f:
+        profiles = json.load(f)['profiles']
+    profile = next((p for p in profiles if p.get('name') == args.profile), None)
+    if profile is None:
+        raise SystemExit(f"No profile named {args.profile!r} in {args.profiles}")
+    classifier = build_classifier(profile)
+
+    paths, labels = parse_labelled_inputs(args.sessions, args.label)
+    sessions, landmarks, handedness, truth, previous, minutes = load_corpus(paths, labels)
+    print(f"{len(landmarks)} labelled hands, {minutes:.1f} min of {len(sessions)} session(s)")
+
+    used = set(getattr(classifier, 'test_settings', []))
+    settings = [name for name in args.tune if name in used]
+    for name in args.tune:
+        if name not in used:
+            print(f"{name}: no distance test of {args.profile!r} names it, so it cannot "
+                  "change any result; left unchanged")
+
+    tuned = {key: value for key, value in profile.items() if key != 'tuning'}
+    tuned['name'] = args.name or f"{args.profile} tuned"
+    chosen = None
+    if settings:
+        start = time.perf_counter()
+        try:
+            sweep = ThresholdSweep(classifier, settings, landmarks, handedness, truth,
+                                   previous, minutes)
+        except ProfileError as e:
+            raise SystemExit(str(e))
+        print(f"Prepared in {time.perf_counter() - start:.2f} s")
+
+        current = sweep.evaluate({name: [value] for name, value in sweep.current.items()})[0]
+        print("Current   " + describe(*current))
+
+        ranges = parse_ranges(args.range)
+        grid = {}
+        for name in settings:
+            low, high = ranges.get(name, (sweep.current[name] * (1 - args.span),
+                                          sweep.current[name] * (1 + args.span)))
+            grid[name] = np.linspace(max(low, 1e-4), high, args.steps)
+        results, elapsed = search(sweep, grid, max(args.rounds, 1),
+                                  args.max_false_activations)
+        print(f"Evaluated {len(results)} candidates in {elapsed:.2f} s "
+              f"({elapsed / len(results) * 1000:.1f} ms per candidate over {len(landmarks)} hands)")
+
+        chosen, met = select_candidate(results, args.max_false_activations)
+        print("Tuned     " + describe(*chosen))
+        if not met:
+            print(f"No candidate reaches {args.max_false_activations} false activations per minute; "
+                  "kept the one with the fewest")
+        for name, value in chosen[0].items():
+            tuned[name] = round(value, 6)
+
+    binding = profile.get('actions', {}).get(CURSOR_ACTION)
+    smoothing = None
+    cursor = None
+    if binding:
+        try:
+            cursor = parse_binding(binding)
+        except ProfileError as e:
+            print(f"cursor_smoothing: {e}; smoothing not tuned")
+    if cursor is not None:
+        gesture, hand = cursor
+        tracks = []
+        for session in sessions:
+            tracks.extend(cursor_tracks(session['landmarks'], session['handedness'],
+                                        session['truth'], gesture, hand))
+        candidates = np.linspace(0.05, 0.95, args.smoothing_steps)
+        smoothing, errors = tune_smoothing(tracks, candidates)
+        if smoothing is None:
+            print(f"cursor_smoothing: no {binding} tracks long enough, left unchanged")
+        else:
+            print(f"cursor_smoothing: {smoothing:.2f} ({errors.min():.4f} RMS from the "
+                  f"steady fingertip path over {len(tracks)} track(s))")
+            tuned['cursor_smoothing'] = round(smoothing, 2)
+
+    report = evaluate_profile(tuned, sessions)
+    print(f"Tuned profile: accuracy {report['accuracy'] * 100:.1f}%, "
+          f"{report['false_activations_per_minute']:.2f} false activations per minute")
+    tuned['tuning'] = {
+        'source': args.profile,
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'sessions': paths,
+        'max_false_activations_per_minute': args.max_false_activations,
+        'recall': chosen[1]['recall'] if chosen else None,
+        'accuracy': report['accuracy'],
+        'false_activations_per_minute': report['false_activations_per_minute'],
+    }
+
+    if args.dry_run:
+        print(json.dumps({key: value for key, value in tuned.items() if key != 'gestures'}, indent=4))
+        return
+    output = args.output or args.profiles
+    if output != args.profiles and os.path.exists(output):
+        with open(output) as f:
+            profiles = json.load(f)['profiles']
+    profiles = [p for p in profiles if p.get('name') != tuned['name']] + [tuned]
+    with open(output, 'w') as f:
+        json.dump({"profiles": profiles}, f, indent=4)
+    print(f"Wrote profile {tuned['name']!r} to {output}")
+
+
+if __name__ == '__main__':
+    main()
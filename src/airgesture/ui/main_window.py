@@ -50,6 +50,12 @@ class AirGestureApp(QMainWindow):
         # Initialize UI
         self.init_ui()
         
+        # Hold the Start button until the hand tracking model is warm
+        self.model_ready = False
+        self.start_button.setEnabled(False)
+        self.start_button.setText("Loading...")
+        self.status_label.setText("Status: Loading hand tracking model...")
+        
         # Setup timer for camera feed
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_frame)
@@ -184,6 +190,9 @@ class AirGestureApp(QMainWindow):
             if self.gesture_detector is None:
                 return
                 
+            if not self.model_ready:
+                self.check_model_ready()
+                
             frame = self.gesture_detector.process_frame()
             if frame is not None:
                 height, width, channel = frame.shape
@@ -198,6 +207,23 @@ class AirGestureApp(QMainWindow):
             self.status_label.setText(f"Status: Error - {str(e)}")
             print(f"Error in update_frame: {str(e)}")
         
+    def check_model_ready(self):
+        """Enable the Start button once the model warm-up has finished."""
+        warmup = self.gesture_detector.warmup
+        if not warmup.finished.is_set():
+            return
+            
+        self.model_ready = True
+        if warmup.error is not None:
+            self.status_label.setText("Status: Hand tracking unavailable")
+            QMessageBox.critical(self, "Initialization Error", str(warmup.error))
+            return
+            
+        self.gesture_detector.is_ready()
+        self.start_button.setEnabled(True)
+        self.start_button.setText("Start")
+        self.status_label.setText("Status: Ready")
+        
     def toggle_gesture_control(self):
         """Toggle gesture control on/off."""
         self.gesture_detector.toggle()
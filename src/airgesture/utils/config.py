@@ -19,15 +19,97 @@ CAMERA_CONFIG = {
 
 # Gesture detection configuration
 GESTURE_CONFIG = {
-    'max_num_hands': 2,
+    'max_num_hands': 2,         # at most; the profile decides how many are tracked
+    'profile': 'Default',       # profile of GESTURE_PROFILES_FILE
     'min_detection_confidence': 0.7,
     'min_tracking_confidence': 0.5,
     'model_complexity': 1,
     'cursor_smoothing': 0.5,
-    'palm_open_cooldown': 1.0  # seconds
+    'palm_open_cooldown': 1.0,  # seconds
+    'inference_interval': 1     # run hand tracking every N frames
 }
 
-# Gesture threshold values
+# Defaults of the profile settings in gesture_profiles.json, for profiles
+# that do not set them; distances in normalized image units
+PROFILE_DEFAULTS = {
+    'pinch_threshold': 0.12,
+    'finger_distance_threshold': 0.15
+}
+
+# Hand identity tracking across frames
+TRACKER_CONFIG = {
+    'max_distance': 0.25,   # normalized units a hand may move between frames
+    'label_penalty': 0.05,  # extra cost when detected handedness disagrees with a track
+    'history': 15,          # frames of handedness votes kept per track
+    'max_missed': 5         # frames a track survives without a matching hand
+}
+
+# One Euro landmark filter, applied to all 21 landmarks of every hand
+FILTER_CONFIG = {
+    'min_cutoff': 1.5,   # Hz, smoothing of a hand held still
+    'beta': 10.0,        # how quickly the cutoff rises with landmark speed
+    'd_cutoff': 1.0      # Hz, smoothing of the speed estimate
+}
+
+# Landmark prediction between and ahead of inferences
+PREDICTOR_CONFIG = {
+    'enabled': True,
+    'alpha': 0.8,        # position correction gain
+    'beta': 0.5,         # velocity correction gain
+    'max_horizon': 0.1   # seconds, never extrapolate further than this
+}
+
+# Dynamic gestures from each tracked hand's recent motion
+MOTION_CONFIG = {
+    'enabled': True,
+    'history': 80,              # frames kept per tracked hand, window * fps up to 60 fps
+    'window': 1.2,              # seconds a swipe or circle may take, a 1 s circle included
+    'swipe_distance': 0.25,     # normalized palm travel for a swipe
+    'swipe_straightness': 0.8,  # travel / path length, rejects curved paths
+    'circle_turn': 300.0,       # degrees the palm's direction must turn for a circle
+    'circle_path': 0.3,         # minimum path length of a circle
+    'min_step': 0.003,          # palm steps shorter than this are jitter
+    'flick_speed': 2.5,         # index tip speed relative to the palm, units/s
+    'flick_palm_speed': 0.6,    # the palm must be slower than this for a flick
+    'cooldown': 0.6,            # seconds without events after a detection, then until the palm stops
+    'actions': {                # hotkey per dynamic gesture, unlisted ones are ignored
+        'swipe_left': ('ctrl', 'win', 'left'),
+        'swipe_right': ('ctrl', 'win', 'right')
+    }
+}
+
+# Model warm-up configuration
+WARMUP_CONFIG = {
+    'min_runs': 3,      # consecutive runs that must agree before we call it steady
+    'max_runs': 20,     # give up waiting for steady state after this many runs
+    'tolerance': 0.25   # allowed spread between the fastest and slowest recent run
+}
+
+# Inference watchdog
+WATCHDOG_CONFIG = {
+    'deadline': 0.1,       # seconds, frames slower than this are dropped
+    'restart_after': 2.0   # seconds, restart the backend if a stall lasts this long
+}
+
+# Thread pools and CPU affinity
+RUNTIME_CONFIG = {
+    'opencv_threads': None,      # cv2.setNumThreads, None keeps OpenCV's default
+    'inference_threads': None,   # CPUs the inference runtime may use, None = all
+    'affinity': {                # Linux CPU ids per stage, None = no pinning
+        'ui': None,              # Qt event loop, capture and gesture dispatch
+        'inference': None        # MediaPipe graph and TFLite worker threads
+    }
+}
+
+# Distance units of the gesture features (see core/features.py):
+# 'palm' measures fingertip distances in palm lengths, so one threshold table
+# works whether the user is 0.5 m or 2 m from the camera; 'world' uses metres
+# from MediaPipe's world landmarks; 'image' uses normalized image units
+FEATURE_CONFIG = {
+    'units': 'palm'
+}
+
+# Gesture threshold values, in normalized image units
 GESTURE_THRESHOLDS = {
     'pinch_distance': 0.05,
     'fingers_apart_distance': 0.08,
@@ -35,6 +117,97 @@ GESTURE_THRESHOLDS = {
     'namaste_distance': 0.15
 }
 
+# The same thresholds in palm lengths and in metres (palm length 0.095 m)
+PALM_THRESHOLDS = {
+    'pinch_distance': 0.3,
+    'fingers_apart_distance': 0.42,
+    'fingers_together_distance': 0.24,
+    'namaste_distance': 0.8
+}
+
+WORLD_THRESHOLDS = {
+    'pinch_distance': 0.0285,
+    'fingers_apart_distance': 0.04,
+    'fingers_together_distance': 0.0228,
+    'namaste_distance': 0.076
+}
+
+THRESHOLD_TABLES = {
+    'image': GESTURE_THRESHOLDS,
+    'palm': PALM_THRESHOLDS,
+    'world': WORLD_THRESHOLDS
+}
+
+# Exit thresholds for the distances above: a gesture entered at its
+# threshold distance only ends once the distance passes this one
+GESTURE_HYSTERESIS = {
+    'pinch_distance': 0.065,
+    'fingers_apart_distance': 0.065,
+    'fingers_together_distance': 0.05
+}
+
+HYSTERESIS_TABLES = {
+    'image': GESTURE_HYSTERESIS,
+    'palm': {
+        'pinch_distance': 0.36,
+        'fingers_apart_distance': 0.36,
+        'fingers_together_distance': 0.3
+    },
+    'world': {
+        'pinch_distance': 0.034,
+        'fingers_apart_distance': 0.034,
+        'fingers_together_distance': 0.0285
+    }
+}
+
+# Debouncing: a gesture starts after being seen for 'hold' seconds and ends
+# after being absent for 'release' seconds; while it is held its action
+# repeats every 'repeat' seconds (None: the action fires once per gesture)
+GESTURE_TIMING = {
+    'default': {'hold': 0.05, 'release': 0.1, 'repeat': None},
+    'scroll_up': {'repeat': 0.1},
+    'scroll_down': {'repeat': 0.1},
+    'brightness_up': {'repeat': 0.25},
+    'brightness_down': {'repeat': 0.25},
+    'volume_up': {'repeat': 0.25},
+    'volume_down': {'repeat': 0.25}
+}
+
+# Multi-step gestures (core.sequences): every step after the first must come
+# within 'within' seconds of the previous one. Conditions reported per hand:
+# Right: spread, pinch, middle_tap, two_fingers_up, pinky_up, pinky_down;
+# Left: together, two_fingers_up, five_fingers_down, palm_open, index_up.
+# A completed sequence clicks ('click') or presses a hotkey ('hotkey').
+GESTURE_SEQUENCES = [
+    {'name': 'left_click', 'hand': 'Right', 'click': 'left',
+     'steps': [{'when': 'spread'}, {'when': 'pinch', 'within': 0.6}]},
+    {'name': 'right_click', 'hand': 'Right', 'click': 'right',
+     'steps': [{'when': 'spread'}, {'when': 'middle_tap', 'unless': 'pinch', 'within': 0.6}]}
+]
+
+# Gesture confidence scores (core.scores): 'softness' is the margin of each
+# kind of test at which it scores about 0.73. A single-frame gesture (scroll,
+# volume, brightness, task view) is dispatched while it is its hand's
+# top-scoring gesture with at least its 'min_score'.
+SCORE_CONFIG = {
+    'softness': {'finger': 0.1, 'distance': 0.15},
+    'min_score': {'default': 0.5, 'task_view': 0.6, 'volume_up': 0.6, 'volume_down': 0.6},
+    'overlay': True,      # draw each hand's top gesture and score on the video
+    'event_log': 200      # recent gesture events kept with their scores
+}
+
+# Reuse a hand's last classification while no landmark has moved more than
+# 'epsilon' palm lengths; 'max_age' seconds forces a fresh evaluation
+REUSE_CONFIG = {
+    'enabled': True,
+    'epsilon': 0.01,
+    'max_age': 0.25
+}
+
+# Gesture profiles, shared with the rule-based detector and the profile tools;
+# the live pipeline enables the actions a profile binds (core.pipeline)
+GESTURE_PROFILES_FILE = 'gesture_profiles.json'
+
 # System control configuration
 SYSTEM_CONFIG = {
     'brightness_step': 5,  # percentage
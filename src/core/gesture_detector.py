@@ -1,7 +1,10 @@
-import numpy as np
 import mediapipe as mp
 import logging
 
+from src.airgesture.core.features import FeatureStats, HandFeatures
+from src.airgesture.core.landmarks import (MIDDLE_TIP, PINKY_TIP, RING_TIP, WRIST,
+                                           landmarks_to_array)
+
 class GestureDetector:
     def __init__(self):
         self.mp_hands = mp.solutions.hands
@@ -14,82 +17,62 @@ class GestureDetector:
         )
         self.mp_drawing = mp.solutions.drawing_utils
         self.logger = logging.getLogger(__name__)
+        
+        # Per-hand feature cache shared by the predicates
+        self.feature_stats = FeatureStats()
+        self._feature_hand = None
+        self._features = None
 
     def apply_exponential_smoothing(self, new_value, smoothed_value, smoothing_factor):
         if smoothed_value is None:
             return new_value
         return smoothing_factor * new_value + (1 - smoothing_factor) * smoothed_value
 
+    def hand_features(self, hand_landmarks):
+        """Return the cached features of ``hand_landmarks``, building them on first use."""
+        if hand_landmarks is not self._feature_hand:
+            self._feature_hand = hand_landmarks
+            self._features = HandFeatures(landmarks_to_array(hand_landmarks), self.feature_stats)
+        return self._features
+
     def is_two_fingers_up(self, hand_landmarks):
-        index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP].y
-        index_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_PIP].y
-        middle_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP].y
-        middle_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_PIP].y
-        ring_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.RING_FINGER_TIP].y
-        pinky_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_TIP].y
-        return index_tip < index_pip and middle_tip < middle_pip and ring_tip > middle_tip and pinky_tip > middle_tip
+        hand = self.hand_features(hand_landmarks)
+        index_up, middle_up, _, _ = hand.fingers_up
+        middle_tip = hand.y[MIDDLE_TIP]
+        return index_up and middle_up and hand.y[RING_TIP] > middle_tip and hand.y[PINKY_TIP] > middle_tip
 
     def is_pinch(self, hand_landmarks):
-        index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-        thumb_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_TIP]
-        distance = np.linalg.norm(np.array([index_tip.x, index_tip.y, index_tip.z]) - np.array([thumb_tip.x, thumb_tip.y, thumb_tip.z]))
-        return distance < 0.05
+        return self.hand_features(hand_landmarks).index_thumb_distance < 0.05 ** 2
 
     def is_middle_thumb_tap(self, hand_landmarks):
-        middle_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP]
-        thumb_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_TIP]
-        distance = np.linalg.norm(np.array([middle_tip.x, middle_tip.y, middle_tip.z]) - np.array([thumb_tip.x, thumb_tip.y, thumb_tip.z]))
-        return distance < 0.05
+        return self.hand_features(hand_landmarks).middle_thumb_distance < 0.05 ** 2
 
     def is_fingers_apart(self, hand_landmarks):
-        index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-        middle_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP]
-        distance = np.linalg.norm(np.array([index_tip.x, index_tip.y, index_tip.z]) - np.array([middle_tip.x, middle_tip.y, middle_tip.z]))
-        return distance > 0.07
+        return self.hand_features(hand_landmarks).index_middle_distance > 0.07 ** 2
 
     def is_five_fingers_up(self, hand_landmarks):
-        return all(hand_landmarks.landmark[finger].y < hand_landmarks.landmark[finger - 2].y for finger in 
-                   [self.mp_hands.HandLandmark.INDEX_FINGER_TIP, self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP, 
-                    self.mp_hands.HandLandmark.RING_FINGER_TIP, self.mp_hands.HandLandmark.PINKY_TIP])
+        return self.hand_features(hand_landmarks).all_fingers_up
 
     def is_five_fingers_down(self, hand_landmarks):
-        return all(hand_landmarks.landmark[finger].y > hand_landmarks.landmark[finger - 2].y for finger in 
-                   [self.mp_hands.HandLandmark.INDEX_FINGER_TIP, self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP, 
-                    self.mp_hands.HandLandmark.RING_FINGER_TIP, self.mp_hands.HandLandmark.PINKY_TIP])
+        return self.hand_features(hand_landmarks).all_fingers_down
 
     def is_pinky_finger_up(self, hand_landmarks):
-        pinky_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_TIP].y
-        pinky_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_PIP].y
-        return pinky_tip < pinky_pip
+        return self.hand_features(hand_landmarks).fingers_up[3]
 
     def is_pinky_finger_down(self, hand_landmarks):
-        pinky_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_TIP].y
-        pinky_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_PIP].y
-        index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP].y
-        middle_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP].y
-        ring_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.RING_FINGER_TIP].y
-        thumb_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_TIP].y
-        return pinky_tip > pinky_pip and index_tip > hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_PIP].y and \
-               middle_tip > hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_PIP].y and \
-               ring_tip > hand_landmarks.landmark[self.mp_hands.HandLandmark.RING_FINGER_PIP].y and \
-               thumb_tip > hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_IP].y
+        hand = self.hand_features(hand_landmarks)
+        return hand.all_fingers_down and hand.thumb_down
 
     def is_index_middle_fingers_together(self, hand_landmarks):
-        index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-        middle_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP]
-        distance = np.linalg.norm(np.array([index_tip.x, index_tip.y, index_tip.z]) - np.array([middle_tip.x, middle_tip.y, middle_tip.z]))
-        return distance < 0.05
+        return self.hand_features(hand_landmarks).index_middle_distance < 0.05 ** 2
 
     def is_full_palm_open(self, hand_landmarks):
         return self.is_five_fingers_up(hand_landmarks)
 
     def is_index_finger_up(self, hand_landmarks):
-        index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP].y
-        index_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_PIP].y
-        return index_tip < index_pip
+        return self.hand_features(hand_landmarks).fingers_up[0]
 
     def is_namaste_gesture(self, hand_landmarks1, hand_landmarks2):
-        wrist1 = hand_landmarks1.landmark[self.mp_hands.HandLandmark.WRIST]
-        wrist2 = hand_landmarks2.landmark[self.mp_hands.HandLandmark.WRIST]
-        distance = np.linalg.norm(np.array([wrist1.x, wrist1.y]) - np.array([wrist2.x, wrist2.y]))
-        return distance < 0.1 
\ No newline at end of file
+        x1, y1, _ = self.hand_features(hand_landmarks1).points[WRIST]
+        x2, y2, _ = self.hand_features(hand_landmarks2).points[WRIST]
+        return (x1 - x2) ** 2 + (y1 - y2) ** 2 < 0.1 ** 2 
\ No newline at end of file